@@ -0,0 +1,6 @@
+"""
+Tooling shared by all days: a unified runner, timing and other utilities.
+
+Each day stays a standalone script in its own directory. The tooling imports
+the days' ``parse_input``, ``part1`` and ``part2`` functions through aoc.days.
+"""
@@ -0,0 +1,179 @@
+"""
+The persistent cache of the parts' answers.
+
+Answers are stored in an SQLite database, keyed by the day, the part, the hash
+of the input (see aoc.cache.make_key, it covers the day's source code too) and
+the part's parameters. Entries expire after the TTL, and the least recently
+used ones are evicted when there are more entries than the limit.
+
+The runner uses the cache unless ``--no-cache`` is passed or the ``AOC_NO_CACHE``
+environment variable is set. ``AOC_CACHE_DIR`` overrides the cache's location.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aoc.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 100_000
+
+DB_NAME = 'answers.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    answer BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (day, part, input_hash, params)
+);
+CREATE INDEX IF NOT EXISTS answers_accessed_at ON answers (accessed_at);
+"""
+
+
+@dataclass
+class AnswerCache:
+    """
+    :ivar path: The database file. Created on the first use.
+    :ivar ttl: The lifetime of an entry in seconds. None means entries never expire.
+    :ivar max_entries: The limit of the number of entries.
+    """
+    path: Path = DEFAULT_CACHE_DIR.parent / DB_NAME
+    ttl: Optional[float] = DEFAULT_TTL
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    # The connection is opened lazily in every process using the cache
+    _connection: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False, compare=False)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode, every statement is a transaction of its own
+            self._connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            # Losing the last few answers on a power failure is fine for a cache,
+            # and not syncing every access keeps lookups fast
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and created_at + self.ttl <= now
+
+    def get(self, day: int, part: str, input_hash: str, params: str = '') -> Tuple[bool, Any]:
+        """
+        Looks up the answer and marks it as recently used.
+
+        :returns: A tuple (found, answer). Expired answers are removed and reported as not found.
+        """
+        key = (day, part, input_hash, params)
+        row = self.connection.execute(
+            "SELECT answer, created_at FROM answers WHERE day = ? AND part = ? AND input_hash = ? AND params = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return False, None
+
+        answer_data, created_at = row
+        now = time.time()
+        if self._is_expired(created_at, now):
+            self.connection.execute(
+                "DELETE FROM answers WHERE day = ? AND part = ? AND input_hash = ? AND params = ?", key)
+            return False, None
+
+        self.connection.execute(
+            "UPDATE answers SET accessed_at = ? WHERE day = ? AND part = ? AND input_hash = ? AND params = ?",
+            (now, *key),
+        )
+        return True, pickle.loads(answer_data)
+
+    def put(self, day: int, part: str, input_hash: str, answer: Any, params: str = '') -> None:
+        """
+        Stores the answer, then removes the expired entries and evicts the least
+        recently used ones to fit into the limit.
+        """
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (day, part, input_hash, params, pickle.dumps(answer, protocol=pickle.HIGHEST_PROTOCOL), now, now),
+        )
+        self.evict()
+
+    def evict(self) -> None:
+        if self.ttl is not None:
+            self.connection.execute("DELETE FROM answers WHERE created_at + ? <= ?", (self.ttl, time.time()))
+
+        self.connection.execute(
+            "DELETE FROM answers WHERE rowid IN ("
+            "  SELECT rowid FROM answers ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM answers")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def memoize(self, day: int, part: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Returns a decorator which caches the function's results by its arguments.
+        The arguments must be picklable. For example::
+
+            @answer_cache.memoize(15, 'part2')
+            def play(starting_numbers, end_at):
+                return play_numbers_game(starting_numbers, end_at)
+
+        Unlike the runner's caching, the key doesn't cover the source code,
+        so the cache should be cleared when the function changes.
+        """
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                input_hash = hashlib.sha256(pickle.dumps((args, sorted(kwargs.items())))).hexdigest()
+                found, answer = self.get(day, part, input_hash, func.__qualname__)
+                if found:
+                    return answer
+
+                answer = func(*args, **kwargs)
+                self.put(day, part, input_hash, answer, func.__qualname__)
+                return answer
+
+            return wrapper
+
+        return decorator
+
+
+def get_default_answer_cache() -> Optional[AnswerCache]:
+    """
+    Returns the answer cache configured by the environment, or None if caching is turned off.
+    """
+    if os.environ.get('AOC_NO_CACHE'):
+        return None
+
+    cache_dir = os.environ.get('AOC_CACHE_DIR')
+    if cache_dir:
+        return AnswerCache(path=Path(cache_dir) / DB_NAME)
+    return AnswerCache()
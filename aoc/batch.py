@@ -0,0 +1,198 @@
+"""
+Solves many inputs of a single day in a pool of processes.
+
+Usage::
+
+    python -m aoc.batch 13 inputs/              # every file in the directory
+    python -m aoc.batch 13 manifest.txt -j 8    # every path listed in the manifest
+    python -m aoc.batch 22 inputs/ --chunk-size 16 -o results.jsonl
+
+A manifest lists an input path per line, relative to the manifest's directory.
+Blank lines and lines starting with "#" are skipped.
+
+The results are written as JSON lines in the order the inputs are solved in,
+which is not the order of the inputs. Every line has the input's path,
+the phases as in the runner's DayResult and the error, if the input failed.
+A failing input doesn't affect the others.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from aoc.answers import AnswerCache, get_default_answer_cache
+from aoc.cache import ParseCache, get_default_cache
+from aoc.days import DAYS
+from aoc.runner import DayResult, format_exception, run_day_file
+
+DEFAULT_CHUNK_SIZE = 8
+
+
+def collect_inputs(source: str) -> List[str]:
+    """
+    Returns the paths of the inputs: the files of the directory in the order of their names,
+    or the paths listed in the manifest file.
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        return [
+            str(path) for path in sorted(source_path.iterdir())
+            if path.is_file() and not path.name.startswith('.')
+        ]
+
+    paths = []
+    with open(source_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(str(source_path.parent / line))
+    return paths
+
+
+def _solve_chunk(
+            day_number: int,
+            paths: List[str],
+            trace_memory: bool,
+            cache: Optional[ParseCache],
+            answers: Optional[AnswerCache],
+        ) -> List[Tuple[str, DayResult]]:
+    return [(path, run_day_file(day_number, path, trace_memory, cache, answers)) for path in paths]
+
+
+def iter_batch(
+            day_number: int,
+            paths: Sequence[str],
+            jobs: int = 1,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            trace_memory: bool = False,
+            cache: Optional[ParseCache] = None,
+            answers: Optional[AnswerCache] = None,
+        ) -> Iterator[Tuple[str, DayResult]]:
+    """
+    Solves the day on every input, yielding (path, result) in the order of completion.
+    Every task of the pool solves a chunk of chunk_size inputs, bigger chunks
+    mean less overhead on many small inputs, smaller ones balance the load better.
+
+    Errors of the inputs are recorded in their results, see run_day.
+    If a task fails as a whole, e.g. its process crashes, the error is recorded
+    in the results of all the inputs of its chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+    chunks = [list(paths[i:i + chunk_size]) for i in range(0, len(paths), chunk_size)]
+
+    if jobs <= 1:
+        for chunk in chunks:
+            yield from _solve_chunk(day_number, chunk, trace_memory, cache, answers)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunks_by_future = {
+            executor.submit(_solve_chunk, day_number, chunk, trace_memory, cache, answers): chunk
+            for chunk in chunks
+        }
+        pending = set(chunks_by_future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results = future.result()
+                except Exception as e:
+                    error = format_exception(e)
+                    results = [(path, DayResult(day=day_number, error=error)) for path in chunks_by_future[future]]
+                yield from results
+
+
+def result_to_json(path: str, result: DayResult) -> Dict[str, Any]:
+    return {'input': path, **asdict(result)}
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc.batch', description="Solve many inputs of a day.")
+    parser.add_argument('day', type=int)
+    parser.add_argument('source', help="a directory of inputs or a manifest file listing them")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help="number of processes (defaults to the number of CPUs)")
+    parser.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+        help="number of inputs solved by a process at once")
+    parser.add_argument('-o', '--output', help="JSON lines output file (stdout by default)")
+    parser.add_argument('--memory', action='store_true', help="trace the peak memory of every phase")
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="always parse and solve instead of loading the parsed inputs and the answers from the cache")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not report the progress")
+    return parser
+
+
+def _write_results(
+            results: Iterator[Tuple[str, DayResult]],
+            total: int,
+            output: TextIO,
+            quiet: bool,
+        ) -> int:
+    """
+    Writes the results as they come, reporting the progress to stderr.
+
+    :returns: The number of failed inputs.
+    """
+    failed = 0
+    for done, (path, result) in enumerate(results, 1):
+        output.write(json.dumps(result_to_json(path, result), default=str) + '\n')
+        output.flush()
+
+        if result.error:
+            failed += 1
+        if not quiet:
+            print(f"\r[{done}/{total}] {failed} failed", end='', file=sys.stderr, flush=True)
+
+    if not quiet and total:
+        print(file=sys.stderr)
+
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    if args.day not in DAYS:
+        print(f"Invalid day: {args.day}", file=sys.stderr)
+        return 2
+
+    try:
+        paths = collect_inputs(args.source)
+    except OSError as e:
+        print(f"Cannot read {args.source!r}: {e}", file=sys.stderr)
+        return 2
+
+    if args.chunk_size < 1:
+        print(f"Invalid chunk size: {args.chunk_size}", file=sys.stderr)
+        return 2
+
+    results = iter_batch(
+        args.day,
+        paths,
+        jobs=args.jobs or os.cpu_count() or 1,
+        chunk_size=args.chunk_size,
+        trace_memory=args.memory,
+        cache=None if args.no_cache else get_default_cache(),
+        answers=None if args.no_cache else get_default_answer_cache(),
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            failed = _write_results(results, len(paths), f, args.quiet)
+    else:
+        failed = _write_results(results, len(paths), sys.stdout, args.quiet)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Benchmarks of the solutions on generated inputs of growing size.
+
+Each benchmark times one phase of a day at several input sizes and fits
+the empirical growth exponent: time ~ size ** exponent. A benchmark fails if
+the exponent exceeds its budget, or if it grew compared to a baseline run.
+
+Usage::
+
+    python -m aoc.bench                          # run all benchmarks
+    python -m aoc.bench day09.part2 day18.part1  # run selected benchmarks
+    python -m aoc.bench -o new.json --baseline old.json
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from aoc.days import ROOT_DIR, load_day, load_generator
+
+# Default allowed growth of an exponent compared to the baseline
+DEFAULT_TOLERANCE = 0.35
+
+
+@dataclass
+class Benchmark:
+    """
+    :ivar phase: 'parse', 'part1' or 'part2'.
+    :ivar sizes: Input sizes to time the phase at.
+    :ivar max_exponent: The budget for the fitted exponent.
+    :ivar make_input: Makes an input of the given size from the seed.
+        Defaults to the day's generator.
+    :ivar variant: Tells apart benchmarks of the same phase on differently shaped inputs.
+    :ivar solve: Replaces the day's solution of the phase, to time another API on the parsed input.
+    """
+    day: int
+    phase: str
+    sizes: List[int]
+    max_exponent: float
+    make_input: Optional[Callable[[int, int], str]] = field(default=None, repr=False)
+    variant: str = ''
+    solve: Optional[Callable[[Any], Any]] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        name = f"day{self.day:02d}.{self.phase}"
+        return f"{name}.{self.variant}" if self.variant else name
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    :ivar times: The best time in seconds for each size.
+    :ivar exponent: The fitted growth exponent.
+    """
+    name: str
+    sizes: List[int]
+    times: List[float]
+    exponent: float
+    max_exponent: float
+
+
+def _long_expressions(size: int, seed: int) -> str:
+    """
+    Makes expressions of `size` operands each, to see how parsing scales with the line length.
+    """
+    return load_generator(18)(20, seed=seed, operands=size, max_depth=0)
+
+
+# The number of targets queried from the day 1 expense index
+EXPENSE_INDEX_TARGETS = 10_000
+
+
+def _query_expense_index(numbers: List[int]) -> None:
+    """
+    Builds the day 1 expense index and finds the closest pair and triple for every target.
+    """
+    index = load_day(1).module.build_expense_index(numbers)
+    index.closest_pairs(range(EXPENSE_INDEX_TARGETS))
+    index.closest_triples(range(EXPENSE_INDEX_TARGETS))
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark(1, 'part1', [25000, 50000, 100000, 200000], 1.4),
+    Benchmark(1, 'part2', [25000, 50000, 100000, 200000], 1.4),
+    # The time to query the index for 10k targets, the closest triple takes O(n log n) per target
+    Benchmark(1, 'part2', [25, 50, 100, 200], 1.6, solve=_query_expense_index, variant='index'),
+    Benchmark(2, 'parse', [5000, 10000, 20000, 40000], 1.4),
+    Benchmark(3, 'part2', [5000, 10000, 20000, 40000], 1.4),
+    Benchmark(4, 'parse', [1000, 2000, 4000, 8000], 1.4),
+    Benchmark(4, 'part2', [1000, 2000, 4000, 8000], 1.4),
+    Benchmark(5, 'part2', [100, 200, 400, 800], 1.4),
+    Benchmark(6, 'part2', [1000, 2000, 4000, 8000], 1.4),
+    Benchmark(7, 'parse', [1000, 2000, 4000, 8000], 1.4),
+    Benchmark(7, 'part1', [1000, 2000, 4000, 8000], 1.5),
+    Benchmark(8, 'part2', [500, 1000, 2000, 4000], 2.4),
+    Benchmark(9, 'part1', [1000, 2000, 4000, 8000], 1.5),
+    Benchmark(9, 'part2', [250, 500, 1000, 2000], 3.4),
+    # The recursion depth of count_adapter_arrangements is the number of adapters
+    Benchmark(10, 'part2', [100, 200, 400, 800], 2.4),
+    Benchmark(11, 'part1', [10, 20, 40], 3.7),
+    Benchmark(12, 'part2', [5000, 10000, 20000, 40000], 1.4),
+    Benchmark(13, 'part2', [100, 200, 400, 700], 2.4),
+    Benchmark(14, 'part2', [250, 500, 1000, 2000], 1.4),
+    Benchmark(16, 'part2', [250, 500, 1000, 2000], 1.4),
+    Benchmark(18, 'part1', [1000, 2000, 4000], 1.4),
+    # Parser.tokenize and the parser recurse once per token, so the lines can't be much longer
+    Benchmark(18, 'part1', [25, 50, 100, 200], 2.0, make_input=_long_expressions, variant='long_lines'),
+    Benchmark(19, 'part1', [250, 500, 1000, 2000], 1.4),
+    Benchmark(20, 'part1', [36, 64, 100, 144], 2.0),
+    Benchmark(21, 'part1', [500, 1000, 2000, 4000], 1.4),
+    Benchmark(24, 'part1', [1000, 2000, 4000, 8000], 1.4),
+    Benchmark(25, 'part1', [100_000, 200_000, 400_000, 800_000], 1.4),
+]
+
+
+def fit_exponent(sizes: Sequence[float], times: Sequence[float]) -> float:
+    """
+    Fits time = c * size ** exponent by least squares in log-log space
+    and returns the exponent.
+
+    fit_exponent([1, 2, 4], [3, 12, 48])  # => 2.0
+    """
+    if len(sizes) != len(times) or len(sizes) < 2:
+        raise ValueError("At least two measurements are needed")
+
+    xs = [math.log(s) for s in sizes]
+    # Guard against timer resolution producing zeros
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def time_phase(benchmark: Benchmark, size: int, seed: int = 0, repeat: int = 3) -> float:
+    """
+    Returns the best of `repeat` timings of the benchmark's phase at the given size.
+    Generating and parsing the input are not timed, unless the parsing is the phase.
+    """
+    day = load_day(benchmark.day)
+    if benchmark.make_input:
+        content = benchmark.make_input(size, seed)
+    else:
+        content = load_generator(benchmark.day)(size, seed=seed)
+
+    best = math.inf
+    for _ in range(repeat):
+        if benchmark.phase == 'parse':
+            started = time.perf_counter()
+            day.parse(content)
+        else:
+            parsed = day.parse(content)
+            solve = benchmark.solve or day.parts[benchmark.phase]
+            started = time.perf_counter()
+            solve(parsed)
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+
+def run_benchmark(benchmark: Benchmark, seed: int = 0, repeat: int = 3) -> BenchmarkResult:
+    times = [time_phase(benchmark, size, seed=seed, repeat=repeat) for size in benchmark.sizes]
+    return BenchmarkResult(
+        name=benchmark.name,
+        sizes=list(benchmark.sizes),
+        times=times,
+        exponent=fit_exponent(benchmark.sizes, times),
+        max_exponent=benchmark.max_exponent,
+    )
+
+
+def find_regressions(
+            results: List[BenchmarkResult],
+            baseline: Optional[Dict[str, Any]] = None,
+            tolerance: float = DEFAULT_TOLERANCE,
+        ) -> List[str]:
+    """
+    Returns a description of every benchmark which went over its exponent budget,
+    or whose exponent grew by more than the tolerance compared to the baseline.
+
+    :param baseline: A report as returned by make_report, loaded from a previous run.
+    """
+    baseline_exponents = {}
+    if baseline:
+        baseline_exponents = {r['name']: r['exponent'] for r in baseline['results']}
+
+    regressions = []
+    for result in results:
+        if result.exponent > result.max_exponent:
+            regressions.append(
+                f"{result.name}: exponent {result.exponent:0.2f} is over the budget of {result.max_exponent:0.2f}")
+
+        baseline_exponent = baseline_exponents.get(result.name)
+        if baseline_exponent is not None and result.exponent > baseline_exponent + tolerance:
+            regressions.append(
+                f"{result.name}: exponent {result.exponent:0.2f} grew from {baseline_exponent:0.2f}")
+
+    return regressions
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.strip()
+
+
+def make_report(results: List[BenchmarkResult]) -> Dict[str, Any]:
+    """
+    Returns the results as a JSON-serializable dict, along with the commit
+    and the python version they were produced with.
+    """
+    return {
+        'commit': _get_commit(),
+        'python': platform.python_version(),
+        'results': [asdict(r) for r in results],
+    }
+
+
+def select_benchmarks(names: Sequence[str]) -> List[Benchmark]:
+    """
+    Selects benchmarks by their names (day09.part2) or name prefixes (day09).
+    All benchmarks are selected if no names are given.
+
+    Raises ValueError if a name matches no benchmarks.
+    """
+    if not names:
+        return list(BENCHMARKS)
+
+    selected = []
+    for name in names:
+        matching = [b for b in BENCHMARKS if b.name == name or b.name.startswith(name + '.')]
+        if not matching:
+            raise ValueError(f"No benchmarks match {name!r}")
+        selected.extend(b for b in matching if b not in selected)
+
+    return selected
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc.bench', description="Benchmark the solutions.")
+    parser.add_argument('names', nargs='*', metavar='NAME', help="benchmarks to run, e.g. day09.part2 or day09")
+    parser.add_argument('-o', '--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare the exponents to the results of a previous run")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    try:
+        benchmarks = select_benchmarks(args.names)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, seed=args.seed, repeat=args.repeat)
+        times = ' '.join(f"{t * 1000:0.1f}" for t in result.times)
+        print(f"{result.name:<24} exponent {result.exponent:5.2f} (max {result.max_exponent:0.2f})  ms: {times}")
+        results.append(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(make_report(results), f, indent=2)
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+The persistent cache of parsed inputs.
+
+Parsed inputs are pickled to files named after a hash of the input's content
+and of the source code of the day. Changing either of them makes the cache miss,
+so stale entries are never returned. When the cache grows over its size limit,
+the least recently used entries are removed.
+
+The runner uses the cache unless ``--no-cache`` is passed or the ``AOC_NO_CACHE``
+environment variable is set. ``AOC_CACHE_DIR`` overrides the cache's location.
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from aoc.days import ROOT_DIR, Day
+
+# Bumped whenever the format of the entries changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = ROOT_DIR / '.cache' / 'parsed'
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.pickle'
+
+# Hashes of the days' source code by the day number, they don't change while running
+_code_versions: Dict[int, str] = {}
+
+# Matches the imports of the shared modules: "from aoc.reader import ..." or "import aoc.reader"
+_AOC_IMPORT_REGEX = re.compile(rb'^\s*(?:from|import)\s+aoc\.(\w+)', re.MULTILINE)
+
+
+def _find_shared_modules(sources: Iterable[bytes]) -> List[Path]:
+    """
+    Returns the aoc modules the sources import, directly or through other aoc modules.
+    """
+    found: Set[Path] = set()
+    pending = list(sources)
+    while pending:
+        for name in _AOC_IMPORT_REGEX.findall(pending.pop()):
+            path = ROOT_DIR / 'aoc' / (name.decode() + '.py')
+            if path.is_file() and path not in found:
+                found.add(path)
+                pending.append(path.read_bytes())
+
+    return sorted(found)
+
+
+def get_code_version(day: Day) -> str:
+    """
+    Returns a hash of the source files in the day's directory, which are
+    the day's module and its siblings, and of the shared aoc modules they import.
+    Tests and the generator are not included.
+    """
+    if day.number not in _code_versions:
+        paths = [p for p in sorted(day.dir.glob('*.py')) if not p.name.startswith(('test_', 'generate_'))]
+        paths += _find_shared_modules(p.read_bytes() for p in paths)
+
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(str(path.relative_to(ROOT_DIR)).encode())
+            digest.update(path.read_bytes())
+        _code_versions[day.number] = digest.hexdigest()
+
+    return _code_versions[day.number]
+
+
+def make_key(day: Day, content: str) -> str:
+    """
+    Returns the key of the day's parsed content in the cache.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}:{pickle.HIGHEST_PROTOCOL}:{day.number}:".encode())
+    digest.update(get_code_version(day).encode())
+    digest.update(content.encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class ParseCache:
+    """
+    A directory of pickled parsed inputs with a bounded total size.
+
+    :ivar directory: Where the entries are stored. Created on the first write.
+    :ivar max_size: The limit of the total size of the entries in bytes.
+        An entry larger than the limit is not stored at all.
+    """
+    directory: Path = DEFAULT_CACHE_DIR
+    max_size: int = DEFAULT_MAX_SIZE
+
+    def _entry_path(self, key: str) -> Path:
+        return Path(self.directory) / (key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up the entry and marks it as recently used.
+
+        :returns: A tuple (found, value). A corrupted entry is removed and reported as not found.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            path.unlink(missing_ok=True)
+            return False, None
+
+        # The modification time serves as the last access time for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return True, value
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        Stores the value and evicts the least recently used entries to fit into the size limit.
+
+        :returns: False if the value cannot be pickled or is larger than the limit.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+            return False
+
+        if len(data) > self.max_size:
+            return False
+
+        directory = Path(self.directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, so that concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+        return True
+
+    def _list_entries(self) -> List[Tuple[float, int, Path]]:
+        """
+        Returns (mtime, size, path) of every entry, the least recently used first.
+        """
+        entries = []
+        for path in Path(self.directory).glob('*' + _ENTRY_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Removed by a concurrent process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        return entries
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the total size fits into the limit.
+        """
+        entries = self._list_entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        for _, _, path in self._list_entries():
+            path.unlink(missing_ok=True)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of the entries in bytes.
+        """
+        return sum(size for _, size, _ in self._list_entries())
+
+
+def get_default_cache() -> Optional[ParseCache]:
+    """
+    Returns the cache configured by the environment, or None if caching is turned off.
+    """
+    if os.environ.get('AOC_NO_CACHE'):
+        return None
+
+    return ParseCache(directory=Path(os.environ.get('AOC_CACHE_DIR') or DEFAULT_CACHE_DIR))
+
+
+def parse_cached(day: Day, content: str, cache: Optional[ParseCache]) -> Tuple[Any, bool]:
+    """
+    Parses the content with the day's parse_input, or loads the result of
+    a previous parsing of the same content from the cache.
+
+    :param cache: The cache to use. None turns caching off.
+    :returns: A tuple (parsed, cached). `cached` is True if the result is loaded from the cache.
+    """
+    if cache is None:
+        return day.parse(content), False
+
+    key = make_key(day, content)
+    found, parsed = cache.get(key)
+    if found:
+        return parsed, True
+
+    parsed = day.parse(content)
+    cache.put(key, parsed)
+    return parsed, False
@@ -0,0 +1,377 @@
+"""
+A resident solver process which serves solve requests over a Unix socket.
+
+The daemon imports all days once and keeps a pool of worker processes with
+the days preloaded, so a request costs neither an interpreter start nor imports.
+
+Usage::
+
+    python -m aoc.daemon serve -j 4             # start the daemon
+    python -m aoc.daemon solve 7 -i input.txt   # the daemon reads the file
+    python -m aoc.daemon solve 7 -i - < in.txt  # the input is sent inline
+    python -m aoc.daemon stop
+
+The protocol is line-delimited JSON. A request is one of::
+
+    {"id": 1, "day": 7, "path": "/abs/path/input.txt"}
+    {"id": 2, "day": 7, "content": "light red bags contain ..."}
+    {"id": 3, "day": 7, "content_base64": "bGlnaHQgcmVk..."}
+    {"command": "shutdown"}
+
+Solve requests may also set "trace_memory" (false by default). The daemon
+replies with a message per phase as soon as it completes::
+
+    {"id": 1, "day": 7, "phase": "part1", "answer": 161, "cached": false,
+     "wall_time": 0.0012, "cpu_time": 0.0012, "peak_memory": null}
+
+and finishes every request with ``{"id": 1, "day": 7, "done": true, "error": null}``.
+Requests of a single connection are served one by one, separate connections
+are served concurrently.
+"""
+import argparse
+import base64
+import binascii
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from aoc.answers import AnswerCache, get_default_answer_cache
+from aoc.cache import ParseCache, get_code_version, get_default_cache
+from aoc.days import DAYS, load_day
+from aoc.runner import PhaseResult, format_exception, iter_phases
+
+
+def get_default_socket_path() -> str:
+    """
+    Returns the socket path from the AOC_DAEMON_SOCKET environment variable,
+    or a per-user path in the temporary directory.
+    """
+    return os.environ.get('AOC_DAEMON_SOCKET') or os.path.join(
+        tempfile.gettempdir(), f"aoc2020-{os.getuid()}.sock")
+
+
+def preload_days() -> None:
+    """
+    Imports every day and hashes its source code for the caches.
+    """
+    for number in DAYS:
+        get_code_version(load_day(number))
+
+
+def _phase_message(phase_result: PhaseResult) -> Dict[str, Any]:
+    m = phase_result.measurement
+    return {
+        'phase': phase_result.phase,
+        'answer': phase_result.answer,
+        'cached': phase_result.cached,
+        'wall_time': m.wall_time,
+        'cpu_time': m.cpu_time,
+        'peak_memory': m.peak_memory,
+    }
+
+
+def _solve_in_worker(
+            day_number: int,
+            content: str,
+            trace_memory: bool,
+            cache: Optional[ParseCache],
+            answers: Optional[AnswerCache],
+            messages: 'queue.Queue[Optional[Dict[str, Any]]]',
+        ) -> None:
+    """
+    Runs in a worker process. Puts a message per phase into the queue, then None.
+    """
+    try:
+        for phase_result in iter_phases(day_number, content, trace_memory, cache, answers):
+            messages.put(_phase_message(phase_result))
+    except Exception as e:
+        messages.put({'error': format_exception(e)})
+    messages.put(None)
+
+
+class RequestError(Exception):
+    pass
+
+
+def _get_content(request: Dict[str, Any]) -> str:
+    """
+    Returns the input of a solve request, either inline or read from the path.
+
+    :raises RequestError: If the request has no valid input.
+    """
+    if 'content' in request:
+        if not isinstance(request['content'], str):
+            raise RequestError("'content' must be a string")
+        return request['content']
+    elif 'content_base64' in request:
+        try:
+            return base64.b64decode(request['content_base64'], validate=True).decode()
+        except (binascii.Error, TypeError, UnicodeDecodeError) as e:
+            raise RequestError(f"Invalid 'content_base64': {e}")
+    elif 'path' in request:
+        # Not read_input, "-" must not read the daemon's stdin
+        try:
+            with open(str(request['path'])) as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise RequestError(f"Cannot read {request['path']!r}: {e}")
+    else:
+        raise RequestError("Either 'content', 'content_base64' or 'path' is required")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: 'SolverServer'
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message, default=str).encode() + b'\n')
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be an object")
+            except ValueError as e:
+                self._send({'id': None, 'done': True, 'error': f"Invalid request: {e}"})
+                continue
+
+            if request.get('command') == 'shutdown':
+                self._send({'id': request.get('id'), 'done': True, 'error': None})
+                # shutdown() waits for serve_forever to return, so it can't run in this thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+            self._solve(request)
+
+    def _solve(self, request: Dict[str, Any]) -> None:
+        request_id = request.get('id')
+        day_number = request.get('day')
+        reply = {'id': request_id, 'day': day_number}
+
+        try:
+            if day_number not in DAYS:
+                raise RequestError(f"Invalid day: {day_number!r}")
+            content = _get_content(request)
+        except RequestError as e:
+            self._send({**reply, 'done': True, 'error': str(e)})
+            return
+
+        error = None
+        messages = self.server.manager.Queue()
+        future = self.server.executor.submit(
+            _solve_in_worker, day_number, content, bool(request.get('trace_memory')),
+            self.server.cache, self.server.answers, messages,
+        )
+        while True:
+            try:
+                message = messages.get(timeout=0.1)
+            except queue.Empty:
+                # The worker can only finish without the final None if it crashed
+                if future.done() and future.exception() is not None and messages.empty():
+                    error = format_exception(future.exception())
+                    break
+                continue
+
+            if message is None:
+                break
+            elif 'error' in message:
+                error = message['error']
+            else:
+                self._send({**reply, **message})
+
+        self._send({**reply, 'done': True, 'error': error})
+
+
+class SolverServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves every connection in a thread of its own, and solves the days
+    in a shared pool of worker processes.
+    """
+    daemon_threads = True
+
+    def __init__(
+                self,
+                socket_path: str,
+                jobs: Optional[int] = None,
+                cache: Optional[ParseCache] = None,
+                answers: Optional[AnswerCache] = None,
+            ):
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self.socket_path = socket_path
+        self.cache = cache
+        self.answers = answers
+
+        preload_days()
+        self.manager = multiprocessing.Manager()
+        self.executor = ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1, initializer=preload_days)
+        # Start the workers now rather than on the first request
+        self.executor.submit(int).result()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown()
+        self.manager.shutdown()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Removes the socket file left by a daemon which didn't exit cleanly.
+
+    :raises RuntimeError: If a daemon is listening on the socket.
+    """
+    if not os.path.exists(socket_path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+
+    raise RuntimeError(f"A daemon is already running on {socket_path}")
+
+
+def _request(socket_path: str, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Sends the request and yields the replies until the final one.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        with sock.makefile('rb') as replies:
+            for line in replies:
+                message = json.loads(line)
+                yield message
+                if message.get('done'):
+                    return
+
+    raise ConnectionError("The daemon closed the connection before finishing the request")
+
+
+def solve(
+            day_number: int,
+            path: Optional[str] = None,
+            content: Optional[str] = None,
+            socket_path: Optional[str] = None,
+            trace_memory: bool = False,
+        ) -> Iterator[Dict[str, Any]]:
+    """
+    Asks the daemon to solve the day, and yields the messages of the phases
+    as they complete, then the final message.
+
+    :param path: The input file, read by the daemon.
+    :param content: The input itself. Exactly one of path and content must be given.
+    """
+    if (path is None) == (content is None):
+        raise ValueError("Exactly one of path and content must be given")
+
+    request: Dict[str, Any] = {'id': 1, 'day': day_number, 'trace_memory': trace_memory}
+    if path is not None:
+        # The daemon's working directory is not the client's one
+        request['path'] = os.path.abspath(path)
+    else:
+        request['content'] = content
+
+    return _request(socket_path or get_default_socket_path(), request)
+
+
+def stop(socket_path: Optional[str] = None) -> None:
+    for _ in _request(socket_path or get_default_socket_path(), {'command': 'shutdown'}):
+        pass
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc.daemon', description="Serve the solutions over a socket.")
+    parser.add_argument('-s', '--socket', help="socket path (defaults to $AOC_DAEMON_SOCKET or a temporary file)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="start the daemon")
+    serve_parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help="number of worker processes (defaults to the number of CPUs)")
+    serve_parser.add_argument(
+        '--no-cache', action='store_true',
+        help="always parse and solve instead of loading the parsed input and the answers from the cache")
+
+    solve_parser = commands.add_parser('solve', help="solve a day with the running daemon")
+    solve_parser.add_argument('day', type=int)
+    solve_parser.add_argument(
+        '-i', '--input',
+        help="input file, '-' for stdin (defaults to the day's input.txt)")
+    solve_parser.add_argument('--memory', action='store_true', help="trace the peak memory")
+
+    commands.add_parser('stop', help="stop the running daemon")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    socket_path = args.socket or get_default_socket_path()
+
+    if args.command == 'serve':
+        cache = None if args.no_cache else get_default_cache()
+        answers = None if args.no_cache else get_default_answer_cache()
+        try:
+            server = SolverServer(socket_path, jobs=args.jobs, cache=cache, answers=answers)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+        print(f"Listening on {socket_path}", file=sys.stderr)
+        with server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    if args.command == 'solve' and args.day not in DAYS:
+        print(f"Invalid day: {args.day}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.command == 'stop':
+            stop(socket_path)
+            return 0
+
+        if args.input == '-':
+            messages = solve(args.day, content=sys.stdin.read(), socket_path=socket_path, trace_memory=args.memory)
+        else:
+            path = args.input or str(load_day(args.day).input_path)
+            messages = solve(args.day, path=path, socket_path=socket_path, trace_memory=args.memory)
+
+        for message in messages:
+            if message.get('done'):
+                if message['error']:
+                    print(f"Error: {message['error']}", file=sys.stderr)
+                    return 1
+            else:
+                cached = " (cached)" if message['cached'] else ""
+                answer = '' if message['answer'] is None else f" {message['answer']}"
+                print(f"{message['phase']}{cached}:{answer} [{message['wall_time'] * 1000:0.2f}ms]")
+    except (ConnectionError, FileNotFoundError) as e:
+        print(f"Cannot connect to the daemon on {socket_path}: {e}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import importlib
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Numbers of all days that can be loaded
+DAYS: List[int] = list(range(1, 26))
+
+
+def get_day_dir(number: int) -> Path:
+    """
+    get_day_dir(7)  # => Path('.../day07')
+    """
+    return ROOT_DIR / f"day{number:02d}"
+
+
+@dataclass
+class Day:
+    """
+    A loaded day's module together with the uniform interface to it.
+
+    Every day module provides ``parse_input(content)`` and ``part1(parsed)``.
+    All of them but the last one provide ``part2(parsed)`` too.
+    """
+    number: int
+    module: ModuleType
+
+    @property
+    def dir(self) -> Path:
+        return get_day_dir(self.number)
+
+    @property
+    def input_path(self) -> Path:
+        return self.dir / 'input.txt'
+
+    def parse(self, content: str) -> Any:
+        return self.module.parse_input(content)
+
+    @property
+    def parts(self) -> Dict[str, Callable[[Any], Any]]:
+        """
+        Returns a dict which maps each part's name ('part1', 'part2') to its function.
+        """
+        parts = {}
+        for name in ['part1', 'part2']:
+            if hasattr(self.module, name):
+                parts[name] = getattr(self.module, name)
+        return parts
+
+
+def _import_day_module(number: int, name: str) -> ModuleType:
+    """
+    Imports a module from the day's directory. The directory is added to sys.path,
+    so that the module can import its siblings the same way it does when run
+    as a script.
+
+    Raises ValueError if there is no such day.
+    """
+    if number not in DAYS:
+        raise ValueError(f"Invalid day: {number!r}")
+
+    day_dir = str(get_day_dir(number))
+    if day_dir not in sys.path:
+        sys.path.insert(0, day_dir)
+
+    return importlib.import_module(name)
+
+
+def load_day(number: int) -> Day:
+    """
+    Imports the day's module.
+
+    Raises ValueError if there is no such day.
+    """
+    return Day(number=number, module=_import_day_module(number, f"day{number}"))
+
+
+def load_generator(number: int) -> Callable[..., str]:
+    """
+    Returns the day's input generator: generate(size, seed=0, **options) -> str.
+    Generators are deterministic, the same size and seed always produce the same input.
+
+    Raises ValueError if there is no such day.
+    """
+    return _import_day_module(number, f"generate_day{number}").generate
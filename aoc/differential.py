@@ -0,0 +1,485 @@
+"""
+Differential testing of fast engines against the reference implementations.
+
+Every engine pair generates random cases, runs both the reference and the fast
+implementation on each one and compares the results. The first mismatching
+case is minimized by repeatedly replacing it with a smaller case which still
+mismatches. The speedup of the fast engine is recorded for every case.
+
+Usage::
+
+    python -m aoc.differential                     # all engine pairs
+    python -m aoc.differential day23 --cases 500   # pairs by names or prefixes
+    python -m aoc.differential -o report.json
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aoc.days import load_day
+
+# Limits the number of cases tried while minimizing a mismatch
+MAX_SHRINK_STEPS = 1000
+
+
+@dataclass
+class EnginePair:
+    """
+    :ivar generate_case: Makes a random case from the random generator.
+    :ivar reference: The reference implementation, takes a case.
+    :ivar fast: The optimized implementation, takes a case.
+    :ivar shrink_case: Yields smaller variations of the case, the most promising first.
+    :ivar describe_case: Makes a JSON-serializable description of the case for reports.
+    """
+    name: str
+    generate_case: Callable[[random.Random], Any] = field(repr=False)
+    reference: Callable[[Any], Any] = field(repr=False)
+    fast: Callable[[Any], Any] = field(repr=False)
+    shrink_case: Callable[[Any], Iterator[Any]] = field(default=lambda case: iter(()), repr=False)
+    describe_case: Callable[[Any], Any] = field(default=repr, repr=False)
+
+
+@dataclass
+class Outcome:
+    """
+    The result of running an implementation on a case, or the exception it raised.
+    """
+    result: Any = None
+    error: Optional[str] = None
+    time: float = 0.0
+
+    def matches(self, other: 'Outcome') -> bool:
+        if self.error or other.error:
+            return self.error == other.error
+        return bool(self.result == other.result)
+
+
+@dataclass
+class CaseResult:
+    """
+    :ivar speedup: The reference's time divided by the fast engine's time.
+    """
+    case: Any
+    matched: bool
+    reference_time: float
+    fast_time: float
+    speedup: float
+
+
+@dataclass
+class Mismatch:
+    """
+    :ivar case: The minimized mismatching case.
+    :ivar original_case: The case the mismatch was found on.
+    """
+    case: Any
+    original_case: Any
+    reference: Any
+    fast: Any
+
+
+@dataclass
+class PairReport:
+    """
+    :ivar mean_speedup: The geometric mean of the speedups over all cases.
+    """
+    name: str
+    cases: List[CaseResult] = field(default_factory=list)
+    mismatch: Optional[Mismatch] = None
+
+    @property
+    def mean_speedup(self) -> float:
+        if not self.cases:
+            return math.nan
+        return math.exp(sum(math.log(c.speedup) for c in self.cases) / len(self.cases))
+
+
+def run_engine(engine: Callable[[Any], Any], case: Any) -> Outcome:
+    started = time.perf_counter()
+    try:
+        result = engine(case)
+    except Exception as e:
+        return Outcome(error=type(e).__name__, time=time.perf_counter() - started)
+    return Outcome(result=result, time=time.perf_counter() - started)
+
+
+def compare(pair: EnginePair, case: Any) -> Tuple[Outcome, Outcome]:
+    return run_engine(pair.reference, case), run_engine(pair.fast, case)
+
+
+def minimize(pair: EnginePair, case: Any, max_steps: int = MAX_SHRINK_STEPS) -> Any:
+    """
+    Greedily shrinks the mismatching case: takes the first smaller variation
+    which still mismatches, until none of them does or the steps run out.
+    """
+    steps = 0
+    shrunk = True
+    while shrunk and steps < max_steps:
+        shrunk = False
+        for candidate in pair.shrink_case(case):
+            steps += 1
+            reference, fast = compare(pair, candidate)
+            if not reference.matches(fast):
+                case = candidate
+                shrunk = True
+                break
+            if steps >= max_steps:
+                break
+
+    return case
+
+
+def _describe_outcome(outcome: Outcome) -> Any:
+    return f"raised {outcome.error}" if outcome.error else outcome.result
+
+
+def run_pair(pair: EnginePair, cases: int = 100, seed: int = 0) -> PairReport:
+    """
+    Runs the engine pair on random cases, stopping at the first mismatch.
+    """
+    rng = random.Random(seed)
+    report = PairReport(name=pair.name)
+
+    for _ in range(cases):
+        case = pair.generate_case(rng)
+        reference, fast = compare(pair, case)
+        matched = reference.matches(fast)
+        # Guard against the timer resolution on tiny cases
+        speedup = max(reference.time, 1e-9) / max(fast.time, 1e-9)
+        report.cases.append(CaseResult(pair.describe_case(case), matched, reference.time, fast.time, speedup))
+
+        if not matched:
+            minimized = minimize(pair, case)
+            reference, fast = compare(pair, minimized)
+            report.mismatch = Mismatch(
+                case=pair.describe_case(minimized),
+                original_case=pair.describe_case(case),
+                reference=_describe_outcome(reference),
+                fast=_describe_outcome(fast),
+            )
+            break
+
+    return report
+
+
+# Day 1: all combinations of the entries against find_k_sum
+
+KSumCase = Tuple[Tuple[int, ...], int, int]
+
+
+def _generate_k_sum_case(rng: random.Random) -> KSumCase:
+    """
+    Makes (numbers, k, target). The numbers are few and small, so that they have
+    many duplicates and combinations adding up to the target.
+    """
+    numbers = tuple(rng.randint(-5, 30) for _ in range(rng.randint(0, 12)))
+    k = rng.randint(1, 5)
+    return numbers, k, rng.randint(-5, 15 * k)
+
+
+def _find_k_sum_reference(case: KSumCase) -> List[Tuple[int, ...]]:
+    numbers, k, target = case
+    return sorted({
+        tuple(sorted(combination))
+        for combination in itertools.combinations(numbers, k)
+        if sum(combination) == target
+    })
+
+
+def _find_k_sum_fast(case: KSumCase) -> List[Tuple[int, ...]]:
+    numbers, k, target = case
+    return load_day(1).module.find_k_sum(numbers, k, target)
+
+
+def _shrink_k_sum_case(case: KSumCase) -> Iterator[KSumCase]:
+    numbers, k, target = case
+    for i in range(len(numbers)):
+        yield numbers[:i] + numbers[i + 1:], k, target
+    if k > 1:
+        yield numbers, k - 1, target
+
+
+# Day 3: walking every slope step by step against count_trees_many
+
+SlopesCase = Tuple[Tuple[str, ...], Tuple[Tuple[int, int], ...]]
+
+
+def _generate_slopes_case(rng: random.Random) -> SlopesCase:
+    """
+    Makes (map lines, slopes).
+    """
+    width = rng.randint(1, 40)
+    lines = tuple(''.join(rng.choice('#..') for _ in range(width)) for _ in range(rng.randint(1, 60)))
+    slopes = tuple((rng.randint(-10, 50), rng.randint(1, 6)) for _ in range(rng.randint(1, 10)))
+    return lines, slopes
+
+
+def _count_trees_reference(case: SlopesCase) -> List[int]:
+    lines, slopes = case
+    day3 = load_day(3).module
+    slope_map = day3.parse_map('\n'.join(lines))
+
+    counts = []
+    for right, down in slopes:
+        location = day3.Coords(row=0, column=0)
+        trees = 0
+        while slope_map.is_in_bounds(location):
+            if slope_map.is_tree(location):
+                trees += 1
+            location = location.add(right, down)
+        counts.append(trees)
+    return counts
+
+
+def _count_trees_fast(case: SlopesCase) -> List[int]:
+    lines, slopes = case
+    day3 = load_day(3).module
+    return day3.count_trees_many(day3.parse_map('\n'.join(lines)), list(slopes))
+
+
+def _shrink_slopes_case(case: SlopesCase) -> Iterator[SlopesCase]:
+    lines, slopes = case
+    for i in range(len(slopes)):
+        if len(slopes) > 1:
+            yield lines, slopes[:i] + slopes[i + 1:]
+    if len(lines) > 1:
+        yield lines[:len(lines) // 2], slopes
+        yield lines[:-1], slopes
+
+
+# Day 4: the field validators against the compiled passport schema
+
+# Valid, invalid and unusual values of every field, e.g. numbers int() accepts
+# but the patterns don't, and digits of other scripts
+_PASSPORT_VALUES = {
+    'byr': ['1920', '2002', '1919', '2003', '+1950', '01950', '-1950', '1_950', '\u0661\u0669\u0665\u0660', 'abc', ''],
+    'iyr': ['2010', '2020', '2009', '2021', '+2015', '2015.0'],
+    'eyr': ['2020', '2030', '2019', '2031', '02025', '2025x'],
+    'hgt': ['150cm', '193cm', '149cm', '194cm', '59in', '76in', '58in', '77in', '+150cm', '0150cm', '150',
+            'cm', '150mm', '\u0661\u0665\u0660cm', '60cmin'],
+    'hcl': ['#123abc', '#123abz', '123abc', '#123ABC', '#123abcd', '#12345'],
+    'ecl': ['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth', 'wat', 'ambb', ''],
+    'pid': ['000000001', '0123456789', '12345678', '\u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669',
+            '12345678a'],
+    'cid': ['147'],
+}
+
+
+def _generate_passport_case(rng: random.Random) -> Dict[str, str]:
+    fields = {}
+    for key, values in _PASSPORT_VALUES.items():
+        if rng.random() < 0.9:
+            fields[key] = rng.choice(values)
+    return fields
+
+
+def _passport_is_valid_reference(case: Dict[str, str]) -> bool:
+    day4 = load_day(4).module
+    return day4.passport_is_valid_by_validators(day4.Passport(fields=dict(case)))
+
+
+def _passport_is_valid_fast(case: Dict[str, str]) -> bool:
+    day4 = load_day(4).module
+    return day4.passport_is_valid(day4.Passport(fields=dict(case)))
+
+
+def _shrink_passport_case(case: Dict[str, str]) -> Iterator[Dict[str, str]]:
+    for key in case:
+        yield {k: v for k, v in case.items() if k != key}
+
+
+# Day 5: decode_seat_ids and find_missing_seat_ids against decode_seat and find_missing_seats
+
+_ROW_LETTERS = str.maketrans('01', 'FB')
+_COLUMN_LETTERS = str.maketrans('01', 'LR')
+
+
+def _generate_boarding_passes_case(rng: random.Random) -> List[str]:
+    """
+    Makes the passes of a block of seats with some of them free.
+    """
+    first_id = rng.randint(0, 1000)
+    seat_ids = [i for i in range(first_id, min(first_id + rng.randint(1, 200), 1024)) if rng.random() < 0.95]
+    return [format(i >> 3, '07b').translate(_ROW_LETTERS) + format(i & 7, '03b').translate(_COLUMN_LETTERS)
+            for i in seat_ids]
+
+
+def _find_missing_seats_reference(case: List[str]) -> Tuple[int, List[int]]:
+    day5 = load_day(5).module
+    seats = [day5.decode_seat(bsp) for bsp in case]
+    return max(seat.id for seat in seats), [seat.id for seat in day5.find_missing_seats(seats)]
+
+
+def _find_missing_seats_fast(case: List[str]) -> Tuple[int, List[int]]:
+    day5 = load_day(5).module
+    seat_ids = day5.decode_seat_ids('\n'.join(case))
+    return max(seat_ids), day5.find_missing_seat_ids(seat_ids)
+
+
+def _shrink_boarding_passes_case(case: List[str]) -> Iterator[List[str]]:
+    for i in range(len(case)):
+        if len(case) > 1:
+            yield case[:i] + case[i + 1:]
+
+
+# Day 23: CupCircle against play_cups
+
+CupsCase = Tuple[Tuple[int, ...], int, int]
+
+
+def _generate_cups_case(rng: random.Random) -> CupsCase:
+    """
+    Makes (labels, rounds, total_cups).
+    """
+    labels = list(range(1, rng.randint(5, 20) + 1))
+    rng.shuffle(labels)
+    return tuple(labels), rng.randint(0, 300), len(labels) + rng.choice([0, 0, rng.randint(1, 50)])
+
+
+def _play_cups_reference(case: CupsCase) -> List[int]:
+    labels, rounds, total_cups = case
+    day23 = load_day(23).module
+
+    first_cup = day23.CupList(value=labels[0], next_cup=None)
+    last_cup = first_cup
+    for label in labels[1:]:
+        last_cup.next_cup = day23.CupList(value=label, next_cup=None)
+        last_cup = last_cup.next_cup
+    last_cup.next_cup = first_cup
+
+    circle = day23.CupCircle(cups=first_cup)
+    circle.expand_to(total_cups)
+    for _ in range(rounds):
+        circle.play_round()
+
+    one_cup = circle.cups.find(1)
+    return one_cup.next_cup.to_list(before=one_cup)
+
+
+def _play_cups_fast(case: CupsCase) -> List[int]:
+    labels, rounds, total_cups = case
+    return load_day(23).module.play_cups(list(labels), rounds, total_cups)
+
+
+def _shrink_cups_case(case: CupsCase) -> Iterator[CupsCase]:
+    labels, rounds, total_cups = case
+    if rounds:
+        yield labels, rounds // 2, total_cups
+        yield labels, rounds - 1, total_cups
+    if total_cups > len(labels):
+        yield labels, rounds, len(labels) + (total_cups - len(labels)) // 2
+        yield labels, rounds, total_cups - 1
+    if len(labels) > 5 and total_cups == len(labels):
+        smaller = tuple(label for label in labels if label != len(labels))
+        yield smaller, rounds, len(smaller)
+
+
+ENGINE_PAIRS: List[EnginePair] = [
+    EnginePair(
+        'day01.k_sum',
+        generate_case=_generate_k_sum_case,
+        reference=_find_k_sum_reference,
+        fast=_find_k_sum_fast,
+        shrink_case=_shrink_k_sum_case,
+        describe_case=list,
+    ),
+    EnginePair(
+        'day03.slopes',
+        generate_case=_generate_slopes_case,
+        reference=_count_trees_reference,
+        fast=_count_trees_fast,
+        shrink_case=_shrink_slopes_case,
+        describe_case=list,
+    ),
+    EnginePair(
+        'day04.schema',
+        generate_case=_generate_passport_case,
+        reference=_passport_is_valid_reference,
+        fast=_passport_is_valid_fast,
+        shrink_case=_shrink_passport_case,
+        describe_case=dict,
+    ),
+    EnginePair(
+        'day05.seats',
+        generate_case=_generate_boarding_passes_case,
+        reference=_find_missing_seats_reference,
+        fast=_find_missing_seats_fast,
+        shrink_case=_shrink_boarding_passes_case,
+        describe_case=list,
+    ),
+    EnginePair(
+        'day23.cups',
+        generate_case=_generate_cups_case,
+        reference=_play_cups_reference,
+        fast=_play_cups_fast,
+        shrink_case=_shrink_cups_case,
+        describe_case=list,
+    ),
+]
+
+
+def select_pairs(names: Sequence[str]) -> List[EnginePair]:
+    """
+    Selects engine pairs by their names (day23.cups) or name prefixes (day23).
+    All pairs are selected if no names are given.
+
+    Raises ValueError if a name matches no pairs.
+    """
+    if not names:
+        return list(ENGINE_PAIRS)
+
+    selected = []
+    for name in names:
+        matching = [p for p in ENGINE_PAIRS if p.name == name or p.name.startswith(name + '.')]
+        if not matching:
+            raise ValueError(f"No engine pairs match {name!r}")
+        selected.extend(p for p in matching if p not in selected)
+
+    return selected
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m aoc.differential', description="Compare the fast engines to the reference ones.")
+    parser.add_argument('names', nargs='*', metavar='NAME', help="engine pairs to run, e.g. day23.cups or day23")
+    parser.add_argument('--cases', type=int, default=100, help="number of random cases per pair")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="write the reports to this JSON file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    try:
+        pairs = select_pairs(args.names)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    reports = []
+    for pair in pairs:
+        report = run_pair(pair, cases=args.cases, seed=args.seed)
+        status = "MISMATCH" if report.mismatch else "ok"
+        print(f"{report.name:<24} {status:<8} {len(report.cases)} cases, speedup x{report.mean_speedup:0.2f}")
+        if report.mismatch:
+            print(f"  case:      {report.mismatch.case}", file=sys.stderr)
+            print(f"  reference: {report.mismatch.reference}", file=sys.stderr)
+            print(f"  fast:      {report.mismatch.fast}", file=sys.stderr)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([{**asdict(r), 'mean_speedup': r.mean_speedup} for r in reports], f, indent=2, default=repr)
+
+    return 1 if any(r.mismatch for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
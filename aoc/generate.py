@@ -0,0 +1,47 @@
+"""
+Generates puzzle inputs of any size.
+
+Usage::
+
+    python -m aoc.generate 7 1000              # 1000 bag rules to stdout
+    python -m aoc.generate 7 1000 --seed 3 -o rules.txt
+
+What the size means depends on the day, see the generate function
+in each day's generate_dayN.py.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from aoc.days import load_generator
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc.generate', description="Generate a puzzle input.")
+    parser.add_argument('day', type=int)
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="output file (stdout by default)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    try:
+        content = load_generator(args.day)(args.size, seed=args.seed)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(content)
+    else:
+        sys.stdout.write(content)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Profiling of the days' phases with cProfile, tracemalloc and a stack sampler.
+
+Every phase is profiled separately. For each one the report has the top
+functions by cumulative time, the top allocation sites and the stacks
+collapsed for flamegraphs, and is saved to the output directory as::
+
+    day11.part1.prof       # cProfile stats, for pstats or snakeviz
+    day11.part1.json       # the report, to diff between releases
+    day11.part1.collapsed  # "frame;frame;frame count" lines, for flamegraph.pl
+
+The runner does it with ``python -m aoc 11 --profile``. The profilers slow
+the code down a lot, so the timings are only comparable to each other.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc.days import ROOT_DIR, load_day
+from aoc.timing import format_bytes
+
+DEFAULT_TOP = 15
+DEFAULT_SAMPLE_INTERVAL = 0.001
+
+
+@dataclass
+class FunctionStats:
+    """
+    :ivar function: "path:line(name)", the path is relative to the repository if possible.
+    :ivar total_time: The time spent in the function itself in seconds.
+    :ivar cumulative_time: The time spent in the function and everything it called in seconds.
+    """
+    function: str
+    calls: int
+    total_time: float
+    cumulative_time: float
+
+
+@dataclass
+class AllocationSite:
+    """
+    :ivar location: "path:line" of the allocating line.
+    :ivar size: The total size of the blocks allocated by the line and still alive
+        at the end of the phase, in bytes.
+    :ivar count: The number of these blocks.
+    """
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class PhaseProfile:
+    """
+    :ivar wall_time: The time the phase took under the profilers, in seconds.
+    :ivar peak_memory: The peak size of memory allocated during the phase in bytes.
+    :ivar stacks: The number of samples of every stack, the frames are joined with ";"
+        from the outermost one.
+    """
+    day: int
+    phase: str
+    wall_time: float
+    peak_memory: int
+    functions: List[FunctionStats] = field(default_factory=list)
+    allocations: List[AllocationSite] = field(default_factory=list)
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"day{self.day:02d}.{self.phase}"
+
+
+def _relative_path(path: str) -> str:
+    try:
+        relative = os.path.relpath(path, ROOT_DIR)
+    except ValueError:
+        return path
+    return path if relative.startswith('..') else relative
+
+
+class StackSampler:
+    """
+    Samples the stack of the thread which started it from another thread.
+    Only the frames below the one that called start() are recorded.
+
+    The sampling thread can only run when the sampled one releases the GIL,
+    so the GIL's switch interval is lowered to the sampling interval while sampling.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._base_depth = 0
+        self._switch_interval = 0.0
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        # The caller's frame and the ones above it are not recorded
+        frame = sys._getframe(1)
+        self._base_depth = 0
+        while frame is not None:
+            self._base_depth += 1
+            frame = frame.f_back
+
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+
+            codes.reverse()
+            codes = codes[self._base_depth:]
+            # Skip the samples taken while the sampled thread starts or stops the sampler
+            if not codes or codes[0].co_filename == __file__:
+                continue
+
+            stack = ';'.join(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})" for code in codes)
+            self.stacks[stack] += 1
+
+
+def _get_function_stats(stats: pstats.Stats, top: int) -> List[FunctionStats]:
+    functions = []
+    for (path, line, name), (_, calls, total_time, cumulative_time, _) in stats.stats.items():  # type: ignore
+        # Built-in functions have no file
+        location = f"{_relative_path(path)}:{line}({name})" if path != '~' else name
+        functions.append(FunctionStats(location, calls, total_time, cumulative_time))
+
+    functions.sort(key=lambda f: f.cumulative_time, reverse=True)
+    return functions[:top]
+
+
+def _get_allocation_sites(snapshot: tracemalloc.Snapshot, top: int) -> List[AllocationSite]:
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        # The stack sampler's thread
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    sites = []
+    for statistic in snapshot.statistics('lineno')[:top]:
+        frame = statistic.traceback[0]
+        location = f"{_relative_path(frame.filename)}:{frame.lineno}"
+        sites.append(AllocationSite(location, statistic.size, statistic.count))
+    return sites
+
+
+def profile_call(
+            day_number: int,
+            phase: str,
+            func: Callable[..., Any],
+            *args: Any,
+            top: int = DEFAULT_TOP,
+        ) -> Tuple[Any, PhaseProfile, pstats.Stats]:
+    """
+    Calls the function under cProfile, tracemalloc and the stack sampler.
+
+    :returns: The function's result, the profile and the complete cProfile stats.
+    """
+    tracemalloc.start()
+    sampler = StackSampler()
+    profiler = cProfile.Profile()
+
+    sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+        wall_time = time.perf_counter() - started
+        sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stats = pstats.Stats(profiler)
+    profile = PhaseProfile(
+        day=day_number,
+        phase=phase,
+        wall_time=wall_time,
+        peak_memory=peak_memory,
+        functions=_get_function_stats(stats, top),
+        allocations=_get_allocation_sites(snapshot, top),
+        stacks=dict(sampler.stacks),
+    )
+    return result, profile, stats
+
+
+def profile_day(
+            day_number: int,
+            content: str,
+            top: int = DEFAULT_TOP,
+            directory: Optional[Path] = None,
+        ) -> List[PhaseProfile]:
+    """
+    Profiles parsing the content and solving every part of the day.
+    The caches are not used, so that the real work is profiled.
+
+    :param directory: Where to save the profiles, see save_profile. They are not saved if it's None.
+    """
+    day = load_day(day_number)
+    phases: List[Tuple[str, Callable[[Any], Any]]] = [('parse', day.parse), *day.parts.items()]
+
+    profiles = []
+    argument: Any = content
+    for phase, func in phases:
+        result, profile, stats = profile_call(day_number, phase, func, argument, top=top)
+        if phase == 'parse':
+            # The parts take the parsed input
+            argument = result
+        if directory is not None:
+            save_profile(profile, stats, directory)
+        profiles.append(profile)
+
+    return profiles
+
+
+def format_collapsed(profile: PhaseProfile) -> str:
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(profile.stacks.items()))
+
+
+def save_profile(profile: PhaseProfile, stats: pstats.Stats, directory: Path) -> List[Path]:
+    """
+    Saves the profile as .prof, .json and .collapsed files into the directory.
+
+    :returns: The paths of the saved files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    prof_path = directory / f"{profile.name}.prof"
+    json_path = directory / f"{profile.name}.json"
+    collapsed_path = directory / f"{profile.name}.collapsed"
+
+    stats.dump_stats(str(prof_path))
+
+    with open(json_path, 'w') as f:
+        json.dump(asdict(profile), f, indent=2)
+
+    with open(collapsed_path, 'w') as f:
+        f.write(format_collapsed(profile))
+
+    return [prof_path, json_path, collapsed_path]
+
+
+def format_profile(profile: PhaseProfile) -> str:
+    lines = [
+        f"Day {profile.day} {profile.phase}: {profile.wall_time * 1000:0.2f}ms, "
+        f"peak memory {format_bytes(profile.peak_memory)}",
+        f"  {'Cumul, ms':>10}  {'Own, ms':>10}  {'Calls':>9}  Function",
+    ]
+    for f in profile.functions:
+        lines.append(
+            f"  {f.cumulative_time * 1000:10.2f}  {f.total_time * 1000:10.2f}  {f.calls:9d}  {f.function}")
+
+    lines.append(f"  {'Size':>10}  {'Blocks':>10}  Allocated at")
+    for site in profile.allocations:
+        lines.append(f"  {format_bytes(site.size):>10}  {site.count:10d}  {site.location}")
+
+    return '\n'.join(lines)
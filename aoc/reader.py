@@ -0,0 +1,119 @@
+"""
+Memory-mapped input reading.
+
+The file is mapped into memory instead of being read, and its lines or
+blank-line-separated blocks are produced lazily, so only the current one
+is copied out of the mapping. The parsers which take the blocks of the input
+(day 4's parse_passports_file, day 6's parse_answers, day 20's parse_tiles
+and day 22's parse_decks) consume them directly::
+
+    with MappedFile('passports.txt') as f:
+        passports = parse_passports_file(f.blocks())
+"""
+import mmap
+import re
+from typing import Iterator, Optional, Union
+
+_NEWLINE = b'\n'
+# A blank line is a line of nothing but whitespace, the last line may lack its line ending
+_BLANK_LINES = re.compile(rb'(?:[ \t\r\f\v]*\n)*')
+_BLANK_TAIL = re.compile(rb'(?:[ \t\r\f\v]*\n)*[ \t\r\f\v]*\Z')
+# The line ending of the last line of a block and the blank line after it, but the \r of \r\n
+_BLOCK_END = re.compile(rb'\n[ \t\r\f\v]*(?:\n|\Z)')
+
+
+class MappedFile:
+    """
+    A memory-mapped file. Use it as a context manager, or close it explicitly.
+
+    With an encoding the lines and blocks are decoded into strings. Without it
+    they are memoryview slices of the mapping, which don't copy anything,
+    but must be released before the file is closed.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            # Empty files cannot be mapped
+            self._mapping: Optional[mmap.mmap] = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._file.seek(0, 2) else None
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> 'MappedFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._mapping) if self._mapping is not None else 0
+
+    def _slice(self, start: int, end: int, encoding: Optional[str]) -> Union[str, memoryview]:
+        assert self._mapping is not None
+        if encoding is None:
+            return memoryview(self._mapping)[start:end]
+        return self._mapping[start:end].decode(encoding)
+
+    def lines(self, encoding: Optional[str] = 'utf-8') -> Iterator[Union[str, memoryview]]:
+        """
+        Yields the lines without the line endings. Like str.splitlines,
+        there's no empty line after the last line ending.
+        """
+        if self._mapping is None:
+            return
+
+        mapping = self._mapping
+        size = len(mapping)
+        start = 0
+        while start < size:
+            end = mapping.find(_NEWLINE, start)
+            if end == -1:
+                end = size
+            yield self._slice(start, end, encoding)
+            start = end + 1
+
+    def blocks(self, encoding: Optional[str] = 'utf-8') -> Iterator[Union[str, memoryview]]:
+        """
+        Yields the blocks of lines separated by blank lines, without the surrounding line endings.
+        Lines of only whitespace are blank, any number of them separate the blocks,
+        and \\r\\n line endings are allowed. The decoded blocks have \\n line endings,
+        the memoryviews keep the file's line endings inside the blocks.
+        """
+        if self._mapping is None:
+            return
+
+        mapping = self._mapping
+        start = 0
+        while not _BLANK_TAIL.match(mapping, start):
+            block_start = _BLANK_LINES.match(mapping, start).end()
+            block_end = _BLOCK_END.search(mapping, block_start)
+            end, start = (block_end.start(), block_end.end()) if block_end else (len(mapping), len(mapping))
+            if mapping[end - 1] == ord('\r'):
+                end -= 1
+
+            block = self._slice(block_start, end, encoding)
+            yield block.replace('\r\n', '\n') if encoding is not None else block
+
+
+def iter_lines(path: str, encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Yields the decoded lines of the file, see MappedFile.lines.
+    """
+    with MappedFile(path) as f:
+        yield from f.lines(encoding)
+
+
+def iter_blocks(path: str, encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Yields the decoded blank-line-separated blocks of the file, see MappedFile.blocks.
+    """
+    with MappedFile(path) as f:
+        yield from f.blocks(encoding)
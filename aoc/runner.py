@@ -0,0 +1,297 @@
+"""
+The unified runner for all days.
+
+Usage::
+
+    python -m aoc 7                  # run day 7 on day07/input.txt
+    python -m aoc 7 -i other.txt     # run day 7 on another input
+    python -m aoc 7 -i - < other.txt # read the input from stdin
+    python -m aoc -j 4               # run all days in a pool of 4 processes
+    python -m aoc 20 --no-cache      # parse and solve even if the input or the answers are cached
+    python -m aoc 11 --profile       # profile each phase, see aoc.profiling
+"""
+import argparse
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence
+
+from aoc.answers import AnswerCache, get_default_answer_cache
+from aoc.cache import ParseCache, get_default_cache, make_key, parse_cached
+from aoc.days import DAYS, load_day
+from aoc.profiling import DEFAULT_TOP, format_profile, profile_day
+from aoc.timing import Measurement, format_bytes, measure
+
+PHASES = ['parse', 'part1', 'part2']
+
+
+@dataclass
+class PhaseResult:
+    """
+    The outcome of a single phase of a day: parsing or solving one of the parts.
+
+    :ivar answer: The part's answer. None for the parsing phase.
+    :ivar cached: True if the parsed input or the answer is loaded from the cache.
+    """
+    phase: str
+    measurement: Measurement
+    answer: Any = None
+    cached: bool = False
+
+
+@dataclass
+class DayResult:
+    """
+    The outcome of running a single day on a single input.
+
+    :ivar error: The description of the exception that interrupted the run, if any.
+        Phases that completed before the error are kept.
+    """
+    day: int
+    phases: List[PhaseResult] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def get_answer(self, phase: str) -> Any:
+        for phase_result in self.phases:
+            if phase_result.phase == phase:
+                return phase_result.answer
+
+        raise KeyError(phase)
+
+
+def read_input(path: str) -> str:
+    """
+    Reads the puzzle input from the file. "-" stands for stdin.
+    """
+    if path == '-':
+        return sys.stdin.read()
+
+    with open(path) as f:
+        return f.read()
+
+
+def iter_phases(
+            day_number: int,
+            content: str,
+            trace_memory: bool = True,
+            cache: Optional[ParseCache] = None,
+            answers: Optional[AnswerCache] = None,
+        ) -> Iterator[PhaseResult]:
+    """
+    Parses the content and solves every part of the day, yielding the result
+    of each phase as soon as it completes. Exceptions are propagated.
+
+    :param cache: The cache of parsed inputs. The content is always parsed if it's None.
+    :param answers: The cache of answers. If it has the answers to all parts,
+        the content is not parsed at all.
+    """
+    day = load_day(day_number)
+
+    cached_answers = {}
+    if answers is not None:
+        input_hash = make_key(day, content)
+        for part_name in day.parts:
+            with measure(trace_memory) as measurement:
+                found, answer = answers.get(day_number, part_name, input_hash)
+            if found:
+                cached_answers[part_name] = PhaseResult(part_name, measurement, answer, cached=True)
+
+    if len(cached_answers) < len(day.parts):
+        with measure(trace_memory) as measurement:
+            parsed, cached = parse_cached(day, content, cache)
+        yield PhaseResult('parse', measurement, cached=cached)
+
+    for part_name, solve in day.parts.items():
+        if part_name in cached_answers:
+            yield cached_answers[part_name]
+            continue
+
+        with measure(trace_memory) as measurement:
+            answer = solve(parsed)
+        yield PhaseResult(part_name, measurement, answer)
+
+        if answers is not None:
+            answers.put(day_number, part_name, input_hash, answer)
+
+
+def format_exception(e: Exception) -> str:
+    return ''.join(traceback.format_exception_only(type(e), e)).strip()
+
+
+def run_day(
+            day_number: int,
+            content: str,
+            trace_memory: bool = True,
+            cache: Optional[ParseCache] = None,
+            answers: Optional[AnswerCache] = None,
+        ) -> DayResult:
+    """
+    Same as iter_phases, but collects the phases into a result.
+    Exceptions raised by the day's code are recorded in the result rather than propagated.
+    """
+    result = DayResult(day=day_number)
+
+    try:
+        for phase_result in iter_phases(day_number, content, trace_memory, cache, answers):
+            result.phases.append(phase_result)
+    except Exception as e:
+        result.error = format_exception(e)
+
+    return result
+
+
+def run_day_file(
+            day_number: int,
+            path: Optional[str] = None,
+            trace_memory: bool = True,
+            cache: Optional[ParseCache] = None,
+            answers: Optional[AnswerCache] = None,
+        ) -> DayResult:
+    """
+    Same as run_day, but reads the input from the path. Defaults to the day's input.txt.
+    """
+    if path is None:
+        path = str(load_day(day_number).input_path)
+
+    try:
+        content = read_input(path)
+    except OSError as e:
+        return DayResult(day=day_number, error=f"Cannot read {path!r}: {e}")
+
+    return run_day(day_number, content, trace_memory=trace_memory, cache=cache, answers=answers)
+
+
+def run_days(
+            day_numbers: Sequence[int],
+            jobs: int = 1,
+            trace_memory: bool = True,
+            cache: Optional[ParseCache] = None,
+            answers: Optional[AnswerCache] = None,
+        ) -> List[DayResult]:
+    """
+    Runs each day on its own input.txt. With jobs > 1 the days are run in a pool
+    of processes. The results are returned in the order of day_numbers.
+    """
+    if jobs <= 1:
+        return [run_day_file(n, trace_memory=trace_memory, cache=cache, answers=answers) for n in day_numbers]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_day_file, n, None, trace_memory, cache, answers) for n in day_numbers]
+        return [future.result() for future in futures]
+
+
+def format_results(results: List[DayResult]) -> str:
+    """
+    Formats the results as a table with a row per phase.
+    """
+    header = ('Day', 'Phase', 'Answer', 'Wall, ms', 'CPU, ms', 'Peak mem')
+    rows = []
+    for result in results:
+        for phase_result in result.phases:
+            m = phase_result.measurement
+            rows.append((
+                str(result.day),
+                f"{phase_result.phase} (cached)" if phase_result.cached else phase_result.phase,
+                '' if phase_result.answer is None else str(phase_result.answer),
+                f"{m.wall_time * 1000:0.2f}",
+                f"{m.cpu_time * 1000:0.2f}",
+                format_bytes(m.peak_memory),
+            ))
+
+        if result.error:
+            rows.append((str(result.day), 'error', result.error, '', '', ''))
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    # Left-align the text columns, right-align the numbers
+    aligns = ['>', '<', '<', '>', '>', '>']
+
+    lines = []
+    for row in [header, *rows]:
+        cells = [f"{cell:{align}{width}}" for cell, align, width in zip(row, aligns, widths)]
+        lines.append('  '.join(cells).rstrip())
+    lines.insert(1, '  '.join('-' * width for width in widths))
+
+    return '\n'.join(lines)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc', description="Run the solutions and time them.")
+    parser.add_argument(
+        'days', nargs='*', type=int, metavar='DAY',
+        help="days to run (all days by default)")
+    parser.add_argument(
+        '-i', '--input',
+        help="input file, '-' for stdin (only with a single day, defaults to the day's input.txt)")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help="number of processes to run the days in (defaults to the number of CPUs)")
+    parser.add_argument(
+        '--no-memory', action='store_true',
+        help="do not trace memory, it slows down allocation-heavy code")
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="always parse and solve instead of loading the parsed input and the answers from the cache")
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="profile every phase, print the hot spots and save the profiles (the caches are not used)")
+    parser.add_argument(
+        '--profile-dir', default='profiles',
+        help="where to save the profiles (default: %(default)s)")
+    parser.add_argument(
+        '--profile-top', type=int, default=DEFAULT_TOP,
+        help="number of functions and allocation sites to report (default: %(default)s)")
+    return parser
+
+
+def _profile_days(day_numbers: Sequence[int], path: Optional[str], directory: str, top: int) -> int:
+    """
+    Profiles the days one by one and prints the reports.
+    """
+    for day_number in day_numbers:
+        input_path = path if path is not None else str(load_day(day_number).input_path)
+        try:
+            content = read_input(input_path)
+        except OSError as e:
+            print(f"Cannot read {input_path!r}: {e}", file=sys.stderr)
+            return 1
+
+        for profile in profile_day(day_number, content, top=top, directory=Path(directory)):
+            print(format_profile(profile))
+            print()
+
+    print(f"Profiles are saved to {directory}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    day_numbers = args.days or DAYS
+    for day_number in day_numbers:
+        if day_number not in DAYS:
+            print(f"Invalid day: {day_number}", file=sys.stderr)
+            return 2
+
+    trace_memory = not args.no_memory
+    cache = None if args.no_cache else get_default_cache()
+    answers = None if args.no_cache else get_default_answer_cache()
+
+    if args.input is not None and len(day_numbers) != 1:
+        print("--input can only be used with a single day", file=sys.stderr)
+        return 2
+
+    if args.profile:
+        return _profile_days(day_numbers, args.input, args.profile_dir, args.profile_top)
+
+    if args.input is not None:
+        results = [run_day_file(day_numbers[0], args.input, trace_memory=trace_memory, cache=cache, answers=answers)]
+    else:
+        jobs = args.jobs or min(len(day_numbers), os.cpu_count() or 1)
+        results = run_days(day_numbers, jobs=jobs, trace_memory=trace_memory, cache=cache, answers=answers)
+
+    print(format_results(results))
+
+    return 1 if any(r.error for r in results) else 0
@@ -0,0 +1,101 @@
+import pickle
+
+from aoc.answers import AnswerCache, get_default_answer_cache
+from aoc.runner import run_day
+
+DAY13_INPUT = "939\n7,13,x,x,59,x,31,19\n"
+
+
+def test_get_put(tmp_path):
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3')
+    assert cache.get(1, 'part1', 'hash') == (False, None)
+
+    cache.put(1, 'part1', 'hash', 514579)
+    cache.put(23, 'part1', 'hash', '67384529')
+    assert cache.get(1, 'part1', 'hash') == (True, 514579)
+    assert cache.get(23, 'part1', 'hash') == (True, '67384529')
+    assert cache.get(1, 'part2', 'hash') == (False, None)
+    assert cache.get(1, 'part1', 'hash', params='lookbehind=5') == (False, None)
+    assert len(cache) == 2
+
+
+def test_ttl(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('aoc.answers.time.time', lambda: now)
+
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3', ttl=60)
+    cache.put(1, 'part1', 'hash', 1)
+    now += 59
+    assert cache.get(1, 'part1', 'hash') == (True, 1)
+    now += 1
+    assert cache.get(1, 'part1', 'hash') == (False, None)
+    assert len(cache) == 0
+
+
+def test_max_entries(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('aoc.answers.time.time', lambda: now)
+
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3', max_entries=2)
+    for part in ['a', 'b']:
+        now += 1
+        cache.put(1, part, 'hash', part)
+
+    # Reading 'a' makes 'b' the least recently used entry
+    now += 1
+    cache.get(1, 'a', 'hash')
+    now += 1
+    cache.put(1, 'c', 'hash', 'c')
+
+    assert len(cache) == 2
+    assert cache.get(1, 'b', 'hash') == (False, None)
+    assert cache.get(1, 'a', 'hash') == (True, 'a')
+
+
+def test_memoize(tmp_path):
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3')
+    calls = []
+
+    @cache.memoize(15, 'part1')
+    def play(starting_numbers, end_at):
+        calls.append(end_at)
+        return sum(starting_numbers) * end_at
+
+    assert play([0, 3, 6], 2020) == 18180
+    assert play([0, 3, 6], 2020) == 18180
+    assert play([0, 3, 6], end_at=10) == 90
+    assert calls == [2020, 10]
+
+
+def test_pickle(tmp_path):
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3')
+    cache.put(1, 'part1', 'hash', 1)
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.get(1, 'part1', 'hash') == (True, 1)
+
+
+def test_run_day_cached_answers(tmp_path):
+    cache = AnswerCache(path=tmp_path / 'answers.sqlite3')
+
+    first = run_day(13, DAY13_INPUT, trace_memory=False, answers=cache)
+    assert [(p.phase, p.cached) for p in first.phases] == [('parse', False), ('part1', False), ('part2', False)]
+
+    second = run_day(13, DAY13_INPUT, trace_memory=False, answers=cache)
+    assert [(p.phase, p.cached) for p in second.phases] == [('part1', True), ('part2', True)]
+    assert second.get_answer('part1') == 295
+    assert second.get_answer('part2') == 1068781
+
+    # Only the missing answer is computed
+    cache.clear()
+    cache.put(13, 'part1', 'stale', 0)
+    third = run_day(13, DAY13_INPUT, trace_memory=False, answers=cache)
+    assert third.get_answer('part1') == 295
+
+
+def test_get_default_answer_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('AOC_CACHE_DIR', str(tmp_path))
+    assert get_default_answer_cache().path == tmp_path / 'answers.sqlite3'
+
+    monkeypatch.setenv('AOC_NO_CACHE', '1')
+    assert get_default_answer_cache() is None
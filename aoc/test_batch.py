@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+
+from aoc import batch
+from aoc.batch import collect_inputs, iter_batch, main
+from aoc.days import load_generator
+
+
+@pytest.fixture
+def inputs_dir(tmp_path):
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    generate = load_generator(13)
+    for seed in range(5):
+        (inputs / f'{seed}.txt').write_text(generate(20, seed=seed))
+    (inputs / 'broken.txt').write_text("not a schedule\n")
+    return inputs
+
+
+def test_collect_inputs(inputs_dir, tmp_path):
+    paths = collect_inputs(str(inputs_dir))
+    assert [p.split('/')[-1] for p in paths] == ['0.txt', '1.txt', '2.txt', '3.txt', '4.txt', 'broken.txt']
+
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text("# seeds\ninputs/1.txt\n\ninputs/3.txt\n")
+    assert collect_inputs(str(manifest)) == [str(inputs_dir / '1.txt'), str(inputs_dir / '3.txt')]
+
+
+@pytest.mark.parametrize("jobs, chunk_size", [(1, 4), (2, 1), (3, 2)])
+def test_iter_batch(inputs_dir, jobs, chunk_size):
+    paths = collect_inputs(str(inputs_dir))
+    results = dict(iter_batch(13, paths, jobs=jobs, chunk_size=chunk_size))
+    assert sorted(results) == sorted(paths)
+
+    errors = {path.split('/')[-1]: result.error for path, result in results.items()}
+    assert errors.pop('broken.txt')
+    assert all(error is None for error in errors.values())
+
+    serial = dict(iter_batch(13, paths[:5]))
+    for path in paths[:5]:
+        assert results[path].get_answer('part2') == serial[path].get_answer('part2')
+
+
+_solve_chunk = batch._solve_chunk
+
+
+def _crash_on_broken_input(day_number, paths, *args):
+    if any(path.endswith('broken.txt') for path in paths):
+        os._exit(1)
+    return _solve_chunk(day_number, paths, *args)
+
+
+def test_iter_batch_worker_crash(inputs_dir, monkeypatch):
+    monkeypatch.setattr(batch, '_solve_chunk', _crash_on_broken_input)
+    paths = collect_inputs(str(inputs_dir))
+    results = dict(iter_batch(13, paths, jobs=2, chunk_size=2))
+    assert sorted(results) == sorted(paths)
+    # The crash breaks the pool, the chunks which didn't finish before it fail too
+    assert 'BrokenProcessPool' in results[paths[-1]].error
+    assert all(result.error or result.get_answer('part2') is not None for result in results.values())
+
+
+def test_main(inputs_dir, tmp_path, capsys):
+    output = tmp_path / 'results.jsonl'
+    assert main(['13', str(inputs_dir), '-j', '2', '--chunk-size', '2', '--no-cache', '-o', str(output)]) == 1
+    assert "[6/6] 1 failed" in capsys.readouterr().err
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 6
+    assert sum(1 for line in lines if line['error']) == 1
+    assert all(line['day'] == 13 for line in lines)
+
+    assert main(['13', str(tmp_path / 'missing')]) == 2
+    assert main(['13', str(inputs_dir), '--chunk-size', '0']) == 2
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from aoc.bench import BENCHMARKS, Benchmark, BenchmarkResult, find_regressions, fit_exponent, \
+    run_benchmark, select_benchmarks, time_phase
+
+
+def test_fit_exponent():
+    assert fit_exponent([1, 2, 4], [3, 12, 48]) == pytest.approx(2.0)
+    assert fit_exponent([10, 20, 40], [5, 10, 20]) == pytest.approx(1.0)
+
+    with pytest.raises(ValueError):
+        fit_exponent([1], [1])
+
+
+def test_find_regressions():
+    results = [
+        BenchmarkResult('day01.part1', [1, 2], [1, 4], exponent=2.0, max_exponent=2.4),
+        BenchmarkResult('day01.part2', [1, 2], [1, 16], exponent=4.0, max_exponent=3.4),
+    ]
+    assert len(find_regressions(results)) == 1
+
+    baseline = {'results': [{'name': 'day01.part1', 'exponent': 1.0}]}
+    regressions = find_regressions(results, baseline, tolerance=0.5)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('day01.part1')
+
+    assert len(find_regressions(results, baseline, tolerance=1.5)) == 1
+
+
+def test_select_benchmarks():
+    assert select_benchmarks([]) == BENCHMARKS
+    assert [b.name for b in select_benchmarks(['day09.part2'])] == ['day09.part2']
+    assert [b.name for b in select_benchmarks(['day18'])] == ['day18.part1', 'day18.part1.long_lines']
+
+    with pytest.raises(ValueError):
+        select_benchmarks(['day99'])
+
+
+def test_run_benchmark():
+    result = run_benchmark(Benchmark(2, 'part1', [10, 20], 5.0), repeat=1)
+    assert result.name == 'day02.part1'
+    assert len(result.times) == 2
+    assert time_phase(Benchmark(2, 'parse', [10], 5.0), 10, repeat=1) > 0
+
+
+@pytest.mark.skipif(not os.environ.get('AOC_BENCH'), reason="set AOC_BENCH=1 to run the benchmarks")
+@pytest.mark.parametrize("benchmark", BENCHMARKS, ids=lambda b: b.name)
+def test_benchmark_budget(benchmark):
+    assert find_regressions([run_benchmark(benchmark)]) == []
@@ -0,0 +1,98 @@
+import os
+import pickle
+
+from aoc.cache import ParseCache, _find_shared_modules, get_default_cache, make_key, parse_cached
+from aoc.days import load_day, load_generator
+from aoc.runner import run_day
+
+
+def test_make_key():
+    day1 = load_day(1)
+    assert make_key(day1, "1\n2\n") == make_key(day1, "1\n2\n")
+    assert make_key(day1, "1\n2\n") != make_key(day1, "1\n3\n")
+    assert make_key(day1, "1\n2\n") != make_key(load_day(10), "1\n2\n")
+
+
+def test_find_shared_modules():
+    paths = _find_shared_modules([b"import re\nfrom aoc.reader import iter_blocks\n"])
+    assert [p.name for p in paths] == ['reader.py']
+    # aoc.cache imports aoc.days
+    paths = _find_shared_modules([b"    import aoc.cache\n"])
+    assert [p.name for p in paths] == ['cache.py', 'days.py']
+    assert _find_shared_modules([(load_day(1).dir / 'day1.py').read_bytes()]) == []
+    assert _find_shared_modules([b"import aoc.nonexistent\n"]) == []
+
+
+def test_parse_cached(tmp_path):
+    cache = ParseCache(directory=tmp_path)
+    day = load_day(7)
+    content = load_generator(7)(50, seed=1)
+
+    parsed, cached = parse_cached(day, content, cache)
+    assert not cached
+
+    cached_parsed, cached = parse_cached(day, content, cache)
+    assert cached
+    assert cached_parsed == parsed
+
+    assert parse_cached(day, content, None) == (parsed, False)
+
+
+def test_parse_cached_recursive_structures(tmp_path):
+    cache = ParseCache(directory=tmp_path)
+    for day_number, size in [(19, 30), (20, 9), (16, 20)]:
+        day = load_day(day_number)
+        content = load_generator(day_number)(size, seed=2)
+        parse_cached(day, content, cache)
+
+        parsed, cached = parse_cached(day, content, cache)
+        assert cached
+        assert day.module.part1(parsed) == day.module.part1(day.parse(content))
+
+
+def test_corrupted_entry(tmp_path):
+    cache = ParseCache(directory=tmp_path)
+    cache.put('key', [1, 2, 3])
+    (tmp_path / 'key.pickle').write_bytes(b'garbage')
+
+    assert cache.get('key') == (False, None)
+    assert not (tmp_path / 'key.pickle').exists()
+
+
+def test_eviction(tmp_path):
+    value = 'x' * 1000
+    entry_size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ParseCache(directory=tmp_path, max_size=entry_size * 3)
+
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, value)
+        os.utime(tmp_path / f'{key}.pickle', (i, i))
+
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get('a') == (True, value)
+    cache.put('d', value)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a')[0] and cache.get('c')[0] and cache.get('d')[0]
+    assert cache.size <= cache.max_size
+
+    assert not cache.put('huge', 'x' * entry_size * 4)
+
+
+def test_run_day_cached(tmp_path):
+    cache = ParseCache(directory=tmp_path)
+    content = load_generator(20)(9, seed=4)
+
+    first = run_day(20, content, trace_memory=False, cache=cache)
+    second = run_day(20, content, trace_memory=False, cache=cache)
+    assert not first.phases[0].cached
+    assert second.phases[0].cached
+    assert first.get_answer('part1') == second.get_answer('part1')
+
+
+def test_get_default_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('AOC_CACHE_DIR', str(tmp_path))
+    assert get_default_cache().directory == tmp_path
+
+    monkeypatch.setenv('AOC_NO_CACHE', '1')
+    assert get_default_cache() is None
@@ -0,0 +1,82 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from aoc.daemon import SolverServer, _request, main, solve, stop
+
+DAY1_INPUT = "1721\n979\n366\n299\n675\n1456\n"
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    path = str(tmp_path / 'daemon.sock')
+    server = SolverServer(path, jobs=2)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_solve_inline(socket_path):
+    messages = list(solve(1, content=DAY1_INPUT, socket_path=socket_path))
+    assert [m.get('phase') for m in messages] == ['parse', 'part1', 'part2', None]
+    assert messages[1]['answer'] == 514579
+    assert messages[2]['answer'] == 241861950
+    assert messages[-1] == {'id': 1, 'day': 1, 'done': True, 'error': None}
+
+
+def test_solve_path(socket_path, tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text("939\n7,13,x,x,59,x,31,19\n")
+    messages = list(solve(13, path=str(path), socket_path=socket_path))
+    assert messages[2]['answer'] == 1068781
+
+
+def test_errors(socket_path, tmp_path):
+    assert list(solve(1, content="not a number\n", socket_path=socket_path))[-1]['error'].startswith('ValueError')
+    assert list(solve(26, content=DAY1_INPUT, socket_path=socket_path))[-1]['error'] == "Invalid day: 26"
+    assert 'Cannot read' in list(solve(1, path=str(tmp_path / 'missing'), socket_path=socket_path))[-1]['error']
+    # The path is a file, "-" is not the daemon's stdin
+    assert 'Cannot read' in list(_request(socket_path, {'id': 1, 'day': 1, 'path': '-'}))[-1]['error']
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(b'garbage\n{"id": 5, "day": 1, "content_base64": "MTAxOQoxMDAxCg=="}\n')
+        replies = sock.makefile('rb')
+        assert json.loads(replies.readline())['error'].startswith('Invalid request')
+        messages = [json.loads(replies.readline()) for _ in range(3)]
+        assert messages[1]['answer'] == 1019 * 1001
+        # There's no triple in two numbers
+        assert messages[2]['done'] and messages[2]['error']
+
+
+def test_concurrent_clients(socket_path):
+    def get_part1(content):
+        return list(solve(1, content=content, socket_path=socket_path))[1]['answer']
+
+    contents = [DAY1_INPUT, "2000\n20\n1000\n", "1010\n1010\n1\n"] * 3
+    with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+        answers = list(executor.map(get_part1, contents))
+    assert answers == [514579, 40000, 1020100] * 3
+
+
+def test_main(tmp_path, capsys):
+    path = str(tmp_path / 'daemon.sock')
+    thread = threading.Thread(target=main, args=[['-s', path, 'serve', '-j', '1', '--no-cache']])
+    thread.start()
+    try:
+        for _ in range(100):
+            if main(['-s', path, 'solve', '13']) == 0:
+                break
+            threading.Event().wait(0.1)
+        assert "part2: 305068317272992" in capsys.readouterr().out
+    finally:
+        stop(path)
+        thread.join()
+
+    assert main(['-s', path, 'solve', '13']) == 2
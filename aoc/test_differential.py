@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from aoc.differential import ENGINE_PAIRS, EnginePair, Outcome, main, minimize, run_pair, select_pairs
+
+
+def _broken_sum(numbers):
+    # Wrong whenever there's a number over 50
+    return sum(n for n in numbers if n <= 50)
+
+
+def _shrink_numbers(numbers):
+    for i in range(len(numbers)):
+        yield numbers[:i] + numbers[i + 1:]
+    for i, n in enumerate(numbers):
+        if n > 0:
+            yield numbers[:i] + [n // 2] + numbers[i + 1:]
+            yield numbers[:i] + [n - 1] + numbers[i + 1:]
+
+
+BROKEN_PAIR = EnginePair(
+    'test.sum',
+    generate_case=lambda rng: [rng.randint(0, 100) for _ in range(rng.randint(1, 20))],
+    reference=sum,
+    fast=_broken_sum,
+    shrink_case=_shrink_numbers,
+)
+
+
+def test_outcome_matches():
+    assert Outcome(result=[1, 2]).matches(Outcome(result=[1, 2]))
+    assert not Outcome(result=1).matches(Outcome(result=2))
+    assert Outcome(error='ValueError').matches(Outcome(error='ValueError'))
+    assert not Outcome(error='ValueError').matches(Outcome(result=None))
+
+
+def test_minimize():
+    minimized = minimize(BROKEN_PAIR, [3, 70, 12, 99, 5])
+    assert minimized == [51]
+
+
+def test_run_pair_mismatch():
+    report = run_pair(BROKEN_PAIR, cases=50, seed=1)
+    assert report.mismatch is not None
+    assert report.mismatch.case == '[51]'
+    assert report.mismatch.reference == 51
+    assert report.mismatch.fast == 0
+    assert not report.cases[-1].matched
+    assert all(case.matched for case in report.cases[:-1])
+
+
+@pytest.mark.parametrize("pair", ENGINE_PAIRS, ids=lambda p: p.name)
+def test_engine_pairs(pair):
+    report = run_pair(pair, cases=30, seed=3)
+    assert report.mismatch is None
+    assert len(report.cases) == 30
+    assert report.mean_speedup > 0
+
+
+def test_select_pairs():
+    assert select_pairs([]) == ENGINE_PAIRS
+    assert [p.name for p in select_pairs(['day23'])] == ['day23.cups']
+
+    with pytest.raises(ValueError):
+        select_pairs(['day99'])
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / 'report.json'
+    assert main(['day23', '--cases', '5', '-o', str(output)]) == 0
+    assert "day23.cups" in capsys.readouterr().out
+
+    reports = json.loads(output.read_text())
+    assert reports[0]['name'] == 'day23.cups'
+    assert len(reports[0]['cases']) == 5
+    assert reports[0]['mean_speedup'] > 0
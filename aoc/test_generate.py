@@ -0,0 +1,59 @@
+import pytest
+
+from aoc.days import load_day, load_generator
+
+# A small size for each day which keeps its solution fast
+SMALL_SIZES = {
+    1: 100, 2: 100, 3: 50, 4: 50, 5: 100, 6: 30, 7: 40, 8: 100, 9: 100,
+    10: 60, 11: 12, 12: 50, 13: 20, 14: 30, 15: 6, 16: 30, 17: 3, 18: 20,
+    19: 50, 20: 9, 21: 30, 22: 10, 23: 9, 24: 10, 25: 1000,
+}
+# Parts whose running time does not depend on the input size, and is too long for tests
+SLOW_PARTS = {(15, 'part2'), (23, 'part2')}
+
+
+@pytest.mark.parametrize("day_number", sorted(SMALL_SIZES))
+def test_generate(day_number):
+    generate = load_generator(day_number)
+    size = SMALL_SIZES[day_number]
+
+    content = generate(size, seed=7)
+    assert content == generate(size, seed=7)
+    assert content != generate(size, seed=8)
+
+    day = load_day(day_number)
+    parsed = day.parse(content)
+    for part_name, solve in day.parts.items():
+        if (day_number, part_name) not in SLOW_PARTS:
+            assert solve(parsed) is not None
+
+
+def test_generate_day1_planted():
+    numbers = load_day(1).parse(load_generator(1)(60, seed=3))
+    assert len(numbers) == 60
+
+    pairs = [
+        (i1, i2) for i1 in range(60) for i2 in range(i1 + 1, 60)
+        if numbers[i1] + numbers[i2] == 2020
+    ]
+    triples = [
+        (i1, i2, i3) for i1 in range(60) for i2 in range(i1 + 1, 60) for i3 in range(i2 + 1, 60)
+        if numbers[i1] + numbers[i2] + numbers[i3] == 2020
+    ]
+    assert len(pairs) == 1
+    assert len(triples) == 1
+
+
+def test_generate_day5_missing_seat():
+    day = load_day(5)
+    seat_ids = day.parse(load_generator(5)(500, seed=1))
+    ids = sorted(seat_ids)
+    missing_id = day.module.part2(seat_ids)
+    assert missing_id not in ids
+    assert ids[0] < missing_id < ids[-1]
+    assert len(ids) == ids[-1] - ids[0]
+
+
+def test_generate_day20_square_only():
+    with pytest.raises(ValueError):
+        load_generator(20)(10)
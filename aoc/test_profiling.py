@@ -0,0 +1,56 @@
+import json
+import time
+
+from aoc.days import load_generator
+from aoc.profiling import StackSampler, format_collapsed, format_profile, profile_call, profile_day
+from aoc.runner import main
+
+
+def _busy_loop(duration):
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        pass
+
+
+def test_stack_sampler():
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    _busy_loop(0.1)
+    sampler.stop()
+
+    assert sampler.stacks
+    # The frames above the one which started the sampler are not recorded
+    assert all(stack.startswith('_busy_loop') for stack in sampler.stacks)
+
+
+def test_profile_call():
+    result, profile, stats = profile_call(1, 'part1', lambda n: [0] * n, 100_000, top=5)
+    assert len(result) == 100_000
+    assert profile.name == 'day01.part1'
+    assert len(profile.functions) <= 5
+    assert profile.peak_memory >= 800_000
+    assert profile.allocations[0].size >= 800_000
+    assert stats.total_calls > 0
+
+
+def test_profile_day(tmp_path):
+    content = load_generator(11)(12, seed=1)
+    profiles = profile_day(11, content, top=10, directory=tmp_path)
+    assert [p.phase for p in profiles] == ['parse', 'part1', 'part2']
+
+    part1 = profiles[1]
+    assert any('(step)' in f.function for f in part1.functions)
+    assert "day11/day11.py" in format_profile(part1)
+    assert format_collapsed(part1) == (tmp_path / 'day11.part1.collapsed').read_text()
+
+    report = json.loads((tmp_path / 'day11.part1.json').read_text())
+    assert report['phase'] == 'part1'
+    assert report['functions'][0]['cumulative_time'] > 0
+    assert (tmp_path / 'day11.part1.prof').stat().st_size > 0
+
+
+def test_main_profile(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr('sys.stdin.read', lambda: "1721\n979\n366\n299\n675\n1456\n")
+    assert main(['1', '-i', '-', '--profile', '--profile-dir', str(tmp_path), '--profile-top', '3']) == 0
+    assert "Day 1 part2" in capsys.readouterr().out
+    assert len(list(tmp_path.iterdir())) == 9
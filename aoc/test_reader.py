@@ -0,0 +1,73 @@
+import importlib
+
+import pytest
+
+from aoc.days import load_day, load_generator
+from aoc.reader import MappedFile, iter_blocks, iter_lines
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "\n",
+    "a\nb\n",
+    "a\nb",
+    "a\n\nb\n",
+    "\n\na b\nc\n\n\n\nd\n\n",
+])
+def test_lines_and_blocks(tmp_path, content):
+    path = tmp_path / 'input.txt'
+    path.write_text(content)
+
+    assert list(iter_lines(str(path))) == content.splitlines()
+    expected_blocks = [b for b in content.strip('\n').split('\n\n') if b.strip('\n')]
+    assert list(iter_blocks(str(path))) == [b.strip('\n') for b in expected_blocks]
+
+
+@pytest.mark.parametrize("content, blocks", [
+    ("a:1\r\nb:2\r\n\r\nc:3\r\n", ["a:1\nb:2", "c:3"]),
+    ("a:1\r\n \r\n\t\r\nb:2", ["a:1", "b:2"]),
+    ("\r\n  \na:1\n  \nb:2\n \n", ["a:1", "b:2"]),
+    ("a:1\n   ", ["a:1"]),
+    (" \r\n\t", []),
+])
+def test_blocks_blank_lines(tmp_path, content, blocks):
+    path = tmp_path / 'input.txt'
+    path.write_bytes(content.encode())
+
+    assert list(iter_blocks(str(path))) == blocks
+    with MappedFile(str(path)) as f:
+        views = list(f.blocks(encoding=None))
+        assert [bytes(v).replace(b'\r\n', b'\n') for v in views] == [b.encode() for b in blocks]
+        for view in views:
+            view.release()
+
+
+def test_memoryviews(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text("ab\ncd\n\nef\n")
+
+    with MappedFile(str(path)) as f:
+        assert len(f) == 10
+        views = list(f.blocks(encoding=None))
+        assert [bytes(v) for v in views] == [b'ab\ncd', b'ef']
+        for view in views:
+            view.release()
+
+
+@pytest.mark.parametrize("day_number, module_name, parse_name, size", [
+    (4, 'day4', 'parse_passports_file', 50),
+    (6, 'day6', 'parse_answers', 50),
+    (20, 'day20', 'parse_tiles', 9),
+    (22, 'decks', 'parse_decks', 10),
+])
+def test_day_parsers(tmp_path, day_number, module_name, parse_name, size):
+    content = load_generator(day_number)(size, seed=5)
+    path = tmp_path / 'input.txt'
+    path.write_text(content)
+
+    # Loading the day puts its directory on sys.path, so its sibling modules can be imported
+    load_day(day_number)
+    parse = getattr(importlib.import_module(module_name), parse_name)
+
+    with MappedFile(str(path)) as f:
+        assert parse(f.blocks()) == parse(content)
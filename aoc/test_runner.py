@@ -0,0 +1,61 @@
+import pytest
+
+from aoc.days import load_day
+from aoc.runner import format_results, main, run_day, run_days
+
+DAY1_INPUT = "1721\n979\n366\n299\n675\n1456\n"
+
+
+def test_load_day():
+    day = load_day(22)
+    assert list(day.parts) == ['part1', 'part2']
+    assert day.input_path.name == 'input.txt'
+
+    assert list(load_day(25).parts) == ['part1']
+
+    with pytest.raises(ValueError):
+        load_day(26)
+
+
+def test_run_day():
+    result = run_day(1, DAY1_INPUT)
+    assert result.error is None
+    assert [p.phase for p in result.phases] == ['parse', 'part1', 'part2']
+    assert result.get_answer('part1') == 514579
+    assert result.get_answer('part2') == 241861950
+
+    for phase_result in result.phases:
+        assert phase_result.measurement.wall_time >= 0
+        assert phase_result.measurement.peak_memory is not None
+
+
+def test_run_day_error():
+    result = run_day(1, "1721\nnot a number\n")
+    assert result.phases == []
+    assert "ValueError" in result.error
+
+
+def test_run_days_in_pool():
+    results = run_days([13, 1], jobs=2, trace_memory=False)
+    assert [r.day for r in results] == [13, 1]
+    assert all(r.error is None for r in results)
+
+    table = format_results(results)
+    assert "305068317272992" in table
+    assert "437931" in table
+
+
+def test_main_stdin(monkeypatch, capsys, tmp_path):
+    monkeypatch.setenv('AOC_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr('sys.stdin.read', lambda: DAY1_INPUT)
+    assert main(['1', '-i', '-']) == 0
+    assert "241861950" in capsys.readouterr().out
+
+    # The answers are cached, so the input is not parsed at all
+    assert main(['1', '-i', '-']) == 0
+    output = capsys.readouterr().out
+    assert "part2 (cached)" in output
+    assert "parse" not in output
+
+    assert main(['1', '-i', '-', '--no-cache']) == 0
+    assert "(cached)" not in capsys.readouterr().out
@@ -0,0 +1,39 @@
+import tracemalloc
+
+from aoc.timing import measure, timeit
+
+
+def test_measure():
+    with measure() as m:
+        data = [bytes(1024) for _ in range(100)]
+
+    assert len(data) == 100
+    assert m.wall_time > 0
+    assert m.cpu_time >= 0
+    assert m.peak_memory >= 100 * 1024
+
+
+def test_measure_nested(monkeypatch):
+    # Python 3.8 has no tracemalloc.reset_peak
+    monkeypatch.delattr(tracemalloc, 'reset_peak', raising=False)
+    with measure() as outer:
+        with measure() as inner:
+            data = [bytes(1024) for _ in range(100)]
+
+    assert len(data) == 100
+    assert inner.peak_memory >= 100 * 1024
+    assert outer.peak_memory >= inner.peak_memory
+
+
+def test_measure_without_memory():
+    with measure(trace_memory=False) as m:
+        pass
+
+    assert m.peak_memory is None
+
+
+def test_timeit(capsys):
+    with timeit("parse"):
+        pass
+
+    assert capsys.readouterr().out.startswith("[parse: took ")
@@ -0,0 +1,89 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class Measurement:
+    """
+    Resources spent on a block of code.
+
+    :ivar wall_time: Elapsed real time in seconds.
+    :ivar cpu_time: CPU time of the process in seconds.
+    :ivar peak_memory: Peak size of memory allocated by Python inside the block in bytes.
+        None if memory was not traced.
+    """
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+
+
+@contextmanager
+def measure(trace_memory: bool = True) -> Iterator[Measurement]:
+    """
+    Measures the wall time, the CPU time and the peak memory of the block.
+    The yielded Measurement is filled in when the block exits.
+
+    Memory is traced with tracemalloc, which slows down allocation-heavy code
+    several times. Pass trace_memory=False to get undistorted timings.
+
+    Example::
+
+        with measure() as m:
+            part1(parsed)
+        print(m.wall_time)
+    """
+    measurement = Measurement()
+
+    started_tracing = False
+    if trace_memory:
+        if tracemalloc.is_tracing():
+            # Python 3.8 can't reset the peak, so the block's peak may include the peak before it
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+        memory_start, _ = tracemalloc.get_traced_memory()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield measurement
+    finally:
+        measurement.wall_time = time.perf_counter() - wall_start
+        measurement.cpu_time = time.process_time() - cpu_start
+
+        if trace_memory:
+            _, memory_peak = tracemalloc.get_traced_memory()
+            measurement.peak_memory = max(memory_peak - memory_start, 0)
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def format_bytes(size: Optional[int]) -> str:
+    """
+    format_bytes(2048)  # => '2.0KiB'
+    """
+    if size is None:
+        return '-'
+    elif size < 1024:
+        return f"{size}B"
+    elif size < 1024 * 1024:
+        return f"{size / 1024:0.1f}KiB"
+    else:
+        return f"{size / 1024 / 1024:0.1f}MiB"
+
+
+@contextmanager
+def timeit(label: Optional[str] = None, trace_memory: bool = False) -> Iterator[Measurement]:
+    """
+    Prints how long the block took, like the timeit helper from day 7 does.
+    """
+    with measure(trace_memory=trace_memory) as measurement:
+        yield measurement
+
+    prefix = f"{label}: " if label else ""
+    print(f"[{prefix}took {measurement.wall_time * 1000:0.2f}ms]")
@@ -1,24 +1,509 @@
+import bisect
+import math
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # The numpy engine is optional
+    np = None
+
+# The pair sums are not precomputed for more pairs of entries than this
+MAX_PAIR_SUMS = 1 << 21
+
+# Bounds the number of elements in the temporary arrays of the numpy engine
+NUMPY_CHUNK_SIZE = 1 << 22
+
+
+def parse_input(content: str) -> List[int]:
+    # Split the file into lines
+    lines = content.split('\n')
+    # Remove empty lines
+    lines = [line.strip() for line in lines if line.strip()]
+    # Convert each line to an int
+    return [int(line) for line in lines]
+
+
+def _find_2_sum(values: Sequence[int], counts: Dict[int, int], target: int) -> List[Tuple[int, ...]]:
+    """
+    Hash set lookups of the complement: O(n).
+    """
+    combinations = []
+    for value in values:
+        complement = target - value
+        if value < complement and complement in counts:
+            combinations.append((value, complement))
+        elif value == complement and counts[value] >= 2:
+            combinations.append((value, value))
+    return combinations
+
+
+def _find_3_sum(values: Sequence[int], counts: Dict[int, int], target: int) -> List[Tuple[int, ...]]:
+    """
+    Two pointers over the sorted distinct values for every smallest value: O(n^2) at most,
+    but the pointers only walk the values which can complete the smallest one.
+    """
+    combinations = []
+    for i, first in enumerate(values):
+        # The first value is the smallest one of the three
+        if 3 * first > target:
+            break
+
+        lo = i
+        # The biggest value can't exceed the target without two first values
+        hi = bisect.bisect_right(values, target - 2 * first) - 1
+        while lo <= hi:
+            second, third = values[lo], values[hi]
+            total = first + second + third
+            if total < target:
+                lo += 1
+            elif total > target:
+                hi -= 1
+            else:
+                combination = (first, second, third)
+                if all(combination.count(v) <= counts[v] for v in combination):
+                    combinations.append(combination)
+                lo += 1
+                hi -= 1
+
+    return combinations
+
+
+def _iter_combinations(
+            values: Sequence[int],
+            counts: Dict[int, int],
+            size: int,
+            start: int = 0,
+        ) -> Iterator[Tuple[int, ...]]:
+    """
+    Yields every non-decreasing tuple of the values of the given size,
+    using each value at most as many times as it's counted.
+    """
+    if size == 0:
+        yield ()
+        return
+
+    for i in range(start, len(values)):
+        value = values[i]
+        for repeats in range(1, min(counts[value], size) + 1):
+            for rest in _iter_combinations(values, counts, size - repeats, i + 1):
+                yield (value,) * repeats + rest
+
+
+def _find_k_sum_mitm(values: Sequence[int], counts: Dict[int, int], k: int, target: int) -> List[Tuple[int, ...]]:
+    """
+    Meet in the middle: every combination is split into its smaller half and its bigger half.
+    The bigger halves are indexed by their sums, and every smaller half looks up
+    the complementing sum: O(n^ceil(k/2)).
+    """
+    big_size = k // 2
+    small_size = k - big_size
+
+    big_halves_by_sum: Dict[int, List[Tuple[int, ...]]] = defaultdict(list)
+    for big_half in _iter_combinations(values, counts, big_size):
+        big_halves_by_sum[sum(big_half)].append(big_half)
+
+    combinations = []
+    for small_half in _iter_combinations(values, counts, small_size):
+        for big_half in big_halves_by_sum.get(target - sum(small_half), ()):
+            # Every combination is split in only one way, when the halves don't overlap
+            if big_half[0] < small_half[-1]:
+                continue
+            shared = small_half[-1]
+            if shared == big_half[0] and small_half.count(shared) + big_half.count(shared) > counts[shared]:
+                continue
+            combinations.append(small_half + big_half)
+
+    return combinations
+
+
+def find_k_sum(numbers: Iterable[int], k: int, target: int = 2020) -> List[Tuple[int, ...]]:
+    """
+    Finds every combination of k entries which add up to the target.
+    Equal entries may be combined with each other, but every distinct combination
+    of values is returned once, no matter in how many ways its entries can be picked.
+
+    Uses a hash set for k=2, sorting and two pointers for k=3
+    and meet in the middle for bigger k.
+
+    find_k_sum([1721, 979, 366, 299, 675, 1456], 2)  # => [(299, 1721)]
+
+    :returns: The combinations as ascending tuples, in ascending order.
+    """
+    if k < 1:
+        raise ValueError(f"Invalid number of entries: {k}")
+
+    counts = Counter(numbers)
+    values = sorted(counts)
+
+    if k == 1:
+        combinations = [(target,)] if target in counts else []
+    elif k == 2:
+        combinations = _find_2_sum(values, counts, target)
+    elif k == 3:
+        combinations = _find_3_sum(values, counts, target)
+    else:
+        combinations = _find_k_sum_mitm(values, counts, k, target)
+
+    return sorted(combinations)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The numpy engine requires numpy to be installed")
+
+
+def parse_input_numpy(content: Union[str, bytes, memoryview], chunk_size: int = NUMPY_CHUNK_SIZE) -> 'np.ndarray':
+    """
+    Parses the expense report into an int64 array without looping over the lines in python.
+    The content may also be a buffer, e.g. a mapped file. The numbers may be separated
+    by any whitespace.
+
+    The bytes are parsed in chunks of about chunk_size, split at whitespace:
+    the digits of each chunk are weighted by the powers of ten by their positions
+    in their numbers and summed up per number.
+    """
+    _require_numpy()
+    if isinstance(content, str):
+        content = content.encode()
+    data = np.frombuffer(content, dtype=np.uint8)
+
+    parsed = []
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        # Extend the chunk to the end of the number it cuts
+        while end < len(data) and not chr(data[end]).isspace():
+            end += 1
+        parsed.append(_parse_numbers_chunk(data[start:end]))
+        start = end
+
+    return np.concatenate(parsed) if parsed else np.zeros(0, dtype=np.int64)
+
+
+_POWERS_OF_TEN = None if np is None else 10 ** np.arange(19, dtype=np.int64)
+
+
+def _parse_numbers_chunk(data: 'np.ndarray') -> 'np.ndarray':
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    is_minus = data == ord('-')
+    is_space = (data == ord(' ')) | ((data >= ord('\t')) & (data <= ord('\r')))
+    if not np.all(is_digit | is_minus | is_space):
+        raise ValueError("Expense report has non-numeric entries")
+
+    # Every number is a run of digits, optionally right after a minus after whitespace
+    padded = np.concatenate(([False], is_digit, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[::2], edges[1::2]
+    negative = (starts > 0) & is_minus[starts - 1]
+    signed_starts = starts[negative] - 1
+    if (np.count_nonzero(negative) != np.count_nonzero(is_minus)
+            or np.any((signed_starts > 0) & ~is_space[signed_starts - 1])):
+        raise ValueError("Expense report has misplaced minuses")
+
+    lengths = ends - starts
+    if np.any(lengths >= len(_POWERS_OF_TEN)):
+        raise ValueError("Expense report has entries too big for int64")
+
+    positions = np.flatnonzero(is_digit)
+    powers = np.repeat(ends, lengths) - positions - 1
+    weighted = (data[positions].astype(np.int64) - ord('0')) * _POWERS_OF_TEN[powers]
+    # Numbers start at these offsets in the weighted digits
+    offsets = np.concatenate(([0], np.cumsum(lengths[:-1])))
+    numbers = np.add.reduceat(weighted, offsets) if len(offsets) and len(weighted) else weighted[:0]
+
+    numbers[negative] *= -1
+    return numbers
+
+
+def _find_2_sum_numpy(values: 'np.ndarray', counts: 'np.ndarray', target: int) -> List[Tuple[int, ...]]:
+    """
+    Binary searches of the complements of all values at once.
+    """
+    complements = target - values
+    positions = np.minimum(np.searchsorted(values, complements), len(values) - 1)
+    found = values[positions] == complements
+    found &= (values < complements) | ((values == complements) & (counts >= 2))
+    return [(int(v), int(target - v)) for v in values[found]]
+
+
+def _find_3_sum_numpy(
+            values: 'np.ndarray',
+            counts: 'np.ndarray',
+            target: int,
+            chunk_size: int,
+        ) -> List[Tuple[int, ...]]:
+    """
+    Broadcasts blocks of the smallest values against chunks of the middle values,
+    and binary searches the biggest values completing them. Every block of the smallest values
+    is only paired with the middle values no bigger than a half of what the block leaves.
+    """
+    combinations = []
+    # The first value is the smallest one of the three
+    firsts_end = int(np.searchsorted(values, target // 3, side='right'))
+    block_rows = max(1, math.isqrt(chunk_size))
+
+    for row_start in range(0, firsts_end, block_rows):
+        row_end = min(row_start + block_rows, firsts_end)
+        # The middle value is not bigger than the biggest value
+        columns_end = int(np.searchsorted(values, (target - values[row_start]) // 2, side='right'))
+        block_columns = max(1, chunk_size // (row_end - row_start))
+
+        for column_start in range(row_start, columns_end, block_columns):
+            column_end = min(column_start + block_columns, columns_end)
+            rows = np.arange(row_start, row_end)[:, None]
+            columns = np.arange(column_start, column_end)[None, :]
+            firsts, seconds = values[rows], values[columns]
+            thirds = target - firsts - seconds
+
+            found = (columns >= rows) & (thirds >= seconds)
+            positions = np.minimum(np.searchsorted(values, thirds), len(values) - 1)
+            found &= values[positions] == thirds
+            # Equal values are only combined as many times as they're counted
+            found &= np.where(
+                firsts == thirds,
+                counts[rows] >= 3,
+                np.where(firsts == seconds, counts[rows] >= 2, (seconds < thirds) | (counts[columns] >= 2)),
+            )
+
+            found_rows, found_columns = np.nonzero(found)
+            firsts, seconds = values[row_start + found_rows], values[column_start + found_columns]
+            combinations.extend(
+                (int(a), int(b), int(target - a - b)) for a, b in zip(firsts.tolist(), seconds.tolist()))
+
+    return combinations
+
+
+def find_k_sum_numpy(
+            numbers: Union['np.ndarray', Iterable[int]],
+            k: int,
+            target: int = 2020,
+            chunk_size: int = NUMPY_CHUNK_SIZE,
+        ) -> List[Tuple[int, ...]]:
+    """
+    The same as find_k_sum, but vectorized with numpy for k=2 and k=3.
+    Other k fall back to find_k_sum.
+
+    The temporary arrays of k=3 hold at most about chunk_size elements each.
+    """
+    _require_numpy()
+    if k not in (2, 3):
+        return find_k_sum(np.asarray(numbers).tolist(), k, target)
+
+    values, counts = np.unique(np.asarray(numbers, dtype=np.int64), return_counts=True)
+    if not len(values):
+        return []
+
+    if k == 2:
+        combinations = _find_2_sum_numpy(values, counts, target)
+    else:
+        combinations = _find_3_sum_numpy(values, counts, target, chunk_size)
+
+    return sorted(combinations)
+
+
+@dataclass
+class ExpenseIndex:
+    """
+    Answers pair and triple sum queries for many targets.
+    Use build_expense_index to make one.
+
+    :ivar entries: The sorted entries. Every value is kept at most three times,
+        which is as many times as a triple can use it.
+    :ivar pair_sums: The sums of all pairs of the entries, sorted.
+        Empty if there are more pairs than build_expense_index allowed.
+    :ivar pair_codes: i * len(entries) + j for the entries i < j of each pair sum.
+    """
+    entries: List[int]
+    pair_sums: List[int] = field(default_factory=list, repr=False)
+    pair_codes: List[int] = field(default_factory=list, repr=False)
+
+    @property
+    def has_pair_sums(self) -> bool:
+        return bool(self.pair_sums)
+
+    def _pair(self, position: int) -> Tuple[int, int]:
+        return divmod(self.pair_codes[position], len(self.entries))
+
+    def _require_entries(self, k: int) -> None:
+        if len(self.entries) < k:
+            raise ValueError(f"Less than {k} entries in the index")
+
+    def find_pairs(self, target: int) -> List[Tuple[int, int]]:
+        """
+        The same as find_k_sum(numbers, 2, target).
+        """
+        if not self.has_pair_sums:
+            return find_k_sum(self.entries, 2, target)
+
+        start = bisect.bisect_left(self.pair_sums, target)
+        end = bisect.bisect_right(self.pair_sums, target, lo=start)
+        pairs = set()
+        for position in range(start, end):
+            i, j = self._pair(position)
+            pairs.add((self.entries[i], self.entries[j]))
+        return sorted(pairs)
+
+    def find_triples(self, target: int) -> List[Tuple[int, int, int]]:
+        """
+        The same as find_k_sum(numbers, 3, target).
+        """
+        if not self.has_pair_sums:
+            return find_k_sum(self.entries, 3, target)
+
+        triples = set()
+        for t, first in enumerate(self.entries):
+            rest = target - first
+            start = bisect.bisect_left(self.pair_sums, rest)
+            end = bisect.bisect_right(self.pair_sums, rest, lo=start)
+            for position in range(start, end):
+                i, j = self._pair(position)
+                # The first entry is the smallest one, so that every triple is found once
+                if i > t:
+                    triples.add((first, self.entries[i], self.entries[j]))
+        return sorted(triples)
+
+    def closest_pair(self, target: int) -> Tuple[int, int]:
+        """
+        Finds a pair of entries with the sum closest to the target.
+        If several sums are equally close, the smaller one is taken.
+        """
+        self._require_entries(2)
+        if not self.has_pair_sums:
+            return self._closest_pair_scan(target, 0)
+
+        position = bisect.bisect_left(self.pair_sums, target)
+        candidates = [p for p in (position - 1, position) if 0 <= p < len(self.pair_sums)]
+        best = min(candidates, key=lambda p: (abs(self.pair_sums[p] - target), self.pair_sums[p]))
+        i, j = self._pair(best)
+        return self.entries[i], self.entries[j]
+
+    def _closest_pair_scan(self, target: int, start: int) -> Tuple[int, int]:
+        """
+        Two pointers over the entries from the start.
+        """
+        lo, hi = start, len(self.entries) - 1
+        best = (self.entries[lo], self.entries[hi])
+        while lo < hi:
+            total = self.entries[lo] + self.entries[hi]
+            if (abs(total - target), total) < (abs(sum(best) - target), sum(best)):
+                best = (self.entries[lo], self.entries[hi])
+            if total < target:
+                lo += 1
+            elif total > target:
+                hi -= 1
+            else:
+                break
+        return best
+
+    def closest_triple(self, target: int) -> Tuple[int, int, int]:
+        """
+        Finds a triple of entries with the sum closest to the target.
+        If several sums are equally close, the smaller one is taken.
+        """
+        self._require_entries(3)
+        if not self.has_pair_sums:
+            return self._closest_triple_scan(target)
+
+        entries, pair_sums, n = self.entries, self.pair_sums, len(self.entries)
+        best_key, best = None, (0, 0, 0)
+        for t, first in enumerate(entries):
+            position = bisect.bisect_left(pair_sums, target - first)
+            # The closest pair sums below and above the rest of the target
+            # among the pairs which don't include this entry
+            for positions in (range(position - 1, -1, -1), range(position, len(pair_sums))):
+                for p in positions:
+                    i, j = divmod(self.pair_codes[p], n)
+                    if t != i and t != j:
+                        total = first + pair_sums[p]
+                        key = (abs(total - target), total)
+                        if best_key is None or key < best_key:
+                            best_key, best = key, (t, i, j)
+                        break
+
+            if best_key[0] == 0:
+                break
+
+        return tuple(sorted(entries[i] for i in best))
+
+    def _closest_triple_scan(self, target: int) -> Tuple[int, int, int]:
+        """
+        Two pointers over the entries after every entry.
+        """
+        best_key, best = None, (0, 0, 0)
+        for t, first in enumerate(self.entries[:-2]):
+            second, third = self._closest_pair_scan(target - first, t + 1)
+            total = first + second + third
+            key = (abs(total - target), total)
+            if best_key is None or key < best_key:
+                best_key, best = key, (first, second, third)
+        return best
+
+    def closest_pairs(self, targets: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        closest_pair for every target, answering repeated targets once.
+        """
+        targets = list(targets)
+        answers = {target: self.closest_pair(target) for target in set(targets)}
+        return [answers[target] for target in targets]
+
+    def closest_triples(self, targets: Iterable[int]) -> List[Tuple[int, int, int]]:
+        """
+        closest_triple for every target, answering repeated targets once.
+        """
+        targets = list(targets)
+        answers = {target: self.closest_triple(target) for target in set(targets)}
+        return [answers[target] for target in targets]
+
+
+def build_expense_index(numbers: Iterable[int], max_pair_sums: int = MAX_PAIR_SUMS) -> ExpenseIndex:
+    """
+    Sorts the entries and precomputes the sums of all their pairs, unless there are
+    more than max_pair_sums of them. Without the pair sums the queries scan the entries.
+    """
+    counts = Counter(numbers)
+    entries = [value for value in sorted(counts) for _ in range(min(counts[value], 3))]
+    index = ExpenseIndex(entries=entries)
+
+    n = len(entries)
+    if 0 < n * (n - 1) // 2 <= max_pair_sums:
+        # Sorting the sums along with the codes of their pairs as single ints
+        # is much faster than sorting tuples
+        codes_count = n * n
+        keys = sorted(
+            (entries[i] + entries[j]) * codes_count + i * n + j
+            for i in range(n) for j in range(i + 1, n)
+        )
+        index.pair_sums = [key // codes_count for key in keys]
+        index.pair_codes = [key % codes_count for key in keys]
+
+    return index
+
+
+def _find_product(numbers: List[int], k: int, target: int = 2020) -> int:
+    combinations = find_k_sum(numbers, k, target)
+    if not combinations:
+        raise ValueError(f"No {k} entries sum to {target}")
+    return math.prod(combinations[0])
+
+
+def part1(numbers: List[int]) -> int:
+    return _find_product(numbers, 2)
+
+
+def part2(numbers: List[int]) -> int:
+    return _find_product(numbers, 3)
+
+
 def main():
     with open('./input.txt') as f:
-        # Split the file into lines
-        lines = f.read().split('\n')
-        # Remove empty lines
-        lines = [line.strip() for line in lines if line.strip()]
-        # Convert each line to an int
-        numbers = [int(line) for line in lines]
-
-    for n1 in numbers:
-        for n2 in numbers:
-            if n1 + n2 == 2020:
-                print("{n1} + {n2} = 2020; {n1} * {n2} = {mult}".format(
-                    n1=n1, n2=n2, mult=n1*n2))
-
-    for n1 in numbers:
-        for n2 in numbers:
-            for n3 in numbers:
-                if n1 + n2 + n3 == 2020:
-                    print("{n1} + {n2} + {n3} = 2020; {n1} * {n2} * {n3} = {mult}".format(
-                    n1=n1, n2=n2, n3=n3, mult=n1*n2*n3))
+        numbers = parse_input(f.read())
+
+    for k in [2, 3]:
+        for combination in find_k_sum(numbers, k):
+            print(f"{' + '.join(map(str, combination))} = 2020; "
+                  f"{' * '.join(map(str, combination))} = {math.prod(combination)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+import random
+from typing import List
+
+
+def generate(size: int, seed: int = 0, target: int = 2020) -> str:
+    """
+    Generates an expense report of `size` entries.
+
+    Exactly one pair and exactly one triple of entries add up to the target.
+    The rest of the entries are fillers which cannot be a part of any such pair
+    or triple: each of them is greater than a half of the target, and none of
+    them completes the planted entries to the target.
+    """
+    if size < 5:
+        raise ValueError("An expense report needs at least 5 entries")
+
+    rng = random.Random(seed)
+
+    # The planted pair has one small and one big entry, the planted triple has
+    # two small and one big entry. Small entries are below target / 3, so that
+    # no other combination of them can reach the target.
+    small_limit = target // 3 - 1
+    while True:
+        pair_small = rng.randint(1, small_limit)
+        triple_small1 = rng.randint(1, small_limit // 2)
+        triple_small2 = rng.randint(1, small_limit // 2)
+        planted = [
+            pair_small,
+            target - pair_small,
+            triple_small1,
+            triple_small2,
+            target - triple_small1 - triple_small2,
+        ]
+        if len(set(planted)) == len(planted):
+            break
+
+    smalls = [pair_small, triple_small1, triple_small2]
+    forbidden = {target - s for s in smalls}
+    forbidden |= {target - s1 - s2 for s1 in smalls for s2 in smalls if s1 != s2}
+
+    # Any two fillers add up to more than the target
+    filler_min = target // 2 + 1
+    filler_max = max(target, 4 * size)
+    numbers: List[int] = list(planted)
+    while len(numbers) < size:
+        filler = rng.randint(filler_min, filler_max)
+        if filler not in forbidden:
+            numbers.append(filler)
+
+    rng.shuffle(numbers)
+    return ''.join(f"{n}\n" for n in numbers)
@@ -0,0 +1,108 @@
+import itertools
+import random
+
+import pytest
+
+from day1 import build_expense_index, find_k_sum, find_k_sum_numpy, parse_input, parse_input_numpy, part1, part2
+
+EXAMPLE = [1721, 979, 366, 299, 675, 1456]
+
+
+def test_parts():
+    assert part1(EXAMPLE) == 514579
+    assert part2(EXAMPLE) == 241861950
+
+
+def test_parse_input():
+    assert parse_input("1721\n979\n\n366\n") == [1721, 979, 366]
+
+
+def test_find_k_sum():
+    assert find_k_sum(EXAMPLE, 1, 979) == [(979,)]
+    assert find_k_sum(EXAMPLE, 2) == [(299, 1721)]
+    assert find_k_sum(EXAMPLE, 3) == [(366, 675, 979)]
+    assert find_k_sum(EXAMPLE, 2, 1345) == [(366, 979)]
+    assert find_k_sum(EXAMPLE, 2, 1) == []
+
+
+def test_find_k_sum_duplicates():
+    # An entry is not paired with itself, but equal entries are paired once
+    assert find_k_sum([1010, 5], 2) == []
+    assert find_k_sum([1010, 1010, 1010, 5], 2) == [(1010, 1010)]
+    assert find_k_sum([1, 1, 2, 2, 3], 3, 5) == [(1, 1, 3), (1, 2, 2)]
+    assert find_k_sum([2, 2, 2], 3, 6) == [(2, 2, 2)]
+    assert find_k_sum([2, 2], 3, 6) == []
+
+
+def test_find_k_sum_mitm():
+    assert find_k_sum([1, 2, 3, 4, 5, 5], 4, 15) == [(1, 4, 5, 5), (2, 3, 5, 5)]
+    assert find_k_sum([0, 0, 0, 0, 0], 5, 0) == [(0, 0, 0, 0, 0)]
+    assert find_k_sum([0, 0, 0, 0], 5, 0) == []
+    assert find_k_sum([-3, -1, 0, 1, 2, 4], 5, 3) == [(-3, -1, 1, 2, 4)]
+
+
+def test_find_k_sum_invalid():
+    with pytest.raises(ValueError):
+        find_k_sum(EXAMPLE, 0)
+
+
+@pytest.mark.parametrize("max_pair_sums", [0, 1000])
+def test_expense_index(max_pair_sums):
+    index = build_expense_index(EXAMPLE + [979, 979, 979], max_pair_sums)
+    assert index.has_pair_sums == bool(max_pair_sums)
+    assert index.entries.count(979) == 3
+
+    assert index.find_pairs(2020) == [(299, 1721)]
+    assert index.find_pairs(1958) == [(979, 979)]
+    assert index.find_triples(2020) == [(366, 675, 979)]
+    assert index.find_triples(2937) == [(979, 979, 979)]
+
+    assert index.closest_pair(2021) == (299, 1721)
+    assert index.closest_pair(0) == (299, 366)
+    assert index.closest_triple(2022) == (366, 675, 979)
+    assert index.closest_pairs([2021, 0, 2021]) == [(299, 1721), (299, 366), (299, 1721)]
+    assert index.closest_triples([10000]) == [(979, 1456, 1721)]
+
+    with pytest.raises(ValueError):
+        build_expense_index([1, 2], max_pair_sums).closest_triple(3)
+
+
+@pytest.mark.parametrize("max_pair_sums", [0, 1000])
+def test_expense_index_random(max_pair_sums):
+    rng = random.Random(0)
+    for _ in range(300):
+        numbers = [rng.randint(-5, 30) for _ in range(rng.randint(3, 12))]
+        target = rng.randint(-10, 70)
+        index = build_expense_index(numbers, max_pair_sums)
+
+        assert index.find_pairs(target) == find_k_sum(numbers, 2, target)
+        assert index.find_triples(target) == find_k_sum(numbers, 3, target)
+        for k, closest in [(2, index.closest_pair(target)), (3, index.closest_triple(target))]:
+            assert sorted(closest) == list(closest)
+            # Of the equally close sums the smaller one is taken
+            assert (abs(sum(closest) - target), sum(closest)) == min(
+                (abs(sum(c) - target), sum(c)) for c in itertools.combinations(numbers, k))
+
+
+def test_parse_input_numpy():
+    pytest.importorskip('numpy')
+    assert parse_input_numpy("1721\n979\n\n-366\n").tolist() == [1721, 979, -366]
+    assert parse_input_numpy(b"12\n345\n6", chunk_size=2).tolist() == [12, 345, 6]
+    assert parse_input_numpy("").tolist() == []
+
+    for content in ["1\nx\n", "1-2\n", "--1\n", "1\n-\n", "99999999999999999999\n"]:
+        with pytest.raises(ValueError):
+            parse_input_numpy(content)
+
+
+def test_find_k_sum_numpy():
+    pytest.importorskip('numpy')
+    assert find_k_sum_numpy(parse_input_numpy("1721\n979\n366\n299\n675\n1456\n"), 3) == [(366, 675, 979)]
+
+    rng = random.Random(0)
+    for _ in range(500):
+        numbers = [rng.randint(-5, 30) for _ in range(rng.randint(0, 15))]
+        k = rng.randint(1, 4)
+        target = rng.randint(-5, 60)
+        chunk_size = rng.choice([1, 5, 1000])
+        assert find_k_sum_numpy(numbers, k, target, chunk_size) == find_k_sum(numbers, k, target)
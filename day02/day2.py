@@ -1,5 +1,28 @@
+import argparse
+import hashlib
+import json
+import os
 import re
-from dataclasses import dataclass
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # PasswordTable is optional
+    np = None
+
+ENTRY_REGEX = re.compile(r'(\d+)-(\d+) (\w): (\w+)')
+ENTRY_BYTES_REGEX = re.compile(rb'(\d+)-(\d+) (\w): (\w+)')
+
+# The size of the byte ranges validated by a single task of the pool
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+# The size of the blocks a byte range is read in
+READ_SIZE = 1024 * 1024
+# The number of the first bytes of a followed file which identify it
+HEAD_SIZE = 4096
 
 
 @dataclass
@@ -14,10 +37,9 @@ def parse_input_line(line: str) -> PasswordEntry:
     """
     Raises ValueError if the line cannot be parsed.
     """
-    regex = re.compile(r'(\d+)-(\d+) (\w): (\w+)')
-    match = regex.match(line)
+    match = ENTRY_REGEX.match(line)
     if not match:
-        raise ValueError(f"Line {line:!r} has an invalid format!")
+        raise ValueError(f"Line {line!r} has an invalid format!")
 
     return PasswordEntry(
         first_pos=int(match.group(1)),
@@ -43,19 +65,403 @@ def is_valid_position_policy(entry: PasswordEntry) -> bool:
         return False
 
 
-def main():
-    with open('./input.txt') as f:
-        lines = f.readlines()
-        entries = [parse_input_line(l) for l in lines]
+def parse_input(content: str) -> List[PasswordEntry]:
+    return [parse_input_line(l) for l in content.splitlines() if l.strip()]
+
+
+def part1(entries: List[PasswordEntry]) -> int:
+    return sum(1 for entry in entries if is_valid_count_policy(entry))
+
+
+def part2(entries: List[PasswordEntry]) -> int:
+    return sum(1 for entry in entries if is_valid_position_policy(entry))
+
+
+class Policy(Enum):
+    COUNT = 'count'
+    POSITION = 'position'
+
+
+@dataclass
+class PasswordTable:
+    """
+    The password entries in columns, which take about as much memory as the file itself.
+    The password of the row i is passwords[offsets[i]:offsets[i + 1]].
+
+    :ivar symbols: The symbols' ASCII codes.
+    :ivar passwords: The passwords' bytes, one after another.
+    :ivar offsets: The starts of the passwords in the buffer and its length in the end.
+    """
+    first_pos: 'np.ndarray'
+    second_pos: 'np.ndarray'
+    symbols: 'np.ndarray'
+    passwords: 'np.ndarray'
+    offsets: 'np.ndarray'
+
+    def __len__(self) -> int:
+        return len(self.first_pos)
+
+    def entry(self, row: int) -> PasswordEntry:
+        return PasswordEntry(
+            first_pos=int(self.first_pos[row]),
+            second_pos=int(self.second_pos[row]),
+            symbol=chr(self.symbols[row]),
+            password=self.passwords[self.offsets[row]:self.offsets[row + 1]].tobytes().decode(),
+        )
+
+    def _symbol_at(self, positions: 'np.ndarray') -> 'np.ndarray':
+        """
+        Tells for every row if the symbol is at the 1-based position of its password.
+        Positions below 1 count from the end, like in is_valid_position_policy.
+
+        Raises IndexError if a position is out of its password.
+        """
+        lengths = np.diff(self.offsets)
+        indices = positions - 1
+        indices = np.where(indices < 0, indices + lengths, indices)
+        if np.any((indices < 0) | (indices >= lengths)):
+            raise IndexError("Password position is out of range")
+        return self.passwords[self.offsets[:-1] + indices] == self.symbols
+
+    def is_valid(self, policy: Policy) -> 'np.ndarray':
+        """
+        Evaluates the policy over the whole columns, see is_valid_count_policy
+        and is_valid_position_policy.
+
+        :returns: A boolean array telling which rows are valid.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=bool)
+
+        if policy == Policy.COUNT:
+            matches = self.passwords == np.repeat(self.symbols, np.diff(self.offsets))
+            # Passwords are never empty, so there are no empty segments
+            symbol_counts = np.add.reduceat(matches, self.offsets[:-1], dtype=np.int64)
+            return (self.first_pos <= symbol_counts) & (symbol_counts <= self.second_pos)
+        else:
+            return self._symbol_at(self.first_pos) != self._symbol_at(self.second_pos)
+
+    def count_valid(self, policy: Policy) -> int:
+        return int(np.count_nonzero(self.is_valid(policy)))
+
+    def failing_rows(self, policy: Policy) -> List[int]:
+        return np.flatnonzero(~self.is_valid(policy)).tolist()
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("PasswordTable requires numpy to be installed")
+
+
+def _parse_numbers(data: 'np.ndarray', starts: 'np.ndarray', ends: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Parses the decimal numbers in the byte ranges digit by digit, all ranges at once.
+
+    :returns: The numbers and a boolean array telling which ranges are valid numbers.
+    """
+    lengths = ends - starts
+    valid = (lengths >= 1) & (lengths <= 9)
+    numbers = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int(lengths.max(initial=0))):
+        has_digit = valid & (k < lengths)
+        digits = data[np.where(has_digit, starts + k, 0)].astype(np.int64) - ord('0')
+        valid &= ~has_digit | ((digits >= 0) & (digits <= 9))
+        numbers = np.where(has_digit, numbers * 10 + digits, numbers)
+    return numbers, valid
+
+
+_WORD_BYTES = frozenset(b'0123456789_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def parse_password_table(content: Union[str, bytes, memoryview]) -> PasswordTable:
+    """
+    Parses the password database into columns without looping over the lines in python.
+    Unlike parse_input, passwords may only have ASCII letters, digits and underscores,
+    and nothing may follow them on the line. Blank lines are skipped.
+
+    Raises ValueError if a line cannot be parsed.
+    """
+    _require_numpy()
+    if isinstance(content, str):
+        content = content.encode()
+    data = np.frombuffer(content, dtype=np.uint8)
+
+    newlines = np.flatnonzero(data == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(data)]))
+    if len(data):
+        ends -= (ends > starts) & (data[np.maximum(ends - 1, 0)] == ord('\r'))
+    non_empty = ends > starts
+    starts, ends = starts[non_empty], ends[non_empty]
+    if not len(starts):
+        no_positions = np.zeros(0, dtype=np.int32)
+        no_bytes = np.zeros(0, dtype=np.uint8)
+        return PasswordTable(no_positions, no_positions, no_bytes, no_bytes, np.zeros(1, dtype=np.int64))
+
+    # "1-3 a: abcde": the first dash and the first space after it delimit the positions
+    dashes = np.flatnonzero(data == ord('-'))
+    spaces = np.flatnonzero(data == ord(' '))
+    if not len(dashes) or not len(spaces):
+        raise ValueError("The password database has an invalid format!")
+    dash = dashes[np.minimum(np.searchsorted(dashes, starts), len(dashes) - 1)]
+    space = spaces[np.minimum(np.searchsorted(spaces, dash), len(spaces) - 1)]
+    password_starts = space + 4
+
+    valid = (starts < dash) & (dash < space) & (password_starts < ends)
+    # Only look at the delimiters of the lines which have room for them
+    space = np.where(valid, space, 0)
+    first_pos, valid_first = _parse_numbers(data, starts, np.where(valid, dash, starts))
+    second_pos, valid_second = _parse_numbers(data, dash + 1, np.where(valid, space, dash + 1))
+    is_word = np.zeros(256, dtype=bool)
+    is_word[list(_WORD_BYTES)] = True
+    # The symbol, the colon and the space after it, clipped for the invalid lines at the end of short data
+    symbol, colon, colon_space = (np.minimum(space + i, len(data) - 1) for i in (1, 2, 3))
+    valid &= valid_first & valid_second & is_word[data[symbol]]
+    valid &= (data[colon] == ord(':')) & (data[colon_space] == ord(' '))
+
+    password_starts = np.where(valid, password_starts, ends)
+    # Mark the bytes of the passwords: +1 at their starts, -1 at their ends
+    in_password = np.zeros(len(data) + 1, dtype=np.int8)
+    in_password[password_starts] += 1
+    in_password[ends] -= 1
+    in_password = np.cumsum(in_password[:-1], dtype=np.int8).view(bool)
+    invalid_password_bytes = np.flatnonzero(in_password & ~is_word[data])
+    valid[np.searchsorted(starts, invalid_password_bytes, side='right') - 1] = False
+
+    if not np.all(valid):
+        row = int(np.flatnonzero(~valid)[0])
+        line = data[starts[row]:ends[row]].tobytes().decode(errors='replace')
+        raise ValueError(f"Line {line!r} has an invalid format!")
+
+    return PasswordTable(
+        first_pos=first_pos.astype(np.int32),
+        second_pos=second_pos.astype(np.int32),
+        symbols=data[space + 1].copy(),
+        passwords=data[in_password],
+        offsets=np.concatenate(([0], np.cumsum(ends - password_starts))),
+    )
+
+
+def read_password_table(path: str) -> PasswordTable:
+    with open(path, 'rb') as f:
+        return parse_password_table(f.read())
+
+
+def split_byte_ranges(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Splits the file into (start, end) byte ranges of about chunk_size bytes,
+    which end right after a line ending or at the end of the file.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                # Extend the range to the end of the line it cuts
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
 
+def count_valid_lines(lines: Iterable[bytes]) -> Tuple[int, int]:
+    """
+    Validates the lines by both policies in one pass, without making PasswordEntry objects.
+    Blank lines are skipped.
+
+    Raises ValueError if a line cannot be parsed.
+
+    :returns: The number of lines valid by the count policy and by the position policy.
+    """
     count_valid_count_policy = 0
     count_valid_position_policy = 0
-    for entry in entries:
-        if is_valid_count_policy(entry):
+    for line in lines:
+        if not line.strip():
+            continue
+
+        match = ENTRY_BYTES_REGEX.match(line)
+        if not match:
+            raise ValueError(f"Line {line.decode(errors='replace')!r} has an invalid format!")
+
+        first_pos, second_pos, symbol, password = match.groups()
+        first_pos, second_pos = int(first_pos), int(second_pos)
+
+        if first_pos <= password.count(symbol) <= second_pos:
             count_valid_count_policy += 1
-        if is_valid_position_policy(entry):
+        # Indexing bytes gives ints
+        symbol_code = symbol[0]
+        if (password[first_pos - 1] == symbol_code) != (password[second_pos - 1] == symbol_code):
             count_valid_position_policy += 1
 
+    return count_valid_count_policy, count_valid_position_policy
+
+
+def count_valid_in_range(path: str, start: int, end: int) -> Tuple[int, int]:
+    """
+    Validates the lines in the byte range of the file, see count_valid_lines.
+    The range is read in blocks of READ_SIZE, so the memory doesn't grow with it.
+    """
+    count_valid_count_policy = 0
+    count_valid_position_policy = 0
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        # The incomplete last line of the previous block
+        tail = b''
+        while remaining > 0:
+            block = f.read(min(READ_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+
+            lines = (tail + block).split(b'\n')
+            tail = lines.pop()
+            count_policy, position_policy = count_valid_lines(lines)
+            count_valid_count_policy += count_policy
+            count_valid_position_policy += position_policy
+
+    count_policy, position_policy = count_valid_lines([tail])
+    return count_valid_count_policy + count_policy, count_valid_position_policy + position_policy
+
+
+def validate_file(path: str, jobs: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, int]:
+    """
+    Validates the file by both policies, splitting it into byte ranges
+    which are validated in a pool of processes. Only the counts are sent back,
+    so files of any size are validated in constant memory.
+
+    :param jobs: The number of processes, defaults to the number of CPUs.
+        With jobs=1 the ranges are validated in this process.
+    :returns: The number of entries valid by the count policy and by the position policy.
+    """
+    ranges = split_byte_ranges(path, chunk_size)
+    if jobs == 1 or len(ranges) <= 1:
+        counts = [count_valid_in_range(path, start, end) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            counts = list(executor.map(
+                count_valid_in_range, [path] * len(ranges), *zip(*ranges)))
+
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+
+@dataclass
+class FollowState:
+    """
+    The progress of following an append-only file.
+
+    :ivar offset: The end of the last validated line.
+    :ivar inode: Tells if the file was replaced, along with the device.
+    :ivar head_hash: The hash of the first bytes of the file, up to HEAD_SIZE and the offset.
+        Tells if the file was truncated and written again.
+    """
+    offset: int = 0
+    count_valid_count_policy: int = 0
+    count_valid_position_policy: int = 0
+    inode: int = 0
+    device: int = 0
+    head_hash: str = ''
+
+
+def _hash_head(f, offset: int) -> str:
+    f.seek(0)
+    return hashlib.sha1(f.read(min(offset, HEAD_SIZE))).hexdigest()
+
+
+def _find_last_line_end(f, start: int, end: int) -> int:
+    """
+    Returns the position right after the last line ending between start and end,
+    or start if there's none.
+    """
+    while end > start:
+        block_start = max(start, end - READ_SIZE)
+        f.seek(block_start)
+        newline = f.read(end - block_start).rfind(b'\n')
+        if newline != -1:
+            return block_start + newline + 1
+        end = block_start
+    return start
+
+
+def load_follow_state(state_path: str) -> FollowState:
+    """
+    Returns the initial state if the state file doesn't exist.
+    """
+    try:
+        with open(state_path) as f:
+            return FollowState(**json.load(f))
+    except FileNotFoundError:
+        return FollowState()
+
+
+def save_follow_state(state_path: str, state: FollowState) -> None:
+    # Write to a temporary file first, so that a crash never leaves a partial state
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(state_path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(asdict(state), f)
+        os.replace(tmp_path, state_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def follow_file(path: str, state_path: str) -> FollowState:
+    """
+    Validates the lines appended to the file since the previous call, and adds them
+    to the running totals in the state file. The last line is left for the next call
+    until its line ending is written.
+
+    If the file was rotated, that is replaced, truncated or rewritten, it's validated
+    from the start and the totals restart. Lines appended to the old file after
+    the previous call are not counted.
+
+    Raises ValueError if a new line cannot be parsed, the state file is not updated then.
+    """
+    state = load_follow_state(state_path)
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        rotated = (
+            (state.inode, state.device) != (stat.st_ino, stat.st_dev)
+            or stat.st_size < state.offset
+            or _hash_head(f, state.offset) != state.head_hash
+        )
+        if rotated:
+            state = FollowState(inode=stat.st_ino, device=stat.st_dev)
+
+        end = _find_last_line_end(f, state.offset, stat.st_size)
+        if end > state.offset:
+            count_policy, position_policy = count_valid_in_range(path, state.offset, end)
+            state.count_valid_count_policy += count_policy
+            state.count_valid_position_policy += position_policy
+            state.offset = end
+        state.head_hash = _hash_head(f, state.offset)
+
+    save_follow_state(state_path, state)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the passwords valid by the policies.")
+    parser.add_argument('path', nargs='?', default='./input.txt')
+    parser.add_argument(
+        '--follow', metavar='STATE',
+        help="only validate the lines appended since the last run, keeping the totals in this file")
+    args = parser.parse_args()
+
+    if args.follow:
+        state = follow_file(args.path, args.follow)
+        count_valid_count_policy = state.count_valid_count_policy
+        count_valid_position_policy = state.count_valid_position_policy
+    else:
+        count_valid_count_policy, count_valid_position_policy = validate_file(args.path)
+
     print(f"Valid by the first policy: {count_valid_count_policy}")
     print(f"Valid by the second policy: {count_valid_position_policy}")
 
@@ -0,0 +1,22 @@
+import random
+import string
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates a password database of `size` entries like "1-3 a: abcde".
+    """
+    rng = random.Random(seed)
+    # A few symbols make the policies match more often
+    alphabet = string.ascii_lowercase[:rng.randint(3, 26)]
+
+    lines = []
+    for _ in range(size):
+        password_len = rng.randint(3, 20)
+        password = ''.join(rng.choice(alphabet) for _ in range(password_len))
+        symbol = rng.choice(alphabet)
+        first_pos = rng.randint(1, password_len - 1)
+        second_pos = rng.randint(first_pos + 1, password_len)
+        lines.append(f"{first_pos}-{second_pos} {symbol}: {password}\n")
+
+    return ''.join(lines)
@@ -0,0 +1,121 @@
+import pytest
+
+from day2 import Policy, count_valid_lines, follow_file, is_valid_count_policy, is_valid_position_policy, \
+    load_follow_state, parse_input, parse_input_line, parse_password_table, part1, part2, read_password_table, \
+    split_byte_ranges, validate_file
+from generate_day2 import generate
+
+EXAMPLE = "1-3 a: abcde\n1-3 b: cdefg\n2-9 c: ccccccccc\n"
+
+
+def test_parts():
+    entries = parse_input(EXAMPLE)
+    assert part1(entries) == 2
+    assert part2(entries) == 1
+
+
+def test_parse_input_line():
+    with pytest.raises(ValueError):
+        parse_input_line("1-3 abcde")
+
+
+def test_count_valid_lines():
+    assert count_valid_lines(EXAMPLE.encode().split(b'\n')) == (2, 1)
+
+    with pytest.raises(ValueError):
+        count_valid_lines([b"1-3 abcde"])
+
+
+def test_split_byte_ranges(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text(EXAMPLE)
+
+    assert split_byte_ranges(str(path), chunk_size=1) == [(0, 13), (13, 26), (26, 43)]
+    assert split_byte_ranges(str(path), chunk_size=13) == [(0, 13), (13, 26), (26, 43)]
+    assert split_byte_ranges(str(path), chunk_size=14) == [(0, 26), (26, 43)]
+    assert split_byte_ranges(str(path), chunk_size=1000) == [(0, 43)]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_file(tmp_path, jobs):
+    content = generate(1000, seed=1)
+    path = tmp_path / 'input.txt'
+    # No line ending after the last line
+    path.write_text(content.rstrip('\n'))
+
+    entries = parse_input(content)
+    assert validate_file(str(path), jobs=jobs, chunk_size=1000) == (part1(entries), part2(entries))
+
+
+def test_follow_file(tmp_path):
+    path = tmp_path / 'passwords.log'
+    state_path = str(tmp_path / 'state.json')
+    lines = EXAMPLE.splitlines(keepends=True)
+
+    path.write_text(lines[0])
+    state = follow_file(str(path), state_path)
+    assert (state.count_valid_count_policy, state.count_valid_position_policy) == (1, 1)
+
+    # The incomplete line waits for its line ending
+    with open(path, 'a') as f:
+        f.write(lines[1] + lines[2][:5])
+    state = follow_file(str(path), state_path)
+    assert (state.offset, state.count_valid_count_policy, state.count_valid_position_policy) == (26, 1, 1)
+
+    with open(path, 'a') as f:
+        f.write(lines[2][5:])
+    state = follow_file(str(path), state_path)
+    assert (state.offset, state.count_valid_count_policy, state.count_valid_position_policy) == (43, 2, 1)
+    assert follow_file(str(path), state_path) == state
+
+    # Rotated, then a new file is started
+    path.rename(tmp_path / 'passwords.log.1')
+    path.write_text(lines[2])
+    state = follow_file(str(path), state_path)
+    assert (state.offset, state.count_valid_count_policy, state.count_valid_position_policy) == (17, 1, 0)
+
+    # Truncated and written again up to the same size
+    path.write_text(lines[1] + "1-2 z: ccc\n")
+    state = follow_file(str(path), state_path)
+    assert (state.count_valid_count_policy, state.count_valid_position_policy) == (0, 0)
+
+    with open(path, 'a') as f:
+        f.write("1-3 abcde\n")
+    with pytest.raises(ValueError):
+        follow_file(str(path), state_path)
+    assert load_follow_state(state_path).offset == 24
+
+
+def test_password_table():
+    pytest.importorskip('numpy')
+    table = parse_password_table(EXAMPLE)
+    assert len(table) == 3
+    assert table.entry(1) == parse_input_line("1-3 b: cdefg")
+    assert table.count_valid(Policy.COUNT) == 2
+    assert table.count_valid(Policy.POSITION) == 1
+    assert table.failing_rows(Policy.COUNT) == [1]
+    assert table.failing_rows(Policy.POSITION) == [1, 2]
+
+    assert len(parse_password_table("\n\r\n")) == 0
+    assert parse_password_table("").failing_rows(Policy.COUNT) == []
+
+    for content in ["1-3 abcde", "a-3 a: abc", "1-3 a: ab cd", "1-3 a:abc", "1-3 a: ", "1-3 a: ab\n2-4 b: $$",
+                    "- x", "1- ", "1-3 a"]:
+        with pytest.raises(ValueError):
+            parse_password_table(content)
+
+    with pytest.raises(IndexError):
+        parse_password_table("1-4 a: abc").is_valid(Policy.POSITION)
+
+
+def test_read_password_table(tmp_path):
+    pytest.importorskip('numpy')
+    content = generate(1000, seed=2)
+    path = tmp_path / 'input.txt'
+    path.write_text(content.replace('\n', '\r\n'))
+
+    table = read_password_table(str(path))
+    entries = parse_input(content)
+    assert [table.entry(row) for row in range(len(table))] == entries
+    assert table.failing_rows(Policy.COUNT) == [i for i, e in enumerate(entries) if not is_valid_count_policy(e)]
+    assert table.failing_rows(Policy.POSITION) == [i for i, e in enumerate(entries) if not is_valid_position_policy(e)]
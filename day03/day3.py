@@ -1,5 +1,12 @@
+import math
+import mmap
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # The tree count tables are optional
+    np = None
 
 
 @dataclass
@@ -17,13 +24,26 @@ class Coords:
         return Coords(row=self.row + down, column=self.column + right)
 
 
+_BIT_SQUARES = str.maketrans('10', '#.')
+_DELETE_SQUARES = str.maketrans('', '', '#.')
+
+
 @dataclass
 class SlopeRow:
-    pattern: str
+    """
+    :ivar trees: The bitmask of the squares with trees, read like the pattern:
+        the highest bit is the first column, the lowest bit is the last one.
+    :ivar width: The number of squares, the pattern repeats to the right after them.
+    """
+    trees: int
+    width: int
 
-    def is_tree(self, column: int):
-        column = column % len(self.pattern)
-        return self.pattern[column] == '#'
+    @property
+    def pattern(self) -> str:
+        return format(self.trees, f'0{self.width}b').translate(_BIT_SQUARES)
+
+    def is_tree(self, column: int) -> bool:
+        return bool(self.trees >> (self.width - 1 - column % self.width) & 1)
 
 
 @dataclass
@@ -40,49 +60,321 @@ class SlopeMap:
     def is_in_bounds(self, coords: Coords) -> bool:
         return coords.row < len(self.rows)
 
+    def _require_width(self) -> int:
+        widths = {row.width for row in self.rows}
+        if len(widths) > 1:
+            raise ValueError("The rows have different widths")
+        return widths.pop() if widths else 0
+
+    def to_array(self) -> 'np.ndarray':
+        """
+        Returns the map as a 2-D boolean array, True for the trees.
+
+        Raises ValueError if the rows have different widths.
+        """
+        if np is None:
+            raise ImportError("SlopeMap.to_array requires numpy to be installed")
+
+        width = self._require_width()
+        row_size = (width + 7) // 8
+        data = b''.join(row.trees.to_bytes(row_size, 'big') for row in self.rows)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).reshape(len(self.rows), row_size * 8)
+        # The bytes are padded in front of the first column
+        return bits[:, row_size * 8 - width:].astype(bool)
+
+    def tree_count_table(self, max_down: Optional[int] = None) -> 'np.ndarray':
+        """
+        Counts the trees on every slope going right by 0 to width - 1 squares
+        and down by 1 to max_down squares, the map's height by default.
+        Other slopes to the right repeat these, as the map repeats every width columns.
+
+        The downs up to the square root of the height visit many rows: a slope's column
+        on its step k only depends on k modulo the width, so their rows are summed
+        by these remainders and columns, and every right picks its columns from the sums.
+        The rest visit few rows, so they are summed step by step for all of them at once.
+
+        Raises ValueError if the rows have different widths.
+
+        :returns: The matrix of the counts, table[down - 1, right].
+        """
+        grid = self.to_array()
+        height, width = grid.shape
+        if max_down is None:
+            max_down = height
+        table = np.zeros((max_down, width), dtype=np.int64)
+        if not height or not width:
+            return table
+
+        rights = np.arange(width)
+        remainders = np.arange(width)[:, None]
+        # The column of every right on the steps with every remainder
+        remainder_columns = remainders * rights % width
+        split = min(max_down, math.isqrt(height))
+
+        for down in range(1, split + 1):
+            visited = grid[::down]
+            full = len(visited) // width * width
+            sums = visited[:full].reshape(-1, width, width).sum(axis=0, dtype=np.int64)
+            sums[:len(visited) - full] += visited[full:]
+            table[down - 1] = sums[remainders, remainder_columns].sum(axis=0)
+
+        downs = np.arange(split + 1, max_down + 1)
+        step = 0
+        while len(downs) and step * downs[0] < height:
+            # The downs are ascending, so the ones still on the map come first
+            on_map = int(np.searchsorted(step * downs, height))
+            table[split:split + on_map] += grid[step * downs[:on_map]][:, step * rights % width]
+            step += 1
+
+        return table
+
+
+# The number of bytes of the mapped rows converted to bitmasks at once
+READ_SIZE = 1024 * 1024
+# Translates the mapped squares to binary digits, and anything else to a non-digit
+_SQUARE_DIGITS = bytes(
+    {ord('#'): ord('1'), ord('.'): ord('0'), ord('\n'): ord('\n'), ord('\r'): ord('\r')}.get(byte, ord('x'))
+    for byte in range(256)
+)
+
+
+class MappedSlopeMap:
+    """
+    A slope map read straight from a memory-mapped file, without making the rows.
+    All rows must have the same width and the same line endings, so that every row
+    is found at a fixed stride. The last row may have no line ending.
+
+    Use it as a context manager, or close it explicitly.
+    It can be passed to count_trees and count_trees_many instead of a SlopeMap.
+
+    :ivar width: The number of squares in a row.
+    :ivar stride: The number of bytes in a row with its line ending.
+    :ivar height: The number of rows.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            size = self._file.seek(0, 2)
+            # Empty files cannot be mapped
+            self._mapping: Optional[mmap.mmap] = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except BaseException:
+            self._file.close()
+            raise
+
+        self.width = 0
+        self.stride = 1
+        self.height = 0
+        if self._mapping is not None:
+            line_end = self._mapping.find(b'\n')
+            if line_end == -1:
+                line_end = size
+            self.width = line_end - (line_end > 0 and self._mapping[line_end - 1] == ord('\r'))
+            self.stride = line_end + 1
+            # The last line ending is optional
+            self.height = -(-size // self.stride)
+            padded_size = self.height * self.stride
+            if not self.width or size not in (padded_size, padded_size - (self.stride - self.width)):
+                self.close()
+                raise ValueError("The rows of the map must have the same width")
+
+    def __enter__(self) -> 'MappedSlopeMap':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        self._file.close()
+
+    def is_tree(self, coords: Coords) -> bool:
+        if not self.is_in_bounds(coords):
+            raise ValueError('out of bounds')
+
+        assert self._mapping is not None
+        return self._mapping[coords.row * self.stride + coords.column % self.width] == ord('#')
+
+    def is_in_bounds(self, coords: Coords) -> bool:
+        return coords.row < self.height
+
+    def iter_row_trees(self) -> Iterator[int]:
+        """
+        Yields the bitmask of every row, like SlopeRow.trees. The rows are converted
+        in blocks of about READ_SIZE bytes, so the memory doesn't grow with the height.
+
+        Raises ValueError if a row has other squares than '#' and '.', or a different width.
+        """
+        if self._mapping is None:
+            return
+
+        rows_per_block = max(1, READ_SIZE // self.stride)
+        for first_row in range(0, self.height, rows_per_block):
+            rows = min(rows_per_block, self.height - first_row)
+            block = self._mapping[first_row * self.stride:(first_row + rows) * self.stride]
+            # Every full row ends with a line ending right at its stride
+            if block[self.stride - 1::self.stride].count(b'\n') != len(block) // self.stride:
+                raise ValueError("The rows of the map must have the same width")
+
+            for line in block.translate(_SQUARE_DIGITS).split(b'\n', rows - 1):
+                yield int(line, 2)
+
 
 def parse_row(line: str) -> SlopeRow:
-    return SlopeRow(pattern=line.strip())
+    """
+    Raises ValueError if the row has other squares than '#' and '.'.
+    """
+    pattern = line.strip()
+    if pattern.count('#') + pattern.count('.') != len(pattern):
+        raise ValueError(f"Row {pattern!r} has invalid squares")
+    return SlopeRow(trees=int(pattern.replace('#', '1').replace('.', '0'), 2), width=len(pattern))
 
 
 def parse_map(input: str) -> SlopeMap:
-    lines = input.split('\n')
-    # Strip each lines
-    lines = [l.strip() for l in lines]
-    # Remove empty lines
-    lines = [l for l in lines if l]
+    """
+    Raises ValueError if the map has other squares than '#' and '.'.
+    """
+    # Converting the whole map to binary at once is much faster than row by row
+    if '0' in input or '1' in input or input.translate(_DELETE_SQUARES).strip():
+        raise ValueError("The map has invalid squares")
+    bits = input.replace('#', '1').replace('.', '0')
 
-    rows = [parse_row(line) for line in lines]
+    lines = [l.strip() for l in bits.split('\n')]
+    rows = [SlopeRow(trees=int(line, 2), width=len(line)) for line in lines if line]
     return SlopeMap(rows=rows)
 
 
-def count_trees(slope_map: SlopeMap, right: int, down: int) -> int:
-    location = Coords(row=0, column=0)
-    trees = 0
-    while slope_map.is_in_bounds(location):
-        if slope_map.is_tree(location):
-            trees += 1
+def _spread_bits(bits: int, lane_size: int) -> int:
+    """
+    Moves every bit i of the number to the bit i * lane_size.
+    """
+    spread = 0
+    lane = 0
+    while bits:
+        if bits & 1:
+            spread |= 1 << lane
+        bits >>= 1
+        lane += lane_size
+    return spread
+
+
+def count_trees_many(slope_map: Union[SlopeMap, MappedSlopeMap], slopes: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    Counts the trees on every (right, down) slope in a single pass over the rows.
+
+    The column of a slope on its step k only depends on k modulo the width.
+    So for every down step and every such remainder, the pass sums up the trees
+    of the visited rows column by column: the rows' bits are spread into lanes
+    wide enough to never overflow, and the rows are added as numbers.
+    Then every slope only picks its column's count for each remainder,
+    which doesn't depend on the number of rows.
+
+    Raises ValueError if a slope doesn't go down.
+
+    :returns: The number of trees on each slope.
+    """
+    if any(down < 1 for _, down in slopes):
+        raise ValueError("Every slope must go down")
 
-        location = location.add(right, down)
+    row_trees: Iterator[int]
+    if isinstance(slope_map, MappedSlopeMap):
+        height, width = slope_map.height, slope_map.width
+        row_trees = slope_map.iter_row_trees()
+    else:
+        widths = {row.width for row in slope_map.rows}
+        if len(widths) > 1:
+            return [_count_trees_by_row(slope_map, right, down) for right, down in slopes]
+        height, width = len(slope_map.rows), widths.pop() if widths else 1
+        row_trees = (row.trees for row in slope_map.rows)
 
-    return trees
+    lane_size = height.bit_length() + 1
+    lane_mask = (1 << lane_size) - 1
+    # Spreads a byte of the trees bitmask at once
+    spread_bytes = [_spread_bits(byte, lane_size) for byte in range(256)]
+    byte_shift = 8 * lane_size
+
+    downs = sorted({down for _, down in slopes})
+    # down: the column sums of the rows visited on the steps with each remainder
+    column_sums: Dict[int, List[int]] = {down: [0] * width for down in downs}
+    for row_index, trees in enumerate(row_trees):
+        if not trees:
+            continue
+
+        spread = None
+        for down in downs:
+            step, remainder = divmod(row_index, down)
+            if remainder:
+                continue
+
+            if spread is None:
+                spread = 0
+                shift = 0
+                while trees:
+                    spread |= spread_bytes[trees & 0xFF] << shift
+                    trees >>= 8
+                    shift += byte_shift
+            column_sums[down][step % width] += spread
+
+    counts = []
+    for right, down in slopes:
+        sums = column_sums[down]
+        counts.append(sum(
+            # The highest bit is the first column
+            sums[remainder] >> ((width - 1 - remainder * right % width) * lane_size) & lane_mask
+            for remainder in range(width)
+        ))
+
+    return counts
+
+
+def _count_trees_by_row(slope_map: SlopeMap, right: int, down: int) -> int:
+    """
+    Counts the trees on the slope of a map with rows of different widths.
+    """
+    return sum(
+        slope_map.rows[row_index].is_tree(step * right)
+        for step, row_index in enumerate(range(0, len(slope_map.rows), down))
+    )
+
+
+def count_trees(slope_map: Union[SlopeMap, MappedSlopeMap], right: int, down: int) -> int:
+    return count_trees_many(slope_map, [(right, down)])[0]
+
+
+# (right, down) pairs checked in the second part of the puzzle
+SLOPES = [
+    (1, 1),
+    (3, 1),
+    (5, 1),
+    (7, 1),
+    (1, 2),
+]
+
+
+def parse_input(content: str) -> SlopeMap:
+    return parse_map(content)
+
+
+def part1(slope_map: SlopeMap) -> int:
+    return count_trees(slope_map, 3, 1)
+
+
+def part2(slope_map: SlopeMap) -> int:
+    trees_mult = 1
+    for trees in count_trees_many(slope_map, SLOPES):
+        trees_mult *= trees
+    return trees_mult
 
 
 def main():
     with open('./input.txt') as f:
-        slope_map = parse_map(f.read())
-
-    slopes = [
-        (1, 1),
-        (3, 1),
-        (5, 1),
-        (7, 1),
-        (1, 2),
-    ]
-    slope_trees = []
-    for right, down in slopes:
-        trees = count_trees(slope_map, right, down)
-        slope_trees.append(trees)
+        slope_map = parse_input(f.read())
+
+    slope_trees = count_trees_many(slope_map, SLOPES)
+    for (right, down), trees in zip(SLOPES, slope_trees):
         print(f"Right {right}, down {down} = {trees} trees")
 
     trees_mult = 1
@@ -0,0 +1,20 @@
+import random
+
+
+def generate(size: int, seed: int = 0, width: int = 31, density: float = 0.2) -> str:
+    """
+    Generates a slope map of `size` rows, each `width` squares wide.
+
+    :param density: The probability of each square to have a tree.
+        The starting square never has one.
+    """
+    rng = random.Random(seed)
+
+    lines = []
+    for row in range(size):
+        line = ''.join('#' if rng.random() < density else '.' for _ in range(width))
+        if row == 0:
+            line = '.' + line[1:]
+        lines.append(line + '\n')
+
+    return ''.join(lines)
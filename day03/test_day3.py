@@ -0,0 +1,107 @@
+import pytest
+
+from day3 import SLOPES, Coords, MappedSlopeMap, count_trees, count_trees_many, parse_input, parse_row, part1, part2
+
+EXAMPLE = """\
+..##.......
+#...#...#..
+.#....#..#.
+..#.#...#.#
+.#...##..#.
+..#.##.....
+.#.#.#....#
+.#........#
+#.##...#...
+#...##....#
+.#..#...#.#
+"""
+
+
+def test_parse_row():
+    row = parse_row("..##.#\n")
+    assert row.width == 6
+    assert row.pattern == "..##.#"
+    assert [row.is_tree(column) for column in range(8)] == [False, False, True, True, False, True, False, False]
+
+    with pytest.raises(ValueError):
+        parse_row("..1")
+    with pytest.raises(ValueError):
+        parse_input(".#.\n.x.\n")
+
+
+def test_parts():
+    slope_map = parse_input(EXAMPLE)
+    assert part1(slope_map) == 7
+    assert part2(slope_map) == 336
+
+
+def test_count_trees_many():
+    slope_map = parse_input(EXAMPLE)
+    assert count_trees_many(slope_map, SLOPES) == [2, 7, 3, 4, 2]
+    assert count_trees_many(slope_map, [(3, 1), (3, 1), (-8, 1), (25, 2)]) == [7, 7, 7, 2]
+    assert count_trees_many(slope_map, []) == []
+    assert count_trees_many(parse_input(""), [(3, 1)]) == [0]
+    assert count_trees(slope_map, 1, 2) == 2
+
+    # Rows of different widths are walked row by row
+    assert count_trees_many(parse_input("..\n.#.\n..#.\n"), [(1, 1), (2, 1)]) == [2, 0]
+
+    with pytest.raises(ValueError):
+        count_trees_many(slope_map, [(1, 0)])
+
+
+@pytest.mark.parametrize("content", [EXAMPLE, EXAMPLE.rstrip('\n'), EXAMPLE.replace('\n', '\r\n')])
+def test_mapped_slope_map(tmp_path, content, monkeypatch):
+    path = tmp_path / 'map.txt'
+    path.write_bytes(content.encode())
+    # Convert the rows in several blocks
+    monkeypatch.setattr('day3.READ_SIZE', 40)
+
+    slope_map = parse_input(EXAMPLE)
+    with MappedSlopeMap(str(path)) as mapped:
+        assert (mapped.width, mapped.height) == (11, 11)
+        assert list(mapped.iter_row_trees()) == [row.trees for row in slope_map.rows]
+        assert mapped.is_tree(Coords(row=1, column=11))
+        assert not mapped.is_tree(Coords(row=1, column=12))
+        assert count_trees_many(mapped, SLOPES) == [2, 7, 3, 4, 2]
+        assert count_trees(mapped, 3, 1) == 7
+
+        with pytest.raises(ValueError):
+            mapped.is_tree(Coords(row=11, column=0))
+
+
+def test_mapped_slope_map_invalid(tmp_path):
+    path = tmp_path / 'map.txt'
+
+    path.write_bytes(b"")
+    with MappedSlopeMap(str(path)) as mapped:
+        assert count_trees_many(mapped, SLOPES) == [0] * 5
+
+    path.write_bytes(b"..#\n.#")
+    with pytest.raises(ValueError):
+        MappedSlopeMap(str(path))
+
+    # The widths are checked on the rows as they're converted
+    for content in [b"..#\n.#\n#..\n", b"..#\n.#\n.#..\n"]:
+        path.write_bytes(content)
+        with MappedSlopeMap(str(path)) as mapped, pytest.raises(ValueError):
+            list(mapped.iter_row_trees())
+
+    path.write_bytes(b"..#\n.1.\n")
+    with MappedSlopeMap(str(path)) as mapped, pytest.raises(ValueError):
+        list(mapped.iter_row_trees())
+
+
+def test_tree_count_table():
+    pytest.importorskip('numpy')
+    slope_map = parse_input(EXAMPLE)
+    assert slope_map.to_array()[1].tolist() == [c == '#' for c in "#...#...#.."]
+
+    table = slope_map.tree_count_table()
+    assert table.shape == (11, 11)
+    assert table.tolist() == [[count_trees(slope_map, right, down) for right in range(11)] for down in range(1, 12)]
+    assert [table[down - 1, right] for right, down in SLOPES] == [2, 7, 3, 4, 2]
+    assert slope_map.tree_count_table(max_down=20)[15:].tolist() == [[0] * 11] * 5
+
+    with pytest.raises(ValueError):
+        parse_input("..\n.#.\n").tree_count_table()
@@ -1,7 +1,19 @@
+import argparse
+import json
+import os
 import re
+import time
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+HEIGHT_REGEX = re.compile(r"^(\d+)(cm|in)$")
+HAIR_COLOR_REGEX = re.compile(r"^#[0-9a-f]{6}$")
+PASSPORT_ID_REGEX = re.compile(r"^\d{9}$")
+
+# The size of the byte ranges validated by a single task of the pool
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
 
 
 @dataclass
@@ -12,30 +24,55 @@ class Passport:
 def parse_passport_field(s: str) -> Tuple[str, str]:
     values = s.strip().split(':')
     if len(values) != 2:
-        raise ValueError(f"Invalid passport field: {s:!r}")
+        raise ValueError(f"Invalid passport field: {s!r}")
 
     return values[0], values[1]
 
 
 def parse_passport(s: str) -> Passport:
-    field_strs = re.split(r"[ \n]", s)
-    field_strs = [s.strip() for s in field_strs]
-    field_strs = [s for s in field_strs if s]
-
     passport = Passport()
-    for field_str in field_strs:
+    for field_str in s.split():
         key, value = parse_passport_field(field_str)
         passport.fields[key] = value
 
     return passport
 
 
-def parse_passports_file(content: str) -> List[Passport]:
-    passport_strs = content.split('\n\n')
+def parse_passports_file(content: Union[str, Iterable[str]]) -> List[Passport]:
+    """
+    :param content: The whole file, or its blank-line-separated blocks.
+    """
+    passport_strs = content.split('\n\n') if isinstance(content, str) else content
     passports = [parse_passport(s) for s in passport_strs]
     return passports
 
 
+def iter_passport_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the blank-line-separated blocks of the lines, e.g. of a text file
+    read line by line. The lines may have their line endings.
+    Only the current block is kept in memory.
+    """
+    block: List[str] = []
+    for line in lines:
+        if line.strip():
+            block.append(line.rstrip('\r\n'))
+        elif block:
+            yield '\n'.join(block)
+            block = []
+
+    if block:
+        yield '\n'.join(block)
+
+
+def iter_passports(lines: Iterable[str]) -> Iterator[Passport]:
+    """
+    Yields the passports of the lines one by one, see iter_passport_blocks.
+    """
+    for block in iter_passport_blocks(lines):
+        yield parse_passport(block)
+
+
 def passport_has_required_fields(passport: Passport) -> bool:
     required_fields = ['byr', 'iyr', 'eyr', 'hgt', 'hcl', 'ecl', 'pid']
     for key in required_fields:
@@ -73,7 +110,7 @@ def is_valid_expiration_year(eyr: str) -> bool:
 
 
 def is_valid_height(hgt: str) -> bool:
-    match = re.match(r"^(\d+)(cm|in)$", hgt)
+    match = HEIGHT_REGEX.match(hgt)
     if not match:
         return False
 
@@ -89,7 +126,7 @@ def is_valid_height(hgt: str) -> bool:
 
 
 def is_valid_hair_color(hcl: str) -> bool:
-    match = re.match(r"^#[0-9a-f]{6}$", hcl)
+    match = HAIR_COLOR_REGEX.match(hcl)
     return match is not None
 
 
@@ -98,22 +135,244 @@ def is_valid_eye_color(ecl: str) -> bool:
 
 
 def is_valid_passport_id(pid: str) -> bool:
-    match = re.match(r"^\d{9}$", pid)
+    match = PASSPORT_ID_REGEX.match(pid)
     return match is not None
 
 
+# The required fields and their validators
+FIELD_VALIDATORS = {
+    'byr': is_valid_birth_year,
+    'iyr': is_valid_issue_year,
+    'eyr': is_valid_expiration_year,
+    'hgt': is_valid_height,
+    'hcl': is_valid_hair_color,
+    'ecl': is_valid_eye_color,
+    'pid': is_valid_passport_id,
+}
+
+
+@dataclass
+class FieldSchema:
+    """
+    The rules for a required field's value. A value must satisfy all of them.
+
+    :ivar type: 'str', or 'int' for the values int() accepts.
+    :ivar range: The inclusive (min, max) range of an 'int' value.
+    :ivar units: For 'int' values made of digits and a unit: the allowed units
+        and the inclusive (min, max) range of the number for each of them.
+    :ivar regex: The pattern the whole value must match.
+    :ivar enum: The allowed values.
+    """
+    type: str = 'str'
+    range: Optional[Tuple[int, int]] = None
+    units: Optional[Dict[str, Tuple[int, int]]] = None
+    regex: Optional[str] = None
+    enum: Optional[List[str]] = None
+
+
+# Field name: its rules
+PassportSchema = Dict[str, FieldSchema]
+
+PASSPORT_SCHEMA: PassportSchema = {
+    'byr': FieldSchema(type='int', range=(1920, 2002)),
+    'iyr': FieldSchema(type='int', range=(2010, 2020)),
+    'eyr': FieldSchema(type='int', range=(2020, 2030)),
+    'hgt': FieldSchema(type='int', units={'cm': (150, 193), 'in': (59, 76)}),
+    'hcl': FieldSchema(regex=r"#[0-9a-f]{6}"),
+    'ecl': FieldSchema(enum=["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]),
+    'pid': FieldSchema(regex=r"\d{9}"),
+}
+
+# Matches what int() accepts, but surrounding whitespace, which the fields can't have
+_INT_PATTERN = r"[+-]?\d+(?:_\d+)*"
+
+
+def parse_schema(data: Dict[str, Dict[str, Any]]) -> PassportSchema:
+    """
+    Makes a schema of its JSON representation, e.g.
+    {"byr": {"type": "int", "range": [1920, 2002]}, "ecl": {"enum": ["amb", "blu"]}}.
+
+    Raises ValueError if the schema is invalid.
+    """
+    schema = {}
+    for key, rules in data.items():
+        try:
+            field_schema = FieldSchema(**rules)
+        except TypeError as e:
+            raise ValueError(f"Invalid rules of the field {key!r}: {e}")
+
+        if field_schema.type not in ('str', 'int'):
+            raise ValueError(f"Invalid type of the field {key!r}: {field_schema.type!r}")
+        if field_schema.type != 'int' and (field_schema.range or field_schema.units):
+            raise ValueError(f"Only 'int' fields can have ranges, but {key!r} has")
+
+        if field_schema.range is not None:
+            field_schema.range = _parse_range(key, field_schema.range)
+        if field_schema.units is not None:
+            if not isinstance(field_schema.units, dict) or not all(
+                    isinstance(unit, str) and unit for unit in field_schema.units):
+                raise ValueError(f"Invalid units of the field {key!r}: {field_schema.units!r}")
+            field_schema.units = {unit: _parse_range(key, r) for unit, r in field_schema.units.items()}
+        if field_schema.regex is not None:
+            try:
+                re.compile(field_schema.regex)
+            except (TypeError, re.error) as e:
+                raise ValueError(f"Invalid regex of the field {key!r}: {e}")
+        if field_schema.enum is not None and (
+                not isinstance(field_schema.enum, list) or not all(isinstance(v, str) for v in field_schema.enum)):
+            raise ValueError(f"Invalid enum of the field {key!r}: {field_schema.enum!r}")
+        schema[key] = field_schema
+
+    return schema
+
+
+def _parse_range(key: str, bounds: Any) -> Tuple[int, int]:
+    if (not isinstance(bounds, (list, tuple)) or len(bounds) != 2
+            or not all(isinstance(b, int) and not isinstance(b, bool) for b in bounds)):
+        raise ValueError(f"The ranges of the field {key!r} must be [min, max] integers, got {bounds!r}")
+    return bounds[0], bounds[1]
+
+
+def load_schema(path: str) -> PassportSchema:
+    with open(path) as f:
+        return parse_schema(json.load(f))
+
+
+def _rule_lines(i: int, rules: FieldSchema, namespace: Dict[str, Any], malformed: str, out_of_range: str,
+                indent: str = "    ") -> List[str]:
+    """
+    Generates the checks of a field's value, which is in the variable `value`,
+    running the malformed statement if the value doesn't have the field's format
+    and the out_of_range one if it has the format, but its number or itself isn't allowed.
+    """
+    lines = []
+    if rules.regex is not None:
+        namespace[f'regex{i}'] = re.compile(rules.regex).fullmatch
+        lines += [f"if not regex{i}(value):", f"    {malformed}"]
+
+    if rules.enum is not None:
+        namespace[f'enum{i}'] = frozenset(rules.enum)
+        lines += [f"if value not in enum{i}:", f"    {out_of_range}"]
+
+    if rules.units is not None:
+        # The same as matching (\d+)(unit1|unit2...), as \d is what str.isdecimal accepts
+        for j, (unit, (low, high)) in enumerate(rules.units.items()):
+            lines += [
+                f"{'if' if j == 0 else 'elif'} value.endswith({unit!r}) and value[:{-len(unit)}].isdecimal():",
+                f"    if not {low!r} <= int(value[:{-len(unit)}]) <= {high!r}:",
+                f"        {out_of_range}",
+            ]
+        lines += ["else:", f"    {malformed}"]
+    elif rules.type == 'int':
+        namespace[f'int_regex{i}'] = re.compile(_INT_PATTERN).fullmatch
+        checks = [f"if not (value.isdecimal() or int_regex{i}(value)):", f"    {malformed}"]
+        if rules.range is not None:
+            low, high = rules.range
+            checks += [f"if not {low!r} <= int(value) <= {high!r}:", f"    {out_of_range}"]
+            if 0 <= low and len(str(low)) == len(str(high)):
+                # Plain ASCII digits of the same length compare like the numbers, without int()
+                checks = [
+                    f"if not ({str(low)!r} <= value <= {str(high)!r} and len(value) == {len(str(low))}"
+                    f" and value.isascii() and value.isdigit()):",
+                ] + ["    " + line for line in checks]
+        lines += checks
+
+    return [indent + line for line in lines]
+
+
+def compile_schema(schema: PassportSchema) -> Callable[[Dict[str, str]], bool]:
+    """
+    Compiles the schema into a single function validating the passport's fields,
+    with the rules of every field inlined and its patterns compiled once.
+    Missing fields are invalid.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = ["def validate(fields):"]
+    for i, (key, rules) in enumerate(schema.items()):
+        lines += [
+            f"    value = fields.get({key!r})",
+            "    if value is None:",
+            "        return False",
+        ]
+        lines += _rule_lines(i, rules, namespace, malformed="return False", out_of_range="return False")
+
+    lines.append("    return True")
+    exec('\n'.join(lines), namespace)
+    return namespace['validate']
+
+
+@dataclass
+class FieldFailures:
+    """
+    The number of passports failing a field's rules, by the reason.
+
+    :ivar malformed: The value doesn't have the field's format, e.g. hgt:70 or byr:19x0.
+    :ivar out_of_range: The value has the format, but its number is out of the range
+        or it isn't one of the allowed values, e.g. hgt:200cm or ecl:xyz.
+    """
+    missing: int = 0
+    malformed: int = 0
+    out_of_range: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.missing + self.malformed + self.out_of_range
+
+    def merge(self, other: 'FieldFailures') -> 'FieldFailures':
+        return FieldFailures(
+            self.missing + other.missing,
+            self.malformed + other.malformed,
+            self.out_of_range + other.out_of_range,
+        )
+
+
+def compile_failure_counter(schema: PassportSchema) -> Callable[[Dict[str, str], Dict[str, FieldFailures]], bool]:
+    """
+    Like compile_schema, but the function checks every field, even after one has failed,
+    and counts why each failing field fails: counter(fields, failures) adds them
+    to failures, which must have FieldFailures of all the schema's fields,
+    and tells if the fields are valid.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = []
+    for i, (key, rules) in enumerate(schema.items()):
+        lines += [f"def check{i}(value, failures):"]
+        lines += _rule_lines(
+            i, rules, namespace,
+            malformed="failures.malformed += 1; return False",
+            out_of_range="failures.out_of_range += 1; return False",
+        )
+        lines += ["    return True", ""]
+
+    lines += ["def count_failures(fields, failures):", "    valid = True"]
+    for i, key in enumerate(schema):
+        lines += [
+            f"    value = fields.get({key!r})",
+            "    if value is None:",
+            f"        failures[{key!r}].missing += 1",
+            "        valid = False",
+            f"    elif not check{i}(value, failures[{key!r}]):",
+            "        valid = False",
+        ]
+
+    lines.append("    return valid")
+    exec('\n'.join(lines), namespace)
+    return namespace['count_failures']
+
+
+_validate_fields = compile_schema(PASSPORT_SCHEMA)
+_count_failures = compile_failure_counter(PASSPORT_SCHEMA)
+
+
 def passport_is_valid(passport: Passport) -> bool:
-    validators = {
-        'byr': is_valid_birth_year,
-        'iyr': is_valid_issue_year,
-        'eyr': is_valid_expiration_year,
-        'hgt': is_valid_height,
-        'hcl': is_valid_hair_color,
-        'ecl': is_valid_eye_color,
-        'pid': is_valid_passport_id,
-    }
-
-    for key, validate in validators.items():
+    return _validate_fields(passport.fields)
+
+
+def passport_is_valid_by_validators(passport: Passport) -> bool:
+    """
+    The same as passport_is_valid, but with FIELD_VALIDATORS instead of the compiled schema.
+    """
+    for key, validate in FIELD_VALIDATORS.items():
         if key not in passport.fields.keys():
             return False
 
@@ -124,21 +383,193 @@ def passport_is_valid(passport: Passport) -> bool:
     return True
 
 
-def main():
-    with open('./input.txt') as f:
-        passports = parse_passports_file(f.read())
+def check_passport(
+            passport: Passport,
+            validate_fields: Callable[[Dict[str, str]], bool] = _validate_fields,
+            required_fields: Iterable[str] = PASSPORT_SCHEMA,
+        ) -> Tuple[bool, bool]:
+    """
+    Computes passport_has_required_fields and passport_is_valid,
+    or the same by a compiled schema, given along with the schema's fields.
+    """
+    fields = passport.fields
+    if not all(key in fields for key in required_fields):
+        return False, False
+    return True, validate_fields(fields)
+
+
+@dataclass
+class PassportStats:
+    """
+    :ivar seconds: The time spent reading, parsing and validating the passports.
+    :ivar field_failures: Why the fields of the schema fail, by the field.
+    """
+    records: int = 0
+    with_required_fields: int = 0
+    valid: int = 0
+    seconds: float = 0.0
+    field_failures: Dict[str, FieldFailures] = field(default_factory=dict)
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds > 0 else 0.0
+
+    def merge(self, other: 'PassportStats') -> 'PassportStats':
+        """
+        Adds up the stats of two parts of the passports, e.g. validated by different processes.
+        """
+        field_failures = dict(self.field_failures)
+        for key, failures in other.field_failures.items():
+            field_failures[key] = field_failures[key].merge(failures) if key in field_failures else failures
+
+        return PassportStats(
+            records=self.records + other.records,
+            with_required_fields=self.with_required_fields + other.with_required_fields,
+            valid=self.valid + other.valid,
+            seconds=self.seconds + other.seconds,
+            field_failures=field_failures,
+        )
+
+
+def validate_passports(lines: Iterable[str], schema: Optional[PassportSchema] = None) -> PassportStats:
+    """
+    Checks the passports of the lines one by one, e.g. of a text file read line by line,
+    so that the memory doesn't grow with the number of passports.
+    The failures of the fields are counted as the passports are validated.
+
+    :param schema: Validates the passports instead of PASSPORT_SCHEMA,
+        its fields are the required ones.
+    """
+    if schema is None:
+        schema = PASSPORT_SCHEMA
+        count_failures = _count_failures
+    else:
+        count_failures = compile_failure_counter(schema)
+
+    stats = PassportStats(field_failures={key: FieldFailures() for key in schema})
+    field_failures = stats.field_failures
+    started = time.perf_counter()
+    for passport in iter_passports(lines):
+        fields = passport.fields
+        stats.records += 1
+        stats.valid += count_failures(fields, field_failures)
+        stats.with_required_fields += all(key in fields for key in schema)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def split_passport_ranges(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Splits the file into (start, end) byte ranges of about chunk_size bytes,
+    which end right after a blank line or at the end of the file,
+    so that no passport is split between two ranges.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                # Extend the range to the end of the line it cuts, then to the next blank line
+                f.seek(end - 1)
+                f.readline()
+                while True:
+                    line = f.readline()
+                    if not line.strip():
+                        break
+                end = f.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def _iter_range_lines(f, size: int) -> Iterator[str]:
+    while size > 0:
+        line = f.readline(size)
+        if not line:
+            break
+        size -= len(line)
+        yield line.decode()
+
+
+def validate_range(path: str, start: int, end: int, schema: Optional[PassportSchema] = None) -> PassportStats:
+    """
+    Validates the passports in the byte range of the file, see validate_passports.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return validate_passports(_iter_range_lines(f, end - start), schema)
+
+
+def validate_file(
+            path: str,
+            jobs: Optional[int] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            schema: Optional[PassportSchema] = None,
+        ) -> PassportStats:
+    """
+    Validates the passports of the file, splitting it into byte ranges
+    which are validated in a pool of processes. Only the stats are sent back
+    and merged, so files of any size are validated in constant memory.
+
+    :param jobs: The number of processes, defaults to the number of CPUs.
+        With jobs=1 the ranges are validated in this process.
+    :returns: The merged stats, with the wall-clock time of the whole validation.
+    """
+    started = time.perf_counter()
+    ranges = split_passport_ranges(path, chunk_size)
+    if jobs == 1 or len(ranges) <= 1:
+        parts = [validate_range(path, start, end, schema) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parts = list(executor.map(
+                validate_range, [path] * len(ranges), *zip(*ranges), [schema] * len(ranges)))
 
-    count_no_missing_fields = 0
-    count_valid = 0
-    for p in passports:
-        if passport_has_required_fields(p):
-            count_no_missing_fields += 1
+    stats = PassportStats(field_failures={key: FieldFailures() for key in schema or PASSPORT_SCHEMA})
+    for part in parts:
+        stats = stats.merge(part)
+    stats.seconds = time.perf_counter() - started
+    return stats
 
-        if passport_is_valid(p):
-            count_valid += 1
 
-    print(f"Passports without missing fields: {count_no_missing_fields}")
-    print(f"Passports with valid data: {count_valid}")
+def parse_input(content: str) -> List[Passport]:
+    return parse_passports_file(content)
+
+
+def part1(passports: List[Passport]) -> int:
+    return sum(1 for p in passports if passport_has_required_fields(p))
+
+
+def part2(passports: List[Passport]) -> int:
+    return sum(1 for p in passports if passport_is_valid(p))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the passports with the required fields and the valid ones.")
+    parser.add_argument('path', nargs='?', default='./input.txt')
+    parser.add_argument('--schema', help="validate by the schema in this JSON file, see parse_schema")
+    parser.add_argument('-j', '--jobs', type=int,
+                        help="validate the file in this many processes, 0 for the number of CPUs")
+    args = parser.parse_args()
+
+    schema = load_schema(args.schema) if args.schema else None
+    if args.jobs is not None:
+        stats = validate_file(args.path, jobs=args.jobs or None, schema=schema)
+    else:
+        with open(args.path) as f:
+            stats = validate_passports(f, schema)
+
+    print(f"Passports without missing fields: {stats.with_required_fields}")
+    print(f"Passports with valid data: {stats.valid}")
+    print(f"Checked {stats.records} passports in {stats.seconds:0.3f}s, "
+          f"{stats.records_per_second:0.0f} passports per second")
+    print(f"{'Field':<8}{'missing':>10}{'malformed':>12}{'out of range':>15}")
+    for key, failures in stats.field_failures.items():
+        print(f"{key:<8}{failures.missing:>10}{failures.malformed:>12}{failures.out_of_range:>15}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import random
+import string
+
+FIELD_KEYS = ['byr', 'iyr', 'eyr', 'hgt', 'hcl', 'ecl', 'pid', 'cid']
+EYE_COLORS = ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]
+
+
+def _valid_value(rng: random.Random, key: str) -> str:
+    if key == 'byr':
+        return str(rng.randint(1920, 2002))
+    elif key == 'iyr':
+        return str(rng.randint(2010, 2020))
+    elif key == 'eyr':
+        return str(rng.randint(2020, 2030))
+    elif key == 'hgt':
+        if rng.random() < 0.5:
+            return f"{rng.randint(150, 193)}cm"
+        else:
+            return f"{rng.randint(59, 76)}in"
+    elif key == 'hcl':
+        return '#' + ''.join(rng.choice('0123456789abcdef') for _ in range(6))
+    elif key == 'ecl':
+        return rng.choice(EYE_COLORS)
+    elif key == 'pid':
+        return ''.join(rng.choice(string.digits) for _ in range(9))
+    elif key == 'cid':
+        return str(rng.randint(100, 350))
+    else:
+        raise ValueError(f"Invalid key: {key!r}")
+
+
+def _invalid_value(rng: random.Random, key: str) -> str:
+    if key in ['byr', 'iyr', 'eyr']:
+        return rng.choice([str(rng.randint(1000, 1919)), str(rng.randint(2031, 2999)), 'abcd'])
+    elif key == 'hgt':
+        return rng.choice([f"{rng.randint(194, 250)}cm", f"{rng.randint(10, 58)}in", str(rng.randint(59, 193))])
+    elif key == 'hcl':
+        return rng.choice(['#' + ''.join(rng.choice('ghijklmnopqrstuvwxyz') for _ in range(6)), '123abc'])
+    elif key == 'ecl':
+        return rng.choice(['xry', 'zzz', 'gmt', 'wat'])
+    elif key == 'pid':
+        return ''.join(rng.choice(string.digits) for _ in range(rng.choice([8, 10])))
+    else:
+        # cid is never validated
+        return _valid_value(rng, key)
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates a batch of `size` passports. Some of them miss fields, some
+    have invalid field values.
+    """
+    rng = random.Random(seed)
+
+    passports = []
+    for _ in range(size):
+        keys = list(FIELD_KEYS)
+        rng.shuffle(keys)
+        # Roughly a quarter of the passports miss a field
+        if rng.random() < 0.25:
+            keys.remove(rng.choice(keys))
+        # cid is optional anyway
+        elif rng.random() < 0.5:
+            keys.remove('cid')
+
+        field_strs = []
+        for key in keys:
+            if rng.random() < 0.05:
+                value = _invalid_value(rng, key)
+            else:
+                value = _valid_value(rng, key)
+            field_strs.append(f"{key}:{value}")
+
+        # Fields are separated by spaces or newlines
+        passport = ''
+        for index, field_str in enumerate(field_strs):
+            if index > 0:
+                passport += '\n' if rng.random() < 0.3 else ' '
+            passport += field_str
+        passports.append(passport)
+
+    return '\n\n'.join(passports) + '\n'
@@ -0,0 +1,179 @@
+import io
+import json
+
+import pytest
+
+from day4 import FIELD_VALIDATORS, PASSPORT_SCHEMA, FieldFailures, FieldSchema, check_passport, \
+    compile_failure_counter, compile_schema, iter_passport_blocks, iter_passports, load_schema, parse_input, \
+    parse_passport, parse_schema, passport_has_required_fields, passport_is_valid, passport_is_valid_by_validators, \
+    part1, part2, split_passport_ranges, validate_file, validate_passports
+from generate_day4 import generate
+
+EXAMPLE = """\
+ecl:gry pid:860033327 eyr:2020 hcl:#fffffd
+byr:1937 iyr:2017 cid:147 hgt:183cm
+
+iyr:2013 ecl:amb cid:350 eyr:2023 pid:028048884
+hcl:#cfa07d byr:1929
+
+hcl:#ae17e1 iyr:2013
+eyr:2024
+ecl:brn pid:760753108 byr:1931
+hgt:179cm
+
+hcl:#cfa07d eyr:2025 pid:166559648
+iyr:2011 ecl:brn hgt:59in
+"""
+
+
+def test_parse_passport():
+    passport = parse_passport("ecl:gry pid:860033327\nhgt:183cm\n")
+    assert passport.fields == {'ecl': 'gry', 'pid': '860033327', 'hgt': '183cm'}
+
+    with pytest.raises(ValueError):
+        parse_passport("ecl:gry pid")
+
+
+def test_iter_passport_blocks():
+    lines = io.StringIO("\na:1\nb:2\n\n\n\nc:3 d:4\n")
+    assert list(iter_passport_blocks(lines)) == ["a:1\nb:2", "c:3 d:4"]
+    assert list(iter_passport_blocks(["a:1", "b:2", "", "c:3"])) == ["a:1\nb:2", "c:3"]
+    assert list(iter_passport_blocks(["a:1\r\n", " \r\n", "b:2\r\n"])) == ["a:1", "b:2"]
+    assert list(iter_passport_blocks([])) == []
+
+
+def test_check_passport():
+    passports = parse_input(EXAMPLE)
+    assert [check_passport(p) for p in passports] == [
+        (passport_has_required_fields(p), passport_is_valid(p)) for p in passports]
+    assert [check_passport(p) for p in passports] == [(True, True), (False, False), (True, True), (False, False)]
+
+
+def test_validate_passports():
+    content = generate(500, seed=4)
+    passports = parse_input(content)
+    assert list(iter_passports(io.StringIO(content))) == passports
+
+    stats = validate_passports(io.StringIO(content))
+    assert (stats.records, stats.with_required_fields, stats.valid) == (500, part1(passports), part2(passports))
+    assert stats.records_per_second > 0
+
+
+def test_compile_schema():
+    passports = parse_input(generate(500, seed=5))
+    assert [passport_is_valid(p) for p in passports] == [passport_is_valid_by_validators(p) for p in passports]
+
+    validate = compile_schema({
+        'age': FieldSchema(type='int', range=(18, 120)),
+        'hgt': FieldSchema(type='int', units={'m': (1, 2), 'cm': (100, 250)}),
+        'tag': FieldSchema(regex=r"[a-z]+", enum=["abc", "ABC", "xyz"]),
+    })
+    assert validate({'age': '018', 'hgt': '180cm', 'tag': 'abc'})
+    assert validate({'age': '+20', 'hgt': '2m', 'tag': 'xyz', 'extra': ''})
+    assert not validate({'age': '17', 'hgt': '180cm', 'tag': 'abc'})
+    assert not validate({'age': '20', 'hgt': '3m', 'tag': 'abc'})
+    assert not validate({'age': '20', 'hgt': '180', 'tag': 'abc'})
+    assert not validate({'age': '20', 'hgt': '180cm', 'tag': 'ABC'})
+    assert not validate({'age': '20', 'hgt': '180cm'})
+    assert compile_schema({})({})
+
+
+def test_parse_schema(tmp_path):
+    data = {
+        'byr': {'type': 'int', 'range': [1920, 2002]},
+        'iyr': {'type': 'int', 'range': [2010, 2020]},
+        'eyr': {'type': 'int', 'range': [2020, 2030]},
+        'hgt': {'type': 'int', 'units': {'cm': [150, 193], 'in': [59, 76]}},
+        'hcl': {'regex': "#[0-9a-f]{6}"},
+        'ecl': {'enum': ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]},
+        'pid': {'regex': "\\d{9}"},
+    }
+    path = tmp_path / 'schema.json'
+    path.write_text(json.dumps(data))
+    assert load_schema(str(path)) == PASSPORT_SCHEMA
+
+    for invalid in [
+        {'byr': {'size': 4}},
+        {'byr': {'type': 'float'}},
+        {'hcl': {'range': [1, 2]}},
+        {'byr': {'type': 'int', 'range': ["1", "2"]}},
+        {'byr': {'type': 'int', 'range': [1, 2, 3]}},
+        {'hgt': {'type': 'int', 'units': {'cm': [150]}}},
+        {'hgt': {'type': 'int', 'units': [150, 190]}},
+        {'hcl': {'regex': "#[0-9"}},
+        {'ecl': {'enum': "amb"}},
+    ]:
+        with pytest.raises(ValueError):
+            parse_schema(invalid)
+
+
+def test_validate_passports_schema():
+    content = generate(200, seed=6)
+    schema = parse_schema({'ecl': {'enum': ['amb']}})
+    stats = validate_passports(io.StringIO(content), schema)
+    expected = [p.fields.get('ecl') == 'amb' for p in parse_input(content)]
+    assert stats.valid == sum(expected)
+    assert stats.with_required_fields == sum('ecl' in p.fields for p in parse_input(content))
+
+    stats = validate_passports(io.StringIO("ecl:amb\n\necl:blu\n\npid:1\n"), schema)
+    assert (stats.records, stats.with_required_fields, stats.valid) == (3, 2, 1)
+    passport = parse_passport("ecl:amb")
+    assert check_passport(passport, compile_schema(schema), schema) == (True, True)
+    assert check_passport(passport) == (False, False)
+
+
+def test_compile_failure_counter():
+    count_failures = compile_failure_counter(PASSPORT_SCHEMA)
+    failures = {key: FieldFailures() for key in PASSPORT_SCHEMA}
+    passport = parse_passport("byr:19x0 iyr:2009 eyr:2025 hgt:70 hcl:#123abc ecl:xyz cid:1")
+    assert not count_failures(passport.fields, failures)
+    assert failures == {
+        'byr': FieldFailures(malformed=1),
+        'iyr': FieldFailures(out_of_range=1),
+        'eyr': FieldFailures(),
+        'hgt': FieldFailures(malformed=1),
+        'hcl': FieldFailures(),
+        'ecl': FieldFailures(out_of_range=1),
+        'pid': FieldFailures(missing=1),
+    }
+
+    passport = parse_passport("byr:2002 iyr:2010 eyr:2030 hgt:200cm hcl:#123abc ecl:amb pid:000000001")
+    assert not count_failures(passport.fields, failures)
+    assert failures['hgt'] == FieldFailures(malformed=1, out_of_range=1)
+
+    for p in parse_input(generate(500, seed=7)):
+        failures = {key: FieldFailures() for key in PASSPORT_SCHEMA}
+        assert count_failures(p.fields, failures) == passport_is_valid(p)
+        assert any(f.total for f in failures.values()) != passport_is_valid(p)
+
+
+def test_validate_passports_field_failures():
+    content = generate(300, seed=8)
+    stats = validate_passports(io.StringIO(content))
+    passports = parse_input(content)
+    for key, validate in FIELD_VALIDATORS.items():
+        failures = stats.field_failures[key]
+        assert failures.missing == sum(key not in p.fields for p in passports)
+        assert failures.malformed + failures.out_of_range == sum(
+            key in p.fields and not validate(p.fields[key]) for p in passports)
+
+
+def test_validate_file(tmp_path):
+    content = generate(300, seed=9)
+    path = tmp_path / 'passports.txt'
+    path.write_text(content)
+    expected = validate_passports(io.StringIO(content))
+
+    ranges = split_passport_ranges(str(path), chunk_size=500)
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert content[end - 2:end] == "\n\n"
+
+    for jobs in [1, 2]:
+        stats = validate_file(str(path), jobs=jobs, chunk_size=500)
+        assert stats.records == expected.records
+        assert stats.with_required_fields == expected.with_required_fields
+        assert stats.valid == expected.valid
+        assert stats.field_failures == expected.field_failures
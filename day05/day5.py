@@ -1,37 +1,167 @@
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+import argparse
+import contextlib
+import functools
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, TextIO, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # The numpy decoder is optional
+    np = None
+
+ROW_BITS = 7
+COLUMN_BITS = 3
+PASS_LENGTH = ROW_BITS + COLUMN_BITS
+
+# The back half of the rows and the right half of the columns are the 1 bits
+_PASS_BITS = str.maketrans('FBLR', '0101')
+
+# Bounds the number of bytes in the temporary arrays of the numpy decoder
+NUMPY_CHUNK_SIZE = 1 << 22
+
+
+@dataclass(frozen=True)
+class PlaneGeometry:
+    """
+    The plane has 2 ** row_bits rows of 2 ** column_bits seats,
+    and its boarding passes have a letter per bit.
+    """
+    row_bits: int = ROW_BITS
+    column_bits: int = COLUMN_BITS
+
+    def __post_init__(self):
+        if self.row_bits < 0 or self.column_bits < 0:
+            raise ValueError(f"The numbers of the row and the column bits can't be negative: {self}")
+        # The seat IDs are kept in arrays of 64-bit numbers at most
+        if self.row_bits + self.column_bits > 64:
+            raise ValueError(f"The seat IDs can't have more than 64 bits: {self}")
+
+    @property
+    def columns(self) -> int:
+        return 1 << self.column_bits
+
+    @property
+    def seats(self) -> int:
+        return 1 << (self.row_bits + self.column_bits)
+
+    @property
+    def pass_length(self) -> int:
+        return self.row_bits + self.column_bits
+
+    def seat_id(self, row: int, column: int) -> int:
+        return (row << self.column_bits) + column
+
+
+DEFAULT_GEOMETRY = PlaneGeometry()
 
 
 @dataclass
 class Seat:
     row: int
     column: int
+    geometry: PlaneGeometry = field(default=DEFAULT_GEOMETRY, repr=False)
 
     @property
     def id(self):
-        return self.row * 8 + self.column
+        return self.geometry.seat_id(self.row, self.column)
 
 
 def decode_binary(encoded: str, lower: str, upper: str) -> int:
     decoded = 0
-    while encoded:
-        digit = encoded[0]
-        encoded = encoded[1:]
-
+    for digit in encoded:
         if digit == lower:
             decoded = decoded * 2
         elif digit == upper:
             decoded = decoded * 2 + 1
         else:
-            raise ValueError(f"Invalid digit: {digit:!r}")
+            raise ValueError(f"Invalid digit: {digit!r}")
 
     return decoded
 
 
-def decode_seat(bsp: str) -> Seat:
-    row = decode_binary(bsp[0:7], lower='F', upper='B')
-    column = decode_binary(bsp[7:10], lower='L', upper='R')
-    return Seat(row=row, column=column)
+def decode_seat(bsp: str, geometry: PlaneGeometry = DEFAULT_GEOMETRY) -> Seat:
+    row = decode_binary(bsp[0:geometry.row_bits], lower='F', upper='B')
+    column = decode_binary(bsp[geometry.row_bits:geometry.pass_length], lower='L', upper='R')
+    return Seat(row=row, column=column, geometry=geometry)
+
+
+@functools.lru_cache()
+def _passes_regex(geometry: PlaneGeometry) -> Pattern:
+    return re.compile(rf"(?:\s*[FB]{{{geometry.row_bits}}}[LR]{{{geometry.column_bits}}}(?!\S))*\s*")
+
+
+def decode_seat_ids(content: str, geometry: PlaneGeometry = DEFAULT_GEOMETRY) -> array:
+    """
+    Decodes the whitespace-separated boarding passes into an array of their seat IDs,
+    which are the passes read as binary numbers: the whole content is translated
+    to binary digits at once, and every pass is converted by int().
+    The array is of 32-bit IDs, or 64-bit ones for planes with more seats.
+
+    Raises ValueError if the content has an invalid pass.
+    """
+    if not _passes_regex(geometry).fullmatch(content):
+        raise ValueError("Boarding passes must be F or B rows followed by L or R columns")
+
+    typecode = 'I' if geometry.pass_length <= 32 else 'Q'
+    return array(typecode, [int(digits, 2) for digits in content.translate(_PASS_BITS).split()])
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The numpy decoder requires numpy to be installed")
+
+
+def decode_seat_ids_numpy(
+            content: Union[str, bytes, memoryview],
+            geometry: PlaneGeometry = DEFAULT_GEOMETRY,
+            chunk_size: int = NUMPY_CHUNK_SIZE,
+        ) -> 'np.ndarray':
+    """
+    The same as decode_seat_ids, but into a uint32 or uint64 array without looping over the passes in python.
+    The content may also be a buffer, e.g. a mapped file.
+
+    The bytes are decoded in chunks of about chunk_size, split at whitespace.
+    """
+    _require_numpy()
+    if isinstance(content, str):
+        content = content.encode()
+    data = np.frombuffer(content, dtype=np.uint8)
+    dtype = np.uint32 if geometry.pass_length <= 32 else np.uint64
+
+    decoded = []
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        # Extend the chunk to the end of the pass it cuts
+        while end < len(data) and not chr(data[end]).isspace():
+            end += 1
+        decoded.append(_decode_seat_ids_chunk(data[start:end], geometry, dtype))
+        start = end
+
+    return np.concatenate(decoded) if decoded else np.zeros(0, dtype=dtype)
+
+
+def _decode_seat_ids_chunk(data: 'np.ndarray', geometry: PlaneGeometry, dtype: type) -> 'np.ndarray':
+    is_space = (data == ord(' ')) | ((data >= ord('\t')) & (data <= ord('\r')))
+
+    # Every pass is a run of pass_length letters between whitespace
+    padded = np.concatenate(([True], is_space, [True]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    if np.any(edges[1::2] - edges[::2] != geometry.pass_length):
+        raise ValueError(f"Boarding passes must be {geometry.pass_length} letters long")
+
+    letters = data[~is_space].reshape(-1, geometry.pass_length)
+    rows, columns = letters[:, :geometry.row_bits], letters[:, geometry.row_bits:]
+    back, right = rows == ord('B'), columns == ord('R')
+    if not (np.all(back | (rows == ord('F'))) and np.all(right | (columns == ord('L')))):
+        raise ValueError("Boarding passes must be F or B rows followed by L or R columns")
+
+    bits = np.concatenate((back, right), axis=1)
+    weights = np.left_shift(1, np.arange(geometry.pass_length - 1, -1, -1, dtype=dtype), dtype=dtype)
+    return bits.astype(dtype) @ weights
 
 
 def find_missing_seats(seats: List[Seat]) -> List[Seat]:
@@ -53,23 +183,325 @@ def find_missing_seats(seats: List[Seat]) -> List[Seat]:
             prev_row_seat_is_present = (row - 1, column) in seat_map
 
             if seat_is_missing and next_row_seat_is_present and prev_row_seat_is_present:
-                missing_seats.append(Seat(row=row, column=column))
+                missing_seats.append(Seat(row=row, column=column, geometry=seats[0].geometry))
 
     return missing_seats
 
 
+# Finds the positions of the set bits of the bytes, bit i of byte j is seat 8 * j + i
+_NONZERO_BYTES_REGEX = re.compile(rb'[^\x00]')
+_BYTE_BITS = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+
+
+class SeatOccupancy:
+    """
+    The occupied seats of a plane, a bit per seat keyed by the seat ID,
+    so that planes with millions of seats take a few hundred kilobytes.
+    Seats can be added as their passes arrive.
+    """
+
+    def __init__(self, geometry: PlaneGeometry = DEFAULT_GEOMETRY):
+        self.geometry = geometry
+        self.bits = bytearray((geometry.seats + 7) // 8)
+        self.count = 0
+        self.max_id = -1
+
+    @classmethod
+    def from_seat_ids(
+                cls,
+                seat_ids: Union[Iterable[int], 'np.ndarray'],
+                geometry: PlaneGeometry = DEFAULT_GEOMETRY,
+            ) -> 'SeatOccupancy':
+        """
+        Raises ValueError if a seat ID is not in the plane.
+        """
+        occupancy = cls(geometry)
+        if np is not None and isinstance(seat_ids, np.ndarray):
+            occupancy._add_array(seat_ids)
+        else:
+            occupancy.add_many(seat_ids)
+        return occupancy
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, seat_id: int) -> bool:
+        return 0 <= seat_id < self.geometry.seats and bool(self.bits[seat_id >> 3] >> (seat_id & 7) & 1)
+
+    def add(self, seat_id: int) -> None:
+        """
+        Marks the seat occupied, seats may be added more than once.
+
+        Raises ValueError if the seat ID is not in the plane.
+        """
+        if not 0 <= seat_id < self.geometry.seats:
+            raise ValueError(f"Seat ID {seat_id} is not in the plane of {self.geometry.seats} seats")
+
+        mask = 1 << (seat_id & 7)
+        byte = self.bits[seat_id >> 3]
+        if not byte & mask:
+            self.bits[seat_id >> 3] = byte | mask
+            self.count += 1
+            self.max_id = max(self.max_id, seat_id)
+
+    def add_many(self, seat_ids: Iterable[int]) -> None:
+        bits = self.bits
+        seats = self.geometry.seats
+        for seat_id in seat_ids:
+            if not 0 <= seat_id < seats:
+                raise ValueError(f"Seat ID {seat_id} is not in the plane of {seats} seats")
+            bits[seat_id >> 3] |= 1 << (seat_id & 7)
+
+        self._recount()
+
+    def _recount(self) -> None:
+        occupied = int.from_bytes(self.bits, 'little')
+        self.count = bin(occupied).count('1')
+        self.max_id = occupied.bit_length() - 1
+
+    def _add_array(self, seat_ids: 'np.ndarray') -> None:
+        if len(seat_ids) and (seat_ids.min() < 0 or seat_ids.max() >= self.geometry.seats):
+            raise ValueError(f"Seat IDs must be in the plane of {self.geometry.seats} seats")
+
+        occupied = np.zeros(len(self.bits) * 8, dtype=bool)
+        occupied[seat_ids] = True
+        bits = np.frombuffer(self.bits, dtype=np.uint8) | np.packbits(occupied, bitorder='little')
+        self.bits[:] = bits.tobytes()
+        self._recount()
+
+    def missing_seat_ids(self) -> List[int]:
+        """
+        The same as find_missing_seats: the free seats with the seats of the same column
+        in the next and the previous rows occupied. The bits of all the seats are tested at once,
+        as a single integer shifted by a row to both sides, in linear time.
+        """
+        row_size = self.geometry.columns
+        occupied = int.from_bytes(self.bits, 'little')
+        free = ~occupied & ((1 << self.geometry.seats) - 1)
+        missing = free & (occupied << row_size) & (occupied >> row_size)
+
+        missing_bytes = missing.to_bytes(len(self.bits), 'little')
+        return [
+            (match.start() << 3) + bit
+            for match in _NONZERO_BYTES_REGEX.finditer(missing_bytes)
+            for bit in _BYTE_BITS[missing_bytes[match.start()]]
+        ]
+
+
+def find_missing_seat_ids(seat_ids: Iterable[int], geometry: PlaneGeometry = DEFAULT_GEOMETRY) -> List[int]:
+    """
+    The same as find_missing_seats, but by the seat IDs, see SeatOccupancy.missing_seat_ids.
+    """
+    return SeatOccupancy.from_seat_ids(seat_ids, geometry).missing_seat_ids()
+
+
+def find_missing_seat_ids_numpy(seat_ids: 'np.ndarray', geometry: PlaneGeometry = DEFAULT_GEOMETRY) -> 'np.ndarray':
+    """
+    The same as find_missing_seat_ids, with a byte per seat.
+    """
+    _require_numpy()
+    if not len(seat_ids):
+        return np.zeros(0, dtype=np.int64)
+
+    row_size = geometry.columns
+    occupied = np.zeros(int(seat_ids.max()) + 1 + row_size, dtype=bool)
+    occupied[seat_ids] = True
+    is_missing = ~occupied[row_size:-row_size] & occupied[:-2 * row_size] & occupied[2 * row_size:]
+    return np.flatnonzero(is_missing) + row_size
+
+
+class FenwickTree:
+    """
+    Counts per position with O(log n) updates and prefix sums.
+    The node i (1-based) holds the sum of the lowbit(i) positions ending at it.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        typecode = 'I' if size < 1 << 32 else 'Q'
+        self.tree = array(typecode, bytes(array(typecode).itemsize * (size + 1)))
+
+    def add(self, position: int, delta: int = 1) -> None:
+        i = position + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """
+        The sum of the positions before end.
+        """
+        total = 0
+        i = min(end, self.size)
+        while i > 0:
+            total += self.tree[i]
+            i &= i - 1
+        return total
+
+    def find_zero(self, start: int = 0) -> Optional[int]:
+        """
+        The first position at or after start with the count 0, if every count is 0 or 1.
+        Descends the tree by the number of zeros before the position, a node's zeros
+        are its length minus its sum.
+        """
+        if start >= self.size:
+            return None
+
+        # The wanted zero is this one by their order
+        remaining = max(start, 0) - self.prefix_sum(start) + 1
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            node = position + step
+            if node <= self.size and step - self.tree[node] < remaining:
+                position = node
+                remaining -= step - self.tree[node]
+            step >>= 1
+
+        return position if position < self.size else None
+
+
+class SeatStream:
+    """
+    The seats assigned as the boarding passes arrive, with the queries about them
+    answered in O(log n) by a Fenwick tree of the occupied seats over the seat IDs,
+    instead of looking through all the passes every time.
+    """
+
+    def __init__(self, geometry: PlaneGeometry = DEFAULT_GEOMETRY):
+        self.geometry = geometry
+        self.occupancy = SeatOccupancy(geometry)
+        self.tree = FenwickTree(geometry.seats)
+
+    def add(self, seat_id: int) -> bool:
+        """
+        Assigns the seat, tells if it was free.
+
+        Raises ValueError if the seat ID is not in the plane.
+        """
+        if seat_id in self.occupancy:
+            return False
+
+        self.occupancy.add(seat_id)
+        self.tree.add(seat_id)
+        return True
+
+    def add_pass(self, bsp: str) -> int:
+        """
+        Assigns the seat of the boarding pass, returns its ID.
+
+        Raises ValueError if the pass is invalid.
+        """
+        seat_ids = decode_seat_ids(bsp, self.geometry)
+        if len(seat_ids) != 1:
+            raise ValueError(f"Expected a single boarding pass, got {bsp!r}")
+
+        self.add(seat_ids[0])
+        return seat_ids[0]
+
+    def add_passes(self, lines: Iterable[str]) -> Iterator[int]:
+        """
+        Assigns the seats of the passes as they are read, e.g. from a pipe, and yields their IDs.
+        Blank lines are skipped.
+        """
+        for line in lines:
+            if line.strip():
+                yield self.add_pass(line)
+
+    def __len__(self) -> int:
+        return len(self.occupancy)
+
+    @property
+    def max_id(self) -> Optional[int]:
+        return self.occupancy.max_id if len(self.occupancy) else None
+
+    def occupied_in_range(self, first_id: int, last_id: int) -> int:
+        """
+        The number of the assigned seats with IDs from first_id to last_id inclusive.
+        """
+        if last_id < first_id:
+            return 0
+        return self.tree.prefix_sum(last_id + 1) - self.tree.prefix_sum(max(first_id, 0))
+
+    def free_in_range(self, first_id: int, last_id: int) -> int:
+        """
+        The number of the free seats with IDs from first_id to last_id inclusive,
+        the IDs out of the plane are not seats.
+        """
+        first_id, last_id = max(first_id, 0), min(last_id, self.geometry.seats - 1)
+        if last_id < first_id:
+            return 0
+        return last_id - first_id + 1 - self.occupied_in_range(first_id, last_id)
+
+    def next_free_seat(self, start_id: int = 0) -> Optional[int]:
+        """
+        The ID of the first free seat at or after start_id, None if the rest of the plane is full.
+        """
+        return self.tree.find_zero(start_id)
+
+
+def parse_input(content: str) -> Union[array, 'np.ndarray']:
+    """
+    Decodes the seat IDs with numpy if it's installed.
+    """
+    return decode_seat_ids_numpy(content) if np is not None else decode_seat_ids(content)
+
+
+def _is_numpy_array(seat_ids: Sequence[int]) -> bool:
+    return np is not None and isinstance(seat_ids, np.ndarray)
+
+
+def part1(seat_ids: Sequence[int]) -> int:
+    return int(seat_ids.max()) if _is_numpy_array(seat_ids) else max(seat_ids)
+
+
+def part2(seat_ids: Sequence[int]) -> int:
+    if _is_numpy_array(seat_ids):
+        missing_ids = find_missing_seat_ids_numpy(seat_ids)
+    else:
+        missing_ids = find_missing_seat_ids(seat_ids)
+    if len(missing_ids) != 1:
+        raise ValueError(f"Expected exactly one missing seat, found {len(missing_ids)}")
+
+    return int(missing_ids[0])
+
+
+def _open_passes(path: str) -> ContextManager[TextIO]:
+    """
+    Opens the file, or the standard input for -, which is left open.
+    """
+    return contextlib.nullcontext(sys.stdin) if path == '-' else open(path)
+
+
 def main():
-    with open('./input.txt') as f:
-        lines = f.readlines()
-        seats = [decode_seat(l) for l in lines]
+    parser = argparse.ArgumentParser(description="Find the max seat ID and the missing seats.")
+    parser.add_argument('path', nargs='?', default='./input.txt', help="the passes, - for the standard input")
+    parser.add_argument('--stream', action='store_true',
+                        help="assign the seats as the passes are read, reporting after every pass")
+    parser.add_argument('--row-bits', type=int, default=ROW_BITS, help="the plane has 2 ** ROW_BITS rows")
+    parser.add_argument('--column-bits', type=int, default=COLUMN_BITS,
+                        help="the plane has 2 ** COLUMN_BITS seats in a row")
+    args = parser.parse_args()
+
+    geometry = PlaneGeometry(row_bits=args.row_bits, column_bits=args.column_bits)
+    if args.stream:
+        stream = SeatStream(geometry)
+        with _open_passes(args.path) as f:
+            for seat_id in stream.add_passes(f):
+                print(f"Seat {seat_id}: max ID {stream.max_id}, "
+                      f"{stream.free_in_range(0, stream.max_id)} free seats up to it, "
+                      f"next free seat {stream.next_free_seat(seat_id)}", flush=True)
+        return
+
+    with _open_passes(args.path) as f:
+        occupancy = SeatOccupancy.from_seat_ids(decode_seat_ids(f.read(), geometry), geometry)
 
-    max_id_seat = max(seats, key=lambda seat: seat.id)
-    print(f"Max ID: {max_id_seat.id}")
+    print(f"Max ID: {occupancy.max_id}")
 
-    missing_seats = find_missing_seats(seats)
     print("Missing seats:")
-    for seat in missing_seats:
-        print(f"{seat}: id {seat.id}")
+    for seat_id in occupancy.missing_seat_ids():
+        row, column = divmod(seat_id, geometry.columns)
+        print(f"{Seat(row=row, column=column, geometry=geometry)}: id {seat_id}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import random
+
+
+def encode_seat_id(seat_id: int, row_bits: int = 7, column_bits: int = 3) -> str:
+    """
+    encode_seat_id(357)  # => "FBFBBFFRLR"
+    """
+    row, column = divmod(seat_id, 2 ** column_bits)
+    row_code = format(row, f'0{row_bits}b').replace('0', 'F').replace('1', 'B')
+    column_code = format(column, f'0{column_bits}b').replace('0', 'L').replace('1', 'R')
+    return row_code + column_code
+
+
+def generate(size: int, seed: int = 0, row_bits: int = 7, column_bits: int = 3) -> str:
+    """
+    Generates `size` boarding passes for a contiguous block of seats with exactly
+    one seat in the middle of the block missing. The front and the back rows of
+    the plane are left empty, like in the puzzle.
+
+    :raises ValueError: If the passes don't fit into the plane.
+    """
+    columns = 2 ** column_bits
+    seats_count = 2 ** (row_bits + column_bits)
+    # The missing seat must have the seats with IDs +8 and -8 present
+    if size < 2 * columns + 1:
+        raise ValueError(f"At least {2 * columns + 1} passes are needed")
+    if size + 1 > seats_count - 2 * columns:
+        raise ValueError(f"{size} passes don't fit into {seats_count} seats")
+
+    rng = random.Random(seed)
+
+    first_id = rng.randint(columns, seats_count - columns - size - 1)
+    seat_ids = list(range(first_id, first_id + size + 1))
+    missing_id = rng.randint(first_id + columns, first_id + size - columns)
+    seat_ids.remove(missing_id)
+
+    rng.shuffle(seat_ids)
+    return ''.join(encode_seat_id(i, row_bits, column_bits) + '\n' for i in seat_ids)
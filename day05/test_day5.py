@@ -1,4 +1,14 @@
-from day5 import decode_seat, Seat
+import io
+import random
+
+import pytest
+
+from day5 import FenwickTree, PlaneGeometry, Seat, SeatOccupancy, SeatStream, decode_seat, decode_seat_ids, \
+    decode_seat_ids_numpy, find_missing_seat_ids, find_missing_seat_ids_numpy, find_missing_seats, parse_input, \
+    part1, part2
+from generate_day5 import generate
+
+EXAMPLE = "FBFBBFFRLR\nBFFFBBFRRR\nFFFBBBFRRR\nBBFFBBFRLL\n"
 
 
 def test_decode_seat():
@@ -6,3 +16,154 @@ def test_decode_seat():
     assert decode_seat("BFFFBBFRRR") == Seat(row=70, column=7)
     assert decode_seat("FFFBBBFRRR") == Seat(row=14, column=7)
     assert decode_seat("BBFFBBFRLL") == Seat(row=102, column=4)
+
+
+def test_decode_seat_ids():
+    assert list(decode_seat_ids(EXAMPLE)) == [357, 567, 119, 820]
+    assert list(decode_seat_ids(" FBFBBFFRLR\r\n\nBFFFBBFRRR ")) == [357, 567]
+    assert list(decode_seat_ids("")) == []
+
+    for invalid in ["FBFBBFFRL\n", "FBFBBFFRLRR\n", "FBFBBFFLRB\n", "FBFBBFFRLR FBFBBFFRLx\n", "FBFBBFF0101\n"]:
+        with pytest.raises(ValueError):
+            decode_seat_ids(invalid)
+
+
+def test_find_missing_seat_ids():
+    content = generate(600, seed=1)
+    seats = [decode_seat(line) for line in content.split()]
+    # parse_input decodes with numpy if it's installed
+    for seat_ids in [parse_input(content), decode_seat_ids(content)]:
+        assert find_missing_seat_ids(seat_ids) == [seat.id for seat in find_missing_seats(seats)]
+        assert part1(seat_ids) == max(seat.id for seat in seats)
+        assert part2(seat_ids) == find_missing_seats(seats)[0].id
+
+    # The free seats need the seats of the same column in the next and the previous rows
+    assert find_missing_seat_ids([1, 17]) == [9]
+    assert find_missing_seat_ids([1, 9, 17]) == []
+    assert find_missing_seat_ids([1, 16]) == []
+    assert find_missing_seat_ids([]) == []
+
+
+def test_numpy():
+    pytest.importorskip('numpy')
+
+    content = generate(600, seed=2)
+    seat_ids = decode_seat_ids_numpy(content)
+    assert seat_ids.tolist() == list(decode_seat_ids(content))
+    assert decode_seat_ids_numpy(content, chunk_size=7).tolist() == seat_ids.tolist()
+    assert find_missing_seat_ids_numpy(seat_ids).tolist() == find_missing_seat_ids(seat_ids.tolist())
+    assert find_missing_seat_ids_numpy(seat_ids[:0]).tolist() == []
+
+    for invalid in ["FBFBBFFRL\n", "FBFBBFFRLRR\n", "FBFBBFFLRB\n", "FBFBBFFRLR FBFBBFFRLx\n"]:
+        with pytest.raises(ValueError):
+            decode_seat_ids_numpy(invalid)
+
+    geometry = PlaneGeometry(row_bits=12, column_bits=5)
+    content = generate(3000, seed=3, row_bits=12, column_bits=5)
+    seat_ids = decode_seat_ids_numpy(content, geometry)
+    assert seat_ids.tolist() == list(decode_seat_ids(content, geometry))
+    assert find_missing_seat_ids_numpy(seat_ids, geometry).tolist() == find_missing_seat_ids(seat_ids, geometry)
+    assert SeatOccupancy.from_seat_ids(seat_ids, geometry).bits == SeatOccupancy.from_seat_ids(
+        seat_ids.tolist(), geometry).bits
+
+
+def test_plane_geometry():
+    geometry = PlaneGeometry(row_bits=12, column_bits=5)
+    content = generate(3000, seed=4, row_bits=12, column_bits=5)
+    seats = [decode_seat(line, geometry) for line in content.split()]
+    seat_ids = decode_seat_ids(content, geometry)
+    assert list(seat_ids) == [seat.id for seat in seats]
+    assert decode_seat("BFFFBRLLR", PlaneGeometry(row_bits=5, column_bits=4)).id == 281
+
+    missing_ids = find_missing_seat_ids(seat_ids, geometry)
+    assert missing_ids == [seat.id for seat in find_missing_seats(seats)]
+    assert len(missing_ids) == 1
+
+    with pytest.raises(ValueError):
+        decode_seat_ids(content)
+
+    wide = PlaneGeometry(row_bits=30, column_bits=6)
+    assert decode_seat_ids("B" * 30 + "R" * 6, wide).tolist() == [2 ** 36 - 1]
+
+    for row_bits, column_bits in [(-1, 3), (7, -1), (60, 5)]:
+        with pytest.raises(ValueError):
+            PlaneGeometry(row_bits=row_bits, column_bits=column_bits)
+
+
+def test_seat_occupancy():
+    geometry = PlaneGeometry(row_bits=4, column_bits=2)
+    occupancy = SeatOccupancy(geometry)
+    assert len(occupancy) == 0 and occupancy.max_id == -1
+    assert occupancy.missing_seat_ids() == []
+
+    for seat_id in [1, 9, 9, 6, 63]:
+        occupancy.add(seat_id)
+    assert len(occupancy) == 4 and occupancy.max_id == 63
+    assert 9 in occupancy and 5 not in occupancy and 64 not in occupancy
+    assert occupancy.missing_seat_ids() == [5]
+
+    occupancy.add(5)
+    assert occupancy.missing_seat_ids() == []
+    occupancy.add_many([57, 55, 53])
+    assert len(occupancy) == 8 and occupancy.max_id == 63
+    assert occupancy.missing_seat_ids() == [59]
+
+    for invalid in [-1, 64]:
+        with pytest.raises(ValueError):
+            occupancy.add(invalid)
+        with pytest.raises(ValueError):
+            occupancy.add_many([invalid])
+
+
+def test_fenwick_tree():
+    rng = random.Random(5)
+    for size in [1, 2, 7, 8, 100]:
+        tree = FenwickTree(size)
+        counts = [0] * size
+        for _ in range(size):
+            position = rng.randrange(size)
+            if not counts[position]:
+                counts[position] = 1
+                tree.add(position)
+
+            for end in range(size + 2):
+                assert tree.prefix_sum(end) == sum(counts[:end])
+            for start in range(-1, size + 2):
+                assert tree.find_zero(start) == next(
+                    (i for i in range(max(start, 0), size) if not counts[i]), None)
+
+
+def test_seat_stream():
+    content = generate(600, seed=6)
+    stream = SeatStream()
+    assert stream.max_id is None
+    assert stream.next_free_seat() == 0
+
+    seat_ids = []
+    for seat_id in stream.add_passes(io.StringIO(content + "\n")):
+        seat_ids.append(seat_id)
+        assert stream.max_id == max(seat_ids)
+    assert seat_ids == list(decode_seat_ids(content))
+    assert len(stream) == 600
+
+    first_id, last_id = min(seat_ids), max(seat_ids)
+    missing_id = part2(seat_ids)
+    assert stream.free_in_range(first_id, last_id) == 1
+    assert stream.free_in_range(0, 1023) == 1024 - 600
+    assert stream.free_in_range(-10, 2000) == 1024 - 600
+    assert stream.occupied_in_range(first_id, last_id) == 600
+    assert stream.occupied_in_range(last_id, first_id) == 0
+    assert stream.next_free_seat(first_id) == missing_id
+    assert stream.next_free_seat(missing_id + 1) == last_id + 1
+    assert stream.next_free_seat(0) == (0 if first_id else last_id + 1)
+
+    assert not stream.add(seat_ids[0])
+    assert stream.add(missing_id)
+    assert stream.free_in_range(first_id, last_id) == 0
+    assert stream.next_free_seat(first_id) == last_id + 1
+
+    full = SeatStream(PlaneGeometry(row_bits=1, column_bits=1))
+    assert list(full.add_passes(["FL", "FR", "BL", "BR"])) == [0, 1, 2, 3]
+    assert full.next_free_seat() is None
+    with pytest.raises(ValueError):
+        full.add_pass("FL BR")
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Set, Union
 
 
 @dataclass
@@ -33,9 +33,12 @@ class GroupAnswers:
         return answered_yes_to
 
 
-def parse_answers(input: str) -> List[GroupAnswers]:
+def parse_answers(input: Union[str, Iterable[str]]) -> List[GroupAnswers]:
+    """
+    :param input: The whole file, or its blank-line-separated blocks.
+    """
     groups = []
-    group_inputs = input.split('\n\n')
+    group_inputs = input.split('\n\n') if isinstance(input, str) else input
     for group_input in group_inputs:
         group = GroupAnswers()
         people_inputs = group_input.strip().split('\n')
@@ -60,14 +63,26 @@ def get_sum_of_everyone_answered_yes_to(groups: List[GroupAnswers]) -> int:
     return sum_of_answers
 
 
+def parse_input(content: str) -> List[GroupAnswers]:
+    return parse_answers(content)
+
+
+def part1(groups: List[GroupAnswers]) -> int:
+    return get_sum_of_anyone_answered_yes_to(groups)
+
+
+def part2(groups: List[GroupAnswers]) -> int:
+    return get_sum_of_everyone_answered_yes_to(groups)
+
+
 def main():
     with open('./input.txt') as f:
-        groups = parse_answers(f.read())
+        groups = parse_input(f.read())
 
-    sum_of_answers_anyone = get_sum_of_anyone_answered_yes_to(groups)
+    sum_of_answers_anyone = part1(groups)
     print(f"Sum of question anyone answered yes to: {sum_of_answers_anyone}")
 
-    sum_of_answers_everyone = get_sum_of_everyone_answered_yes_to(groups)
+    sum_of_answers_everyone = part2(groups)
     print(f"Sum of question everyone answered yes to: {sum_of_answers_everyone}")
 
 
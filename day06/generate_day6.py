@@ -0,0 +1,24 @@
+import random
+import string
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates answers of `size` groups of 1 to 5 people each.
+    """
+    rng = random.Random(seed)
+
+    groups = []
+    for _ in range(size):
+        # Questions most of the group is likely to answer yes to
+        common = rng.sample(string.ascii_lowercase, rng.randint(0, 6))
+        people = []
+        for _ in range(rng.randint(1, 5)):
+            answers = {q for q in common if rng.random() < 0.8}
+            answers |= set(rng.sample(string.ascii_lowercase, rng.randint(0, 4)))
+            if not answers:
+                answers.add(rng.choice(string.ascii_lowercase))
+            people.append(''.join(sorted(answers, key=lambda _: rng.random())))
+        groups.append('\n'.join(people))
+
+    return '\n\n'.join(groups) + '\n'
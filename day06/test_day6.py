@@ -66,6 +66,7 @@ def test_parse_answers():
 
     for input, output in cases:
         assert parse_answers(input) == output
+        assert parse_answers(iter(input.split('\n\n'))) == output
 
 
 def test_get_sum_of_anyone_answered_yes_to():
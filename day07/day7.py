@@ -122,17 +122,28 @@ def timeit():
     print(f"[took {elapsed * 1000:0.2f}ms]")
 
 
+def parse_input(content: str) -> List[Rule]:
+    return [parse_rule(l) for l in content.splitlines() if l.strip()]
+
+
+def part1(rules: List[Rule]) -> int:
+    return len(which_colors_can_contain(rules, 'shiny gold'))
+
+
+def part2(rules: List[Rule]) -> int:
+    return count_bags_inside(rules, 'shiny gold')
+
+
 def main():
     with open('./input.txt') as f:
-        lines = f.readlines()
-        rules = [parse_rule(l) for l in lines]
+        rules = parse_input(f.read())
 
     with timeit():
-        can_contain = which_colors_can_contain(rules, 'shiny gold')
-        print(f"{len(can_contain)} colors can contain shiny gold")
+        can_contain_count = part1(rules)
+        print(f"{can_contain_count} colors can contain shiny gold")
 
     with timeit():
-        inside_count = count_bags_inside(rules, 'shiny gold')
+        inside_count = part2(rules)
         print(f"Shiny gold contains {inside_count} bags inside")
 
 
@@ -0,0 +1,71 @@
+import random
+from typing import List, Set
+
+SYLLABLES = ['ba', 'ce', 'di', 'fo', 'gu', 'ka', 'le', 'mi', 'no', 'pu', 'ra', 'se', 'ti', 'vo', 'zu']
+
+
+def _make_colors(rng: random.Random, count: int) -> List[str]:
+    """
+    Returns `count` unique two-word color names, "shiny gold" among them.
+    """
+    colors: Set[str] = {'shiny gold'}
+    words_len = 2
+    while len(colors) < count:
+        words = [
+            ''.join(rng.choice(SYLLABLES) for _ in range(words_len))
+            for _ in range(2)
+        ]
+        colors.add(' '.join(words))
+        # Make the words longer when the names get crowded
+        if len(colors) > len(SYLLABLES) ** (2 * words_len) // 4:
+            words_len += 1
+
+    colors_list = sorted(colors)
+    rng.shuffle(colors_list)
+    return colors_list
+
+
+def generate(size: int, seed: int = 0, max_contained: int = 3, depth: int = 6) -> str:
+    """
+    Generates `size` bag rules forming a DAG of containment, "shiny gold" among them.
+
+    The colors are split into `depth` layers and each color can only contain
+    colors from the next layer, which keeps the rules acyclic. The number of
+    layers bounds the number of paths through the DAG, which otherwise grows
+    exponentially with the size.
+
+    :param max_contained: The maximum number of different colors a bag can contain.
+    """
+    if size < depth:
+        raise ValueError(f"At least {depth} colors are needed")
+
+    rng = random.Random(seed)
+    colors = _make_colors(rng, size)
+
+    # Shiny gold sits in the middle so that it both contains and is contained
+    gold_index = colors.index('shiny gold')
+    colors[gold_index], colors[size // 2] = colors[size // 2], colors[gold_index]
+
+    layers: List[List[str]] = [[] for _ in range(depth)]
+    for index, color in enumerate(colors):
+        layers[index * depth // size].append(color)
+
+    lines = []
+    for layer_index, layer in enumerate(layers):
+        candidates = layers[layer_index + 1] if layer_index + 1 < depth else []
+        for color in layer:
+            contained = rng.sample(candidates, min(len(candidates), rng.randint(0, max_contained)))
+            if color == 'shiny gold' and candidates and not contained:
+                contained = [candidates[0]]
+
+            if contained:
+                contents = []
+                for contained_color in contained:
+                    quantity = rng.randint(1, 5)
+                    contents.append(f"{quantity} {contained_color} {'bag' if quantity == 1 else 'bags'}")
+                lines.append(f"{color} bags contain {', '.join(contents)}.\n")
+            else:
+                lines.append(f"{color} bags contain no other bags.\n")
+
+    rng.shuffle(lines)
+    return ''.join(lines)
@@ -114,15 +114,17 @@ def iter_flipped_nop_jmp(program: List[Op]) -> Iterator[List[Op]]:
             pass
 
 
-def main():
-    with open('./input.txt') as f:
-        lines = f.readlines()
-        program = [parse_op(line) for line in lines]
+def parse_input(content: str) -> List[Op]:
+    return [parse_op(line) for line in content.splitlines() if line.strip()]
+
 
+def part1(program: List[Op]) -> int:
     vm = VM()
     vm.execute(program)
-    print(f"Accumulator before the loop: {vm.accumulator}")
+    return vm.accumulator
 
+
+def part2(program: List[Op]) -> int:
     for mutated_program in iter_flipped_nop_jmp(program):
         vm = VM()
         try:
@@ -131,7 +133,17 @@ def main():
             # Skip this one, we're searching for the program without loops
             continue
 
-        print(f"Found a modification without a loop, accumulator: {vm.accumulator}")
+        return vm.accumulator
+
+    raise ValueError("Every modification of the program loops")
+
+
+def main():
+    with open('./input.txt') as f:
+        program = parse_input(f.read())
+
+    print(f"Accumulator before the loop: {part1(program)}")
+    print(f"Found a modification without a loop, accumulator: {part2(program)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+import random
+from typing import List
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates a program of `size` operations which loops, and which can be fixed
+    by flipping exactly one jmp or nop.
+
+    The program is built so that the fix is unique:
+    * every operation but one moves forward and never jumps past the looping jmp,
+    * the looping jmp jumps back to an already executed operation,
+    * every nop has the operand of +0, so flipping it into a jmp loops right away.
+    """
+    if size < 3:
+        raise ValueError("At least 3 operations are needed")
+
+    rng = random.Random(seed)
+
+    # The looping jmp is close to the end so that most of the program runs
+    loop_index = rng.randint(size * 3 // 4, size - 1) if size > 4 else size - 1
+    ops: List[str] = [''] * size
+
+    for index in range(size):
+        if index == loop_index:
+            continue
+
+        # Jumps before the loop must not skip it
+        limit = loop_index if index < loop_index else size
+        kind = rng.random()
+        if kind < 0.5 or index + 1 >= limit:
+            ops[index] = f"acc {rng.randint(-50, 50):+d}"
+        elif kind < 0.7:
+            ops[index] = "nop +0"
+        else:
+            ops[index] = f"jmp {rng.randint(1, min(limit - index, 8)):+d}"
+
+    # Find the operations executed before reaching the looping jmp
+    executed = []
+    pointer = 0
+    while pointer < loop_index:
+        executed.append(pointer)
+        opcode, operand = ops[pointer].split()
+        pointer += int(operand) if opcode == 'jmp' else 1
+
+    target = rng.choice(executed) if executed else loop_index
+    ops[loop_index] = f"jmp {target - loop_index:+d}"
+
+    return ''.join(op + '\n' for op in ops)
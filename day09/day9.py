@@ -51,18 +51,26 @@ def find_contiguous_sum(seq: List[int], target: int) -> List[int]:
     raise ValueError("Could not find contiguous sum")
 
 
-def main():
-    with open('./input.txt') as f:
-        lines = f.readlines()
-        numbers = [int(l.strip()) for l in lines]
+def parse_input(content: str) -> List[int]:
+    return [int(l.strip()) for l in content.splitlines() if l.strip()]
+
 
-    first_invalid = find_first_invalid_number(numbers, 25)
-    print(f"First invalid number: {first_invalid}")
+def part1(numbers: List[int], lookbehind: int = 25) -> int:
+    return find_first_invalid_number(numbers, lookbehind)
 
+
+def part2(numbers: List[int], lookbehind: int = 25) -> int:
+    first_invalid = find_first_invalid_number(numbers, lookbehind)
     cont_sum = find_contiguous_sum(numbers, first_invalid)
-    cont_sum.sort()
-    weakness = cont_sum[0] + cont_sum[-1]
-    print(f"The encryption weakness: {weakness}")
+    return min(cont_sum) + max(cont_sum)
+
+
+def main():
+    with open('./input.txt') as f:
+        numbers = parse_input(f.read())
+
+    print(f"First invalid number: {part1(numbers)}")
+    print(f"The encryption weakness: {part2(numbers)}")
 
 
 if __name__ == "__main__":
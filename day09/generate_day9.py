@@ -0,0 +1,43 @@
+import random
+from typing import List
+
+
+def _is_sum_of_two(number: int, pool: List[int]) -> bool:
+    pool_set = set(pool)
+    return any(number - n != n and number - n in pool_set for n in pool_set)
+
+
+def generate(size: int, seed: int = 0, lookbehind: int = 25) -> str:
+    """
+    Generates an XMAS stream of `size` numbers with one planted invalid number
+    at the very end.
+
+    Every number after the preamble but the last one is a sum of two different
+    numbers among the previous `lookbehind`. The last number is the sum of
+    a contiguous range from the middle of the stream, so finding the encryption
+    weakness has to scan half of the stream.
+
+    The numbers must be positive and each of them is larger than the numbers
+    it's made of, so they grow exponentially along the stream. To slow
+    the growth down each number is made from the smallest numbers available.
+    """
+    if size < lookbehind + 4:
+        raise ValueError(f"At least {lookbehind + 4} numbers are needed")
+
+    rng = random.Random(seed)
+
+    seq = rng.sample(range(1, 4 * lookbehind), lookbehind)
+    while len(seq) < size - 1:
+        window = sorted(set(seq[-lookbehind:]))
+        summand1, summand2 = rng.sample(window[:4], 2)
+        seq.append(summand1 + summand2)
+
+    while True:
+        start = rng.randint(max(lookbehind, size // 3), (size - 1) // 2)
+        end = rng.randint(start + 2, min(start + 20, size - 1))
+        invalid = sum(seq[start:end])
+        if not _is_sum_of_two(invalid, seq[-lookbehind:]):
+            break
+
+    seq.append(invalid)
+    return ''.join(f"{n}\n" for n in seq)
@@ -107,16 +107,28 @@ def count_adapter_arrangements(seq: List[int]) -> int:
     return _count_adapter_arrangements(seq)
 
 
+def parse_input(content: str) -> List[int]:
+    return [int(l.strip()) for l in content.splitlines() if l.strip()]
+
+
+def part1(numbers: List[int]) -> int:
+    diff_count = count_jolt_diffs(numbers)
+    return diff_count[1] * diff_count[3]
+
+
+def part2(numbers: List[int]) -> int:
+    return count_adapter_arrangements(numbers)
+
+
 def main():
     with open('./input.txt') as f:
-        lines = f.readlines()
-        numbers = [int(l.strip()) for l in lines]
+        numbers = parse_input(f.read())
 
     diff_count = count_jolt_diffs(numbers)
     print(f"Diff counts: {diff_count}")
-    print(f"Part 1 answer: {diff_count[1] * diff_count[3]}")
+    print(f"Part 1 answer: {part1(numbers)}")
 
-    arrangements_count = count_adapter_arrangements(numbers)
+    arrangements_count = part2(numbers)
     print(f"Possible arrangements: {arrangements_count}")
 
 
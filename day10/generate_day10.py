@@ -0,0 +1,18 @@
+import random
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates `size` adapters which can all be chained together.
+    The differences between consecutive joltages are 1, 2 or 3.
+    """
+    rng = random.Random(seed)
+
+    joltages = []
+    joltage = 0
+    for _ in range(size):
+        joltage += rng.choice([1, 1, 1, 2, 3, 3])
+        joltages.append(joltage)
+
+    rng.shuffle(joltages)
+    return ''.join(f"{j}\n" for j in joltages)
@@ -237,17 +237,24 @@ def advance_until_stable2(area: Area) -> Area:
         area = new_area
 
 
+def parse_input(content: str) -> Area:
+    return parse_area(content)
+
+
+def part1(area: Area) -> int:
+    return count_occupied_seats(advance_until_stable(area))
+
+
+def part2(area: Area) -> int:
+    return count_occupied_seats(advance_until_stable2(area))
+
+
 def main():
     with open('./input.txt') as f:
-        area = parse_area(f.read())
-
-    final_area = advance_until_stable(area)
-    final_occ_seats = count_occupied_seats(final_area)
-    print(f"Occupied seats: {final_occ_seats}")
+        area = parse_input(f.read())
 
-    final_area = advance_until_stable2(area)
-    final_occ_seats = count_occupied_seats(final_area)
-    print(f"Occupied seats (part 2): {final_occ_seats}")
+    print(f"Occupied seats: {part1(area)}")
+    print(f"Occupied seats (part 2): {part2(area)}")
 
 
 if __name__ == "__main__":
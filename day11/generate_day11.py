@@ -0,0 +1,17 @@
+import random
+from typing import Optional
+
+
+def generate(size: int, seed: int = 0, width: Optional[int] = None, floor_density: float = 0.15) -> str:
+    """
+    Generates a waiting area of `size` rows and `width` columns with all seats empty.
+    The width defaults to the size, making the area square.
+    """
+    rng = random.Random(seed)
+    width = width or size
+
+    lines = []
+    for _ in range(size):
+        lines.append(''.join('.' if rng.random() < floor_density else 'L' for _ in range(width)) + '\n')
+
+    return ''.join(lines)
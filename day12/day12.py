@@ -1,5 +1,6 @@
 from dataclasses import dataclass, replace
 from enum import Enum
+from typing import List
 
 
 class CmdCode(Enum):
@@ -138,24 +139,32 @@ def move_waypoint_ship(ws: WaypointShip, cmd: Command) -> WaypointShip:
     return ws
 
 
-def main():
-    with open('./input.txt') as f:
-        lines = f.readlines()
-        commands = [parse_command(l) for l in lines]
+def parse_input(content: str) -> List[Command]:
+    return [parse_command(l.strip()) for l in content.splitlines() if l.strip()]
+
 
+def part1(commands: List[Command]) -> int:
     ship = Ship()
     for cmd in commands:
         ship = move_ship(ship, cmd)
 
-    manhattan_distance = abs(ship.north) + abs(ship.east)
-    print(f"Manhattan distance: {manhattan_distance}")
+    return abs(ship.north) + abs(ship.east)
 
+
+def part2(commands: List[Command]) -> int:
     ws = WaypointShip()
     for cmd in commands:
         ws = move_waypoint_ship(ws, cmd)
 
-    manhattan_distance = abs(ws.ship_north) + abs(ws.ship_east)
-    print(f"Manhattan distance with waypoint: {manhattan_distance}")
+    return abs(ws.ship_north) + abs(ws.ship_east)
+
+
+def main():
+    with open('./input.txt') as f:
+        commands = parse_input(f.read())
+
+    print(f"Manhattan distance: {part1(commands)}")
+    print(f"Manhattan distance with waypoint: {part2(commands)}")
 
 
 if __name__ == "__main__":
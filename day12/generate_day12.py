@@ -0,0 +1,19 @@
+import random
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates `size` navigation instructions.
+    """
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(size):
+        action = rng.choice('NSEWLRFFF')
+        if action in 'LR':
+            value = rng.choice([90, 180, 270])
+        else:
+            value = rng.randint(1, 100)
+        lines.append(f"{action}{value}\n")
+
+    return ''.join(lines)
@@ -134,17 +134,34 @@ def find_magic_departure_time(buses: List[Bus]) -> int:
     return _find_rec(0, buses[0].id, buses[1:])
 
 
+def parse_input(content: str) -> Tuple[int, List[Bus]]:
+    """
+    Returns the earliest departure time and the list of buses.
+    """
+    lines = content.splitlines()
+    return int(lines[0].strip()), parse_buses(lines[1])
+
+
+def part1(notes: Tuple[int, List[Bus]]) -> int:
+    departure_time_after, buses = notes
+    departure_time, next_bus = find_next_bus(buses, departure_time_after)
+    return (departure_time - departure_time_after) * next_bus.id
+
+
+def part2(notes: Tuple[int, List[Bus]]) -> int:
+    _, buses = notes
+    return find_magic_departure_time(buses)
+
+
 def main():
     with open('./input.txt') as f:
-        lines = f.readlines()
-        departure_time_after = int(lines[0].strip())
-        buses = parse_buses(lines[1])
+        departure_time_after, buses = parse_input(f.read())
 
     departure_time, next_bus = find_next_bus(buses, departure_time_after)
     print(f"The next bus is {next_bus.id}, departs at {departure_time}")
-    print(f"Part 1 answer: {(departure_time - departure_time_after) * next_bus.id}")
+    print(f"Part 1 answer: {part1((departure_time_after, buses))}")
 
-    magic_time = find_magic_departure_time(buses)
+    magic_time = part2((departure_time_after, buses))
     print(f"Part 2 departure time: {magic_time}")
 
 
@@ -0,0 +1,42 @@
+import random
+from typing import List
+
+
+def _primes(count: int, start: int) -> List[int]:
+    """
+    Returns `count` consecutive primes starting from `start`.
+    """
+    primes = []
+    candidate = max(start, 2)
+    while len(primes) < count:
+        if all(candidate % d != 0 for d in range(2, int(candidate ** 0.5) + 1)):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def generate(size: int, seed: int = 0, in_service_ratio: float = 0.3) -> str:
+    """
+    Generates notes with a schedule of `size` bus slots.
+
+    Bus IDs are distinct primes, so that the magic departure time always exists.
+    The first slot always has a bus in service.
+    """
+    if size < 2:
+        raise ValueError("At least 2 bus slots are needed")
+
+    rng = random.Random(seed)
+
+    in_service = [True] + [rng.random() < in_service_ratio for _ in range(size - 1)]
+    if not any(in_service[1:]):
+        in_service[-1] = True
+
+    bus_ids = _primes(sum(in_service) * 2, start=13)
+    rng.shuffle(bus_ids)
+
+    slots = []
+    for is_in_service in in_service:
+        slots.append(str(bus_ids.pop()) if is_in_service else 'x')
+
+    earliest_departure = rng.randint(100_000, 10_000_000)
+    return f"{earliest_departure}\n{','.join(slots)}\n"
@@ -150,24 +150,32 @@ def parse_instruction(line: str) -> Instruction:
     raise ValueError(f"Invalid instruction {line!r}")
 
 
-def main():
-    with open("./input.txt") as f:
-        lines = f.readlines()
-        program = [parse_instruction(line) for line in lines]
+def parse_input(content: str) -> List[Instruction]:
+    return [parse_instruction(line) for line in content.splitlines() if line.strip()]
+
 
+def part1(program: List[Instruction]) -> int:
     vm = VM()
     for instruction in program:
         instruction.execute(vm)
 
-    memory_values_sum = sum(vm.memory.values())
-    print(f"Some of values in memory: {memory_values_sum}")
+    return sum(vm.memory.values())
 
+
+def part2(program: List[Instruction]) -> int:
     vm = VM()
     for instruction in program:
         instruction.execute_v2(vm)
 
-    memory_values_sum = sum(vm.memory.values())
-    print(f"Some of values in memory (v2): {memory_values_sum}")
+    return sum(vm.memory.values())
+
+
+def main():
+    with open("./input.txt") as f:
+        program = parse_input(f.read())
+
+    print(f"Some of values in memory: {part1(program)}")
+    print(f"Some of values in memory (v2): {part2(program)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import random
+
+
+def generate(size: int, seed: int = 0, max_floating: int = 9) -> str:
+    """
+    Generates an initialization program of `size` instructions.
+
+    :param max_floating: The maximum number of X bits in a mask. The second part
+        writes 2 ** X memory cells per instruction.
+    """
+    rng = random.Random(seed)
+
+    lines = []
+    for index in range(size):
+        if index == 0 or rng.random() < 0.2:
+            floating = set(rng.sample(range(36), rng.randint(0, max_floating)))
+            mask = ''.join('X' if bit in floating else rng.choice('01') for bit in range(36))
+            lines.append(f"mask = {mask}\n")
+        else:
+            lines.append(f"mem[{rng.randint(0, 65535)}] = {rng.randint(0, 2 ** 30)}\n")
+
+    return ''.join(lines)
@@ -37,14 +37,27 @@ def play_numbers_game(starting_numbers: List[int], end_at: int) -> int:
     return last_number
 
 
-def main():
-    starting_numbers = [8, 13, 1, 0, 18, 9]
+def parse_input(content: str) -> List[int]:
+    """
+    parse_input("8,13,1,0,18,9")  # => [8, 13, 1, 0, 18, 9]
+    """
+    return [int(n) for n in content.strip().split(',')]
+
+
+def part1(starting_numbers: List[int]) -> int:
+    return play_numbers_game(starting_numbers, 2020)
+
 
-    number_2020 = play_numbers_game(starting_numbers, 2020)
-    print(f"2020th number: {number_2020}")
+def part2(starting_numbers: List[int]) -> int:
+    return play_numbers_game(starting_numbers, 30_000_000)
+
+
+def main():
+    with open('./input.txt') as f:
+        starting_numbers = parse_input(f.read())
 
-    number_30000000 = play_numbers_game(starting_numbers, 30_000_000)
-    print(f"30000000th number: {number_30000000}")
+    print(f"2020th number: {part1(starting_numbers)}")
+    print(f"30000000th number: {part2(starting_numbers)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+import random
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates `size` distinct starting numbers.
+    """
+    rng = random.Random(seed)
+    numbers = rng.sample(range(max(size * 3, 20)), size)
+    return ','.join(str(n) for n in numbers) + '\n'
@@ -161,19 +161,31 @@ def determine_field_order(fields: List[Field], tickets: List[Ticket]) -> List[Fi
     return ordered_fields
 
 
-def main():
-    with open('./input.txt') as f:
-        fields, your_ticket, nearby_tickets = parse_notes(f.read())
+def parse_input(content: str) -> Tuple[List[Field], Ticket, List[Ticket]]:
+    return parse_notes(content)
+
 
-    invalid_values = find_invalid_values(fields, nearby_tickets)
-    print(f"Sum of invalid values: {sum(invalid_values)}")
+def part1(notes: Tuple[List[Field], Ticket, List[Ticket]]) -> int:
+    fields, _, nearby_tickets = notes
+    return sum(find_invalid_values(fields, nearby_tickets))
 
+
+def part2(notes: Tuple[List[Field], Ticket, List[Ticket]]) -> int:
+    fields, your_ticket, nearby_tickets = notes
     ordered_fields = determine_field_order(fields, nearby_tickets)
     answer_mult = 1
     for index, f in enumerate(ordered_fields):
         if f.name.startswith("departure"):
             answer_mult *= your_ticket.numbers[index]
-    print(f"Multiplication of the departure field values: {answer_mult}")
+    return answer_mult
+
+
+def main():
+    with open('./input.txt') as f:
+        notes = parse_input(f.read())
+
+    print(f"Sum of invalid values: {part1(notes)}")
+    print(f"Multiplication of the departure field values: {part2(notes)}")
 
 
 if __name__ == "__main__":
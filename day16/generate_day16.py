@@ -0,0 +1,64 @@
+import random
+from typing import List
+
+FIELD_NAMES = [
+    'departure location', 'departure station', 'departure platform',
+    'departure track', 'departure date', 'departure time',
+    'arrival location', 'arrival station', 'arrival platform', 'arrival track',
+    'class', 'duration', 'price', 'route', 'row', 'seat', 'train', 'type',
+    'wagon', 'zone',
+]
+
+
+def _field_names(count: int) -> List[str]:
+    names = FIELD_NAMES[:count]
+    for index in range(len(names), count):
+        names.append(f"extra field {index}")
+    return names
+
+
+def generate(size: int, seed: int = 0, fields_count: int = 20, invalid_ratio: float = 0.25) -> str:
+    """
+    Generates notes with `size` nearby tickets of `fields_count` fields.
+
+    The field order can be determined in a unique way. The values are split into
+    blocks, one per field. The k-th field accepts values from the k-th block and
+    all the blocks after it. The values of the field at the k-th position are taken
+    from the k-th block only. Thus the position of the first field only matches
+    the first field, the position of the second field matches the first two fields
+    and so on. Values below the first block are invalid for every field.
+    """
+    if size < 1:
+        raise ValueError("At least 1 nearby ticket is needed")
+
+    rng = random.Random(seed)
+    block = 50
+
+    # Field ranks define which block each field's values come from
+    names = _field_names(fields_count)
+    # The order of the fields in the ticket
+    positions = list(range(fields_count))
+    rng.shuffle(positions)
+
+    lines = []
+    for rank, name in enumerate(names):
+        lower = (rank + 1) * block
+        upper = (fields_count + 1) * block - 1
+        split = rng.randint(lower, upper - 1)
+        lines.append(f"{name}: {lower}-{split} or {split + 1}-{upper}\n")
+
+    def make_ticket(invalid: bool) -> str:
+        values = [rng.randint((rank + 1) * block, (rank + 2) * block - 1) for rank in positions]
+        if invalid:
+            values[rng.randrange(fields_count)] = rng.randint(0, block - 1)
+        return ','.join(str(v) for v in values) + '\n'
+
+    lines.append('\nyour ticket:\n')
+    lines.append(make_ticket(invalid=False))
+
+    lines.append('\nnearby tickets:\n')
+    for index in range(size):
+        # The first ticket is always valid so that the field order can be determined
+        lines.append(make_ticket(invalid=index > 0 and rng.random() < invalid_ratio))
+
+    return ''.join(lines)
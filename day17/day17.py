@@ -132,21 +132,30 @@ def parse_pocket_dim4(content: str) -> PocketDim4:
     return PocketDim4(active_cubes)
 
 
-def main():
-    with open('./input.txt') as f:
-        contents = f.read()
-        original_dim = parse_pocket_dim(contents)
-        original_dim4 = parse_pocket_dim4(contents)
+def parse_input(content: str) -> Tuple[PocketDim, PocketDim4]:
+    return parse_pocket_dim(content), parse_pocket_dim4(content)
+
 
-    dim = original_dim
+def part1(dims: Tuple[PocketDim, PocketDim4]) -> int:
+    dim, _ = dims
     for i in range(6):
         dim = dim.step()
-    print(f"Active cubes after 6 steps: {len(dim.active_cubes)}")
+    return len(dim.active_cubes)
 
-    dim4 = original_dim4
+
+def part2(dims: Tuple[PocketDim, PocketDim4]) -> int:
+    _, dim4 = dims
     for i in range(6):
         dim4 = dim4.step()
-    print(f"Active hyper-cubes after 6 steps: {len(dim4.active_cubes)}")
+    return len(dim4.active_cubes)
+
+
+def main():
+    with open('./input.txt') as f:
+        dims = parse_input(f.read())
+
+    print(f"Active cubes after 6 steps: {part1(dims)}")
+    print(f"Active hyper-cubes after 6 steps: {part2(dims)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,14 @@
+import random
+
+
+def generate(size: int, seed: int = 0, density: float = 0.4) -> str:
+    """
+    Generates the initial `size` x `size` slice of the pocket dimension.
+    """
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(size):
+        lines.append(''.join('#' if rng.random() < density else '.' for _ in range(size)) + '\n')
+
+    return ''.join(lines)
@@ -294,15 +294,26 @@ class Parser:
         return self.parse_expr(self.tokenize(line)).eval()
 
 
+def parse_input(content: str) -> List[str]:
+    return [l.strip() for l in content.splitlines() if l.strip()]
+
+
+def part1(lines: List[str]) -> int:
+    parser = Parser()
+    return sum(parser.evaluate(line) for line in lines)
+
+
+def part2(lines: List[str]) -> int:
+    parser = Parser(precedence=Precedence.ADDITION_FIRST)
+    return sum(parser.evaluate(line) for line in lines)
+
+
 def main():
     with open('./input.txt') as f:
-        lines = [l.strip() for l in f.readlines()]
-
-    values = [Parser().evaluate(line) for line in lines]
-    print(f"Sum of results: {sum(values)}")
+        lines = parse_input(f.read())
 
-    values = [Parser(precedence=Precedence.ADDITION_FIRST).evaluate(line) for line in lines]
-    print(f"Sum of results (part 2): {sum(values)}")
+    print(f"Sum of results: {part1(lines)}")
+    print(f"Sum of results (part 2): {part2(lines)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import random
+from typing import Optional
+
+
+def _make_expr(rng: random.Random, depth: int, operands_count: Optional[int] = None) -> str:
+    operands = []
+    for _ in range(operands_count or rng.randint(2, 6)):
+        if depth > 0 and rng.random() < 0.3:
+            operands.append(f"({_make_expr(rng, depth - 1)})")
+        else:
+            operands.append(str(rng.randint(1, 9)))
+
+    expr = operands[0]
+    for operand in operands[1:]:
+        expr += f" {rng.choice('+*')} {operand}"
+    return expr
+
+
+def generate(size: int, seed: int = 0, max_depth: int = 3, operands: Optional[int] = None) -> str:
+    """
+    Generates `size` expressions with parentheses nested up to `max_depth` levels.
+
+    :param operands: The number of top-level operands in each expression.
+        Random from 2 to 6 by default.
+    """
+    rng = random.Random(seed)
+    return ''.join(_make_expr(rng, max_depth, operands) + '\n' for _ in range(size))
@@ -204,33 +204,49 @@ def is_valid(rule: Rule, line: str) -> bool:
     return "" in remainders
 
 
-def main():
-    with open('./input.txt') as f:
-        content = f.read()
-        rules_content, values_content = content.split('\n\n')
+@dataclass
+class Puzzle:
+    """
+    The parsed puzzle input.
+
+    :ivar rule_texts: The rule texts, as returned by split_rule_texts.
+    :ivar rules: The parsed rules, as returned by parse_rule_texts.
+    :ivar values: The values to be validated against the rule 0.
+    """
+    rule_texts: Dict[int, str]
+    rules: Dict[int, Rule]
+    values: List[str]
 
+
+def parse_input(content: str) -> Puzzle:
+    rules_content, values_content = content.split('\n\n')
     rule_texts = split_rule_texts(rules_content)
-    rules = parse_rule_texts(rule_texts)
-    values = values_content.splitlines()
+    return Puzzle(
+        rule_texts=rule_texts,
+        rules=parse_rule_texts(rule_texts),
+        values=values_content.splitlines(),
+    )
+
 
-    valid_values = []
-    for value in values:
-        if is_valid(rules[0], value):
-            valid_values.append(value)
+def part1(puzzle: Puzzle) -> int:
+    return sum(1 for value in puzzle.values if is_valid(puzzle.rules[0], value))
 
-    print(f"Valid values: {len(valid_values)}")
 
-    rec_rule_texts = rule_texts.copy()
+def part2(puzzle: Puzzle) -> int:
+    rec_rule_texts = puzzle.rule_texts.copy()
     rec_rule_texts[8] = '42 | 42 8'
     rec_rule_texts[11] = '42 31 | 42 11 31'
     rec_rules = parse_rule_texts(rec_rule_texts)
 
-    valid_values = []
-    for value in values:
-        if is_valid(rec_rules[0], value):
-            valid_values.append(value)
+    return sum(1 for value in puzzle.values if is_valid(rec_rules[0], value))
+
+
+def main():
+    with open('./input.txt') as f:
+        puzzle = parse_input(f.read())
 
-    print(f"Valid values: {len(valid_values)}")
+    print(f"Valid values: {part1(puzzle)}")
+    print(f"Valid values: {part2(puzzle)}")
 
 
 if __name__ == "__main__":
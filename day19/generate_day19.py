@@ -0,0 +1,77 @@
+import itertools
+import random
+from typing import Callable, Dict, Iterator, List
+
+
+def generate(size: int, seed: int = 0, chunk_len: int = 5) -> str:
+    """
+    Generates rules shaped like the puzzle's ones and `size` messages.
+
+    Rule 0 is "8 11", rule 8 is "42" and rule 11 is "42 31", so the rules can be
+    turned into the recursive ones of the second part. Rules 42 and 31 match
+    disjoint sets of strings of `chunk_len` characters. Both sets are described
+    by a trie of rules, one rule per trie node.
+
+    Messages are a mix of ones valid in both parts, ones valid only in the second
+    part and invalid ones.
+    """
+    rng = random.Random(seed)
+
+    # Randomly assign every chunk either to rule 42 or to rule 31
+    chunks = [''.join(c) for c in itertools.product('ab', repeat=chunk_len)]
+    rng.shuffle(chunks)
+    split = rng.randint(1, len(chunks) - 1)
+    chunks42 = chunks[:split]
+    chunks31 = chunks[split:]
+
+    rule_texts: Dict[int, str] = {0: '8 11', 8: '42', 11: '42 31'}
+    reserved = {0, 8, 11, 42, 31}
+    free_numbers: Iterator[int] = (n for n in itertools.count(1) if n not in reserved)
+    char_rules = {'a': next(free_numbers), 'b': next(free_numbers)}
+    for char, number in char_rules.items():
+        rule_texts[number] = f'"{char}"'
+
+    def add_trie_rule(number: int, suffixes: List[str]) -> None:
+        """
+        Adds a rule which matches exactly the given suffixes of the same length.
+        """
+        subrules = []
+        for char in 'ab':
+            char_suffixes = [s[1:] for s in suffixes if s[0] == char]
+            if not char_suffixes:
+                continue
+
+            if char_suffixes == ['']:
+                subrules.append(str(char_rules[char]))
+            else:
+                subrule_number = next(free_numbers)
+                add_trie_rule(subrule_number, char_suffixes)
+                subrules.append(f"{char_rules[char]} {subrule_number}")
+
+        rule_texts[number] = ' | '.join(subrules)
+
+    add_trie_rule(42, chunks42)
+    add_trie_rule(31, chunks31)
+
+    def make_message(count42: int, count31: int) -> str:
+        return ''.join(
+            [rng.choice(chunks42) for _ in range(count42)]
+            + [rng.choice(chunks31) for _ in range(count31)]
+        )
+
+    make_kinds: List[Callable[[], str]] = [
+        # Valid in both parts
+        lambda: make_message(2, 1),
+        # Valid in the second part only
+        lambda: make_message(rng.randint(3, 6), 1),
+        lambda: make_message(rng.randint(3, 6), 2),
+        # Invalid in both parts
+        lambda: make_message(1, 2),
+        lambda: make_message(2, 0),
+        lambda: ''.join(rng.choice('ab') for _ in range(rng.randint(1, 6 * chunk_len))),
+    ]
+    messages = [rng.choice(make_kinds)() for _ in range(size)]
+
+    rule_lines = [f"{number}: {text}\n" for number, text in rule_texts.items()]
+    rng.shuffle(rule_lines)
+    return ''.join(rule_lines) + '\n' + ''.join(m + '\n' for m in messages)
@@ -1,6 +1,7 @@
+import math
 import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 
 @dataclass(frozen=True)
@@ -125,23 +126,51 @@ def parse_tile(content: str) -> Tuple[int, TileContent]:
     return number, TileContent(tile_lines)
 
 
-def read_tiles(path: str) -> Dict[int, TileContent]:
+def parse_tiles(content: Union[str, Iterable[str]]) -> Dict[int, TileContent]:
     """
-    Opens the file and reads tiles from it using parse_tile.
+    Parses tiles from the text using parse_tile.
     Each tile must be separated from other by an empty line.
 
+    :param content: The text, or the tiles' texts.
     :returns: A dictionary that maps each tile's number to its content.
     """
-    with open(path) as f:
-        tile_texts = f.read().split('\n\n')
-        tiles = {}
-        for tile_text in tile_texts:
-            number, content = parse_tile(tile_text)
-            tiles[number] = content
+    tile_texts = content.strip().split('\n\n') if isinstance(content, str) else content
+
+    tiles = {}
+    for tile_text in tile_texts:
+        number, tile_content = parse_tile(tile_text)
+        tiles[number] = tile_content
 
     return tiles
 
 
+def _iter_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Groups the lines into the blocks separated by blank lines.
+    """
+    block: List[str] = []
+    for line in lines:
+        if line.strip():
+            block.append(line.rstrip('\r\n'))
+        elif block:
+            yield '\n'.join(block)
+            block = []
+
+    if block:
+        yield '\n'.join(block)
+
+
+def read_tiles(path: str) -> Dict[int, TileContent]:
+    """
+    Opens the file and reads tiles from it using parse_tiles.
+    The file is read line by line, so its whole text is never kept in memory.
+
+    :returns: A dictionary that maps each tile's number to its content.
+    """
+    with open(path) as f:
+        return parse_tiles(_iter_blocks(f))
+
+
 def iter_tile_variations(c: TileContent) -> Iterator[TileContent]:
     """
     Given a tile content iterates over all 8 possible transformations of it
@@ -401,7 +430,12 @@ class Solution:
         ]
 
 
-def arrange_tiles(width: int, height: int, tiles: Dict[int, TileContent]) -> Solution:
+def arrange_tiles(
+            width: int,
+            height: int,
+            tiles: Dict[int, TileContent],
+            edge_index: Optional[EdgeIndex] = None,
+        ) -> Solution:
     """
     Finds the matching grid of tiles. In the found 2d grid all touching tile
     edges are equal.
@@ -409,11 +443,13 @@ def arrange_tiles(width: int, height: int, tiles: Dict[int, TileContent]) -> Sol
     :param width: The width of the grid in tiles.
     :param height: The height of the grid in tiles.
     :param tiles: A dict that maps a tile's number to its content.
+    :param edge_index: The index of the tiles, as returned by index_edges.
+        Built from the tiles if not given.
     """
     tiles = _find_solution_tiles(
         width=width,
         height=height,
-        edge_index=index_edges(tiles),
+        edge_index=edge_index or index_edges(tiles),
     )
     return Solution(width=width, height=height, tiles=tiles)
 
@@ -590,10 +626,63 @@ def find_sea_monsters(tile: TileContent) -> Tuple[int, Set[Tuple[int, int]]]:
     return found_monsters, monster_pixels
 
 
+def arrange_square(tiles: Dict[int, TileContent], edge_index: Optional[EdgeIndex] = None) -> Solution:
+    """
+    Finds the matching square grid of tiles, deducing its side from the number of tiles.
+
+    :param edge_index: The index of the tiles, see arrange_tiles.
+    :raises ValueError: If the tiles cannot form a square.
+    """
+    side = math.isqrt(len(tiles))
+    if side * side != len(tiles):
+        raise ValueError(f"{len(tiles)} tiles cannot be arranged into a square")
+
+    return arrange_tiles(side, side, tiles, edge_index)
+
+
+def get_water_roughness(solution: Solution) -> int:
+    """
+    Returns the number of set pixels in the solution's image which are not a part
+    of any sea monster.
+    """
+    image_tile = into_one_tile_image(solution)
+    found_monsters, monster_pixels = find_sea_monsters(image_tile)
+    total_pixels_count = len(into_lookup_image(image_tile).set_pixels)
+    return total_pixels_count - len(monster_pixels)
+
+
+@dataclass
+class Puzzle:
+    """
+    The parsed puzzle input.
+
+    :ivar tiles: A dict that maps a tile's number to its content.
+    :ivar edge_index: The index of the tiles, as returned by index_edges.
+    """
+    tiles: Dict[int, TileContent]
+    edge_index: EdgeIndex
+
+
+def parse_input(content: str) -> Puzzle:
+    tiles = parse_tiles(content)
+    return Puzzle(tiles=tiles, edge_index=index_edges(tiles))
+
+
+def part1(puzzle: Puzzle) -> int:
+    corner_product = 1
+    for corner_number in arrange_square(puzzle.tiles, puzzle.edge_index).corner_tile_numbers:
+        corner_product *= corner_number
+    return corner_product
+
+
+def part2(puzzle: Puzzle) -> int:
+    return get_water_roughness(arrange_square(puzzle.tiles, puzzle.edge_index))
+
+
 def main():
     tiles = read_tiles('./input.txt')
 
-    solution = arrange_tiles(12, 12, tiles)
+    solution = arrange_square(tiles)
     print(format_solution(solution))
 
     corner_product = 1
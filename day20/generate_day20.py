@@ -0,0 +1,125 @@
+import math
+import random
+from typing import List, Optional, Set
+
+from day20 import TileContent, get_sea_monster_pattern_pixels, iter_tile_variations
+
+
+class _EdgesExhaustedError(Exception):
+    pass
+
+
+def _pick_edge(rng: random.Random, first: str, last: str, length: int, used: Set[str]) -> str:
+    """
+    Picks an edge with the given end pixels which is not a palindrome, and which
+    neither equals any used edge nor its reverse. Marks it as used.
+
+    :raises _EdgesExhaustedError: If such an edge cannot be found quickly.
+    """
+    for _ in range(200):
+        middle = ''.join(rng.choice('#.') for _ in range(length - 2))
+        edge = first + middle + last
+        reversed_edge = edge[::-1]
+        if edge != reversed_edge and edge not in used and reversed_edge not in used:
+            used.add(edge)
+            return edge
+
+    raise _EdgesExhaustedError()
+
+
+def _generate_tiles(rng: random.Random, side: int, tile_size: int, density: float) -> List[List[TileContent]]:
+    """
+    Returns the grid of tiles in their original arrangement and orientation.
+    """
+    inner = tile_size - 2
+    step = tile_size - 1
+    grid_size = side * step + 1
+
+    # The image is the content of the tiles without the edges
+    image_size = side * inner
+    image = [['#' if rng.random() < density else '.' for _ in range(image_size)] for _ in range(image_size)]
+
+    monster_pixels = get_sea_monster_pattern_pixels()
+    monster_height = max(r for r, c in monster_pixels) + 1
+    monster_width = max(c for r, c in monster_pixels) + 1
+    if image_size >= monster_width:
+        for _ in range(side * side // 3 + 1):
+            top = rng.randint(0, image_size - monster_height)
+            left = rng.randint(0, image_size - monster_width)
+            for r, c in monster_pixels:
+                image[top + r][left + c] = '#'
+
+    # The pixel grid has the tiles overlapping by their edges
+    grid = [['.'] * grid_size for _ in range(grid_size)]
+    for image_row in range(image_size):
+        grid_row = (image_row // inner) * step + 1 + image_row % inner
+        for image_col in range(image_size):
+            grid_col = (image_col // inner) * step + 1 + image_col % inner
+            grid[grid_row][grid_col] = image[image_row][image_col]
+
+    for row in range(0, grid_size, step):
+        for col in range(0, grid_size, step):
+            grid[row][col] = rng.choice('#.')
+
+    # Every edge is unique, so there's exactly one way to assemble the tiles
+    used_edges: Set[str] = set()
+    for line in range(0, grid_size, step):
+        for start in range(0, grid_size - 1, step):
+            end = start + step
+            h_edge = _pick_edge(rng, grid[line][start], grid[line][end], tile_size, used_edges)
+            for offset, pixel in enumerate(h_edge):
+                grid[line][start + offset] = pixel
+
+            v_edge = _pick_edge(rng, grid[start][line], grid[end][line], tile_size, used_edges)
+            for offset, pixel in enumerate(v_edge):
+                grid[start + offset][line] = pixel
+
+    tiles = []
+    for tile_row in range(side):
+        row = []
+        for tile_col in range(side):
+            top = tile_row * step
+            left = tile_col * step
+            content = [''.join(grid[r][left:left + tile_size]) for r in range(top, top + tile_size)]
+            row.append(TileContent(content))
+        tiles.append(row)
+
+    return tiles
+
+
+def generate(size: int, seed: int = 0, tile_size: Optional[int] = None, density: float = 0.3) -> str:
+    """
+    Generates `size` tiles which can be assembled into a square image in exactly
+    one way (up to rotating and flipping the whole image). Each tile is rotated
+    and flipped randomly. Some sea monsters are planted into the image.
+
+    :param tile_size: The side of each tile in pixels. By default it's 10 like
+        in the puzzle, and grows when there are too many tiles to make
+        all their edges unique.
+
+    :raises ValueError: If the size is not a perfect square.
+    """
+    side = math.isqrt(size)
+    if side < 1 or side * side != size:
+        raise ValueError(f"{size} tiles cannot be arranged into a square")
+
+    rng = random.Random(seed)
+
+    current_tile_size = tile_size or 10
+    while True:
+        try:
+            tiles = _generate_tiles(rng, side, current_tile_size, density)
+            break
+        except _EdgesExhaustedError:
+            if tile_size:
+                raise ValueError(f"Cannot make {size} tiles of size {tile_size} with unique edges")
+            current_tile_size += 1
+
+    numbers = rng.sample(range(1000, 1000 + max(9000, 2 * size)), size)
+    tile_texts = []
+    for number, tile in zip(numbers, (tile for row in tiles for tile in row)):
+        variation = list(iter_tile_variations(tile))[rng.randrange(8)]
+        tile_texts.append(f"Tile {number}:\n" + '\n'.join(variation.content) + '\n')
+
+    rng.shuffle(tile_texts)
+    return '\n'.join(tile_texts)
@@ -127,18 +127,38 @@ def get_canonical_dangerous_string(allergen_map: Dict[str, str]) -> str:
     return ','.join([ingredient for allergen, ingredient in sorted_pairs])
 
 
-def main():
-    with open('./input.txt') as f:
-        food_items = [parse_food_item(line.strip()) for line in f.readlines()]
-
-    safe_ingredients = find_safe_ingredients(food_items)
-
+def count_safe_occurences(food_items: List[FoodItem], safe_ingredients: Set[str]) -> int:
+    """
+    Counts how many times the safe ingredients appear in the food items.
+    """
     safe_occurences = 0
     for ingredient in safe_ingredients:
         for item in food_items:
             if ingredient in item.ingredients:
                 safe_occurences += 1
 
+    return safe_occurences
+
+
+def parse_input(content: str) -> List[FoodItem]:
+    return [parse_food_item(line.strip()) for line in content.splitlines() if line.strip()]
+
+
+def part1(food_items: List[FoodItem]) -> int:
+    return count_safe_occurences(food_items, find_safe_ingredients(food_items))
+
+
+def part2(food_items: List[FoodItem]) -> str:
+    return get_canonical_dangerous_string(match_allergens(food_items))
+
+
+def main():
+    with open('./input.txt') as f:
+        food_items = parse_input(f.read())
+
+    safe_ingredients = find_safe_ingredients(food_items)
+    safe_occurences = count_safe_occurences(food_items, safe_ingredients)
+
     print(f"Safe ingredients: {safe_ingredients}")
     print(f"They occur {safe_occurences} times")
 
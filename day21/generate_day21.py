@@ -0,0 +1,56 @@
+import random
+from typing import List, Set
+
+ALLERGENS = ['dairy', 'eggs', 'fish', 'nuts', 'peanuts', 'sesame', 'shellfish', 'soy', 'wheat']
+
+
+def _make_ingredients(rng: random.Random, count: int) -> List[str]:
+    names: Set[str] = set()
+    while len(names) < count:
+        names.add(''.join(rng.choice('bcdfghjklmnpqrstvxz') for _ in range(rng.randint(4, 8))))
+    return sorted(names)
+
+
+def generate(size: int, seed: int = 0, allergens_count: int = 8, ingredients_count: int = 200) -> str:
+    """
+    Generates a list of `size` foods, where each allergen can be matched to
+    exactly one ingredient.
+
+    For each allergen two foods list it alone, contain no other allergens and
+    share no safe ingredients, so the allergen's ingredient is the only
+    candidate left for it.
+    The rest of the foods are random.
+    """
+    if allergens_count > len(ALLERGENS):
+        raise ValueError(f"At most {len(ALLERGENS)} allergens are supported")
+    if size < 2 * allergens_count:
+        raise ValueError(f"At least {2 * allergens_count} foods are needed")
+
+    rng = random.Random(seed)
+
+    allergens = rng.sample(ALLERGENS, allergens_count)
+    ingredients = _make_ingredients(rng, ingredients_count + allergens_count)
+    rng.shuffle(ingredients)
+    dangerous = dict(zip(allergens, ingredients))
+    safe = ingredients[allergens_count:]
+
+    def make_food(listed: List[str], safe_pool: List[str], unlisted: bool = True) -> str:
+        food_ingredients = [dangerous[a] for a in listed]
+        # Allergens are not always listed
+        if unlisted:
+            food_ingredients += [d for a, d in dangerous.items() if a not in listed and rng.random() < 0.2]
+        food_ingredients += rng.sample(safe_pool, min(len(safe_pool), rng.randint(3, 15)))
+        rng.shuffle(food_ingredients)
+        return f"{' '.join(food_ingredients)} (contains {', '.join(listed)})\n"
+
+    lines = []
+    half = len(safe) // 2
+    for allergen in allergens:
+        lines.append(make_food([allergen], safe[:half], unlisted=False))
+        lines.append(make_food([allergen], safe[half:], unlisted=False))
+
+    while len(lines) < size:
+        lines.append(make_food(rng.sample(allergens, rng.randint(1, 3)), safe))
+
+    rng.shuffle(lines)
+    return ''.join(lines)
@@ -1,11 +1,27 @@
+from typing import Tuple
+
 import combat
 import reccombat
-from decks import get_score, parse_decks
+from decks import Deck, get_score, parse_decks
+
+
+def parse_input(content: str) -> Tuple[Deck, Deck]:
+    return parse_decks(content)
+
+
+def part1(decks: Tuple[Deck, Deck]) -> int:
+    final_deck1, final_deck2, _ = combat.play_until_win(*decks)
+    winning_deck, _ = combat.get_winning_deck(final_deck1, final_deck2)
+    return get_score(winning_deck)
+
+
+def part2(decks: Tuple[Deck, Deck]) -> int:
+    return get_score(reccombat.play_until_win(*decks).winning_deck)
 
 
 def main():
     with open('./input.txt') as f:
-        deck1, deck2 = parse_decks(f.read())
+        deck1, deck2 = parse_input(f.read())
 
     final_deck1, final_deck2, rounds_to_win = combat.play_until_win(deck1, deck2)
     winning_deck, winning_deck_number = combat.get_winning_deck(final_deck1, final_deck2)
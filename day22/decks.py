@@ -1,10 +1,13 @@
-from typing import List, Tuple
+from typing import Iterable, List, Tuple, Union
 
 Deck = List[int]
 
 
-def parse_decks(content: str) -> Tuple[Deck, Deck]:
-    deck_contents = content.strip().split('\n\n')
+def parse_decks(content: Union[str, Iterable[str]]) -> Tuple[Deck, Deck]:
+    """
+    :param content: The whole file, or its blank-line-separated blocks.
+    """
+    deck_contents = content.strip().split('\n\n') if isinstance(content, str) else content
     decks = []
     for deck_content in deck_contents:
         cards = [int(line) for line in deck_content.split('\n')[1:]]
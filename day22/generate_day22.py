@@ -0,0 +1,15 @@
+import random
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates two decks of `size` cards each, dealt from cards 1 to 2 * size.
+    """
+    rng = random.Random(seed)
+
+    cards = list(range(1, 2 * size + 1))
+    rng.shuffle(cards)
+
+    deck1 = ''.join(f"{c}\n" for c in cards[:size])
+    deck2 = ''.join(f"{c}\n" for c in cards[size:])
+    return f"Player 1:\n{deck1}\nPlayer 2:\n{deck2}"
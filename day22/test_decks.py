@@ -25,6 +25,7 @@ from decks import get_score, parse_decks
 ])
 def test_parse_decks(content, decks):
     assert parse_decks(content) == decks
+    assert parse_decks(iter(content.strip().split('\n\n'))) == decks
 
 
 @pytest.mark.parametrize("deck, score", [
@@ -193,21 +193,75 @@ def parse_cup_circle(s: str) -> CupCircle:
     return CupCircle(cups=cups)
 
 
+def play_cups(labels: List[int], rounds: int, total_cups: Optional[int] = None) -> List[int]:
+    """
+    Plays the game the same way CupCircle.play_round does, but keeps the circle
+    in a flat list instead of linked objects, which is several times faster.
+
+    :param labels: The labels of the cups, a permutation of 1..len(labels).
+    :param total_cups: Adds cups up to this number after the labeled ones, like CupCircle.expand_to.
+    :returns: The labels of the cups in the circle, starting from the cup after the cup 1.
+    """
+    total_cups = max(total_cups or 0, len(labels))
+    order = [*labels, *range(len(labels) + 1, total_cups + 1)]
+
+    # next_cups[label] is the label of the cup after the cup with that label
+    next_cups = [0] * (total_cups + 1)
+    for label, next_label in zip(order, order[1:]):
+        next_cups[label] = next_label
+    next_cups[order[-1]] = order[0]
+
+    current = order[0]
+    for _ in range(rounds):
+        picked1 = next_cups[current]
+        picked2 = next_cups[picked1]
+        picked3 = next_cups[picked2]
+        next_cups[current] = next_cups[picked3]
+
+        dest = current - 1 or total_cups
+        while dest == picked1 or dest == picked2 or dest == picked3:
+            dest = dest - 1 or total_cups
+
+        next_cups[picked3] = next_cups[dest]
+        next_cups[dest] = picked1
+        current = next_cups[current]
+
+    result = []
+    label = next_cups[1]
+    while label != 1:
+        result.append(label)
+        label = next_cups[label]
+    return result
+
+
+def parse_input(content: str) -> str:
+    """
+    Returns the cup labels. The circle itself is built by each part,
+    because playing the game mutates it.
+    """
+    labels = content.strip()
+    if not labels.isdigit():
+        raise ValueError(f"Invalid cup labels: {labels!r}")
+
+    return labels
+
+
+def part1(labels: str) -> str:
+    return ''.join(str(label) for label in play_cups([int(c) for c in labels], 100))
+
+
+def part2(labels: str) -> int:
+    # Only the two cups after the cup 1 matter, but play_cups returns the whole circle
+    after_one = play_cups([int(c) for c in labels], 10_000_000, total_cups=1_000_000)
+    return after_one[0] * after_one[1]
+
+
 def main():
-    INPUT = "398254716"
-
-    circle = parse_cup_circle(INPUT)
-    for i in range(100):
-        circle.play_round()
-    print(f"Answer after 100 rounds: {circle.get_part1_answer()}")
-
-    circle = parse_cup_circle(INPUT)
-    circle.expand_to(1_000_000)
-    for i in range(10_000_000):
-        if i % 1_000_000 == 0:
-            print(f"{i} rounds played")
-        circle.play_round()
-    print(f"Answer after 10M rounds: {circle.get_part2_answer()}")
+    with open('./input.txt') as f:
+        labels = parse_input(f.read())
+
+    print(f"Answer after 100 rounds: {part1(labels)}")
+    print(f"Answer after 10M rounds: {part2(labels)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+import random
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates the labels of `size` cups in random order.
+
+    Each label is a single digit, so at most 9 cups are supported. The second
+    part expands the circle to a million cups regardless of the input.
+    """
+    if not 5 <= size <= 9:
+        raise ValueError("Between 5 and 9 cups are supported")
+
+    rng = random.Random(seed)
+    labels = list(range(1, size + 1))
+    rng.shuffle(labels)
+    return ''.join(str(label) for label in labels) + '\n'
@@ -1,4 +1,4 @@
-from day23 import parse_cup_circle
+from day23 import parse_cup_circle, play_cups
 
 
 def test_cup_circle_play_round():
@@ -20,3 +20,9 @@ def test_cup_circle_play_10m_rounds():
     for i in range(10_000_000):
         circle.play_round()
     assert circle.get_part2_answer() == 149245887792
+
+
+def test_play_cups():
+    assert play_cups([3, 8, 9, 1, 2, 5, 4, 6, 7], 10) == [9, 2, 6, 5, 8, 3, 7, 4]
+    assert play_cups([3, 8, 9, 1, 2, 5, 4, 6, 7], 100) == [6, 7, 3, 8, 4, 5, 2, 9]
+    assert play_cups([3, 8, 9, 1, 2, 5, 4, 6, 7], 0, total_cups=12) == [2, 5, 4, 6, 7, 10, 11, 12, 3, 8, 9]
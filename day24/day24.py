@@ -207,16 +207,27 @@ def fill_tile_map(tile_dirs: List[List[Dir]]) -> TileMap:
     return tile_map
 
 
-def main():
-    with open('./input.txt') as f:
-        tile_dirs = [parse_dirs(line.strip()) for line in f.readlines() if line]
+def parse_input(content: str) -> List[List[Dir]]:
+    return [parse_dirs(line.strip()) for line in content.splitlines() if line.strip()]
 
-    tile_map = fill_tile_map(tile_dirs)
-    print(f"Black tiles: {len(tile_map.black_tiles)}")
 
+def part1(tile_dirs: List[List[Dir]]) -> int:
+    return len(fill_tile_map(tile_dirs).black_tiles)
+
+
+def part2(tile_dirs: List[List[Dir]]) -> int:
+    tile_map = fill_tile_map(tile_dirs)
     for i in range(100):
         tile_map = tile_map.evolve()
-    print(f"Black tiles after 100 days: {len(tile_map.black_tiles)}")
+    return len(tile_map.black_tiles)
+
+
+def main():
+    with open('./input.txt') as f:
+        tile_dirs = parse_input(f.read())
+
+    print(f"Black tiles: {part1(tile_dirs)}")
+    print(f"Black tiles after 100 days: {part2(tile_dirs)}")
 
 
 if __name__ == "__main__":
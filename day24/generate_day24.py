@@ -0,0 +1,15 @@
+import random
+
+
+def generate(size: int, seed: int = 0, max_steps: int = 20) -> str:
+    """
+    Generates `size` lists of directions to the tiles to flip.
+    """
+    rng = random.Random(seed)
+    dirs = ['ne', 'e', 'se', 'sw', 'w', 'nw']
+
+    lines = []
+    for _ in range(size):
+        lines.append(''.join(rng.choice(dirs) for _ in range(rng.randint(1, max_steps))) + '\n')
+
+    return ''.join(lines)
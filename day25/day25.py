@@ -1,4 +1,5 @@
 from itertools import count
+from typing import Tuple
 
 
 def transform_subject(subject_number: int, loop_size: int) -> int:
@@ -24,13 +25,25 @@ def make_encryption_key(remote_public_key: int, own_loop_size: int) -> int:
     return transform_subject(remote_public_key, own_loop_size)
 
 
+def parse_input(content: str) -> Tuple[int, int]:
+    """
+    Returns the card's and the door's public keys, in this order.
+    """
+    card_public_key, door_public_key = [int(line) for line in content.split()]
+    return card_public_key, door_public_key
+
+
+def part1(public_keys: Tuple[int, int]) -> int:
+    card_public_key, door_public_key = public_keys
+    door_loop_size = find_loop_size(door_public_key)
+    return make_encryption_key(card_public_key, door_loop_size)
+
+
 def main():
-    DOOR_PUBLIC_KEY = 9789649
-    CARD_PUBLIC_KEY = 3647239
+    with open('./input.txt') as f:
+        public_keys = parse_input(f.read())
 
-    door_loop_size = find_loop_size(DOOR_PUBLIC_KEY)
-    enc_key = make_encryption_key(CARD_PUBLIC_KEY, door_loop_size)
-    print(f"Encryption key: {enc_key}")
+    print(f"Encryption key: {part1(public_keys)}")
 
 
 if __name__ == "__main__":
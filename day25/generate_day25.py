@@ -0,0 +1,15 @@
+import random
+
+MODULO = 20201227
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Generates the public keys of the card and the door with secret loop sizes
+    of up to `size`. Finding the loop size takes time proportional to it.
+    """
+    rng = random.Random(seed)
+
+    card_loop_size = rng.randint(1, size)
+    door_loop_size = rng.randint(max(1, size // 2), size)
+    return f"{pow(7, card_loop_size, MODULO)}\n{pow(7, door_loop_size, MODULO)}\n"